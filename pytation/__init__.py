@@ -13,10 +13,24 @@
 # limitations under the License.
 
 from .version import *
-from .context import Context
-from .analysis import AnalysisContext
-from .api import declare_test
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'Context': 'pytation.context',
+    'AnalysisContext': 'pytation.analysis',
+    'declare_test': 'pytation.api',
+}
 
 __all__ = ['Context', 'AnalysisContext', 'declare_test',
            '__version__', '__title__', '__description__', '__url__',
            '__author__', '__author_email__', '__license__', '__copyright__']
+
+
+def __getattr__(name):
+    # Import on first access to keep "python -m pytation" startup fast.
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -19,6 +19,7 @@
 import os
 import sys
 import argparse
+import importlib
 import logging
 import traceback
 from . import entry_points
@@ -53,7 +54,7 @@ def get_parser():
     for entry_point in entry_points.__all__:
         if isinstance(entry_point, str):
             default_name = entry_point
-            entry_point = getattr(entry_points, entry_point)
+            entry_point = importlib.import_module(f'{entry_points.__name__}.{entry_point}')
         else:
             default_name = entry_point.__name__.split('.')[-1]
         name = getattr(entry_point, 'NAME', default_name)
@@ -17,6 +17,10 @@
 Handle analysis context.
 """
 
+from pytation import retention
+from pytation import detail
+from pytation import operator_time
+from fs.osfs import OSFS
 from fs.zipfs import ReadZipFS
 import glob
 import importlib
@@ -27,24 +31,74 @@ import os
 class AnalysisContext():
     """Perform an analysis of a previous suite execution.
 
-    :param path: The path to the test's output ".zip" file.
+    :param path: The path to the test's output ".zip" file.  For
+        archives compacted into a bundle, use the bundle path joined
+        with the archive name.  The path may also be the directory
+        of a suite that is still running, which may not yet contain
+        "tests.json".
     :param tests: The list of test names to analyze.
         None or empty list analyzes all.
+
+    Use as a context manager, or call :meth:`close`, to release the
+    suite archive.
     """
 
     def __init__(self, path):
         self.env: dict[str: object] = {}  #: The station environment
         self.test_config: dict[str: object] = {}  #: The test configuration.
         self.result = None   # 0 or test error code
-        self.details = None  # The arbitrary test details
-        if not os.path.isfile(path):
-            raise ValueError(f'path not found: {path}')
-        self._fs = ReadZipFS(file=path)  #: The filesystem for the test
-        with self._fs.open('tests.json', 'rt') as f:
-            self.tests = json.load(f)
+        self.details = None  # The arbitrary test details, large arrays load on access
+        self._file = None
+        if os.path.isdir(path):
+            self._fs = OSFS(path)
+        else:
+            try:
+                self._file = retention.open_member(path)
+            except FileNotFoundError:
+                raise ValueError(f'path not found: {path}')
+            self._fs = ReadZipFS(file=self._file)  #: The filesystem for the test
+        self.tests = []
+        if self._fs.exists('tests.json'):
+            with self._fs.open('tests.json', 'rt') as f:
+                self.tests = json.load(f)
         with self._fs.open('station.json', 'rt') as f:
             self._station = json.load(f)
         self.env = self._station.get('env', {})
+        self._readers = []
+        self._operator = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the suite filesystem."""
+        if self._fs is not None:
+            self._fs.close()
+            self._fs = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def operator(self):
+        """The operator time summary for the suite.
+
+        :return: The operator.json dict, see
+            :func:`pytation.operator_time.summarize`.  For archives
+            without operator.json, the summary is reconstructed from
+            progress.csv.  None when neither is available.
+        """
+        if self._operator is None:
+            if self._fs.exists('operator.json'):
+                with self._fs.open('operator.json', 'rt') as f:
+                    self._operator = json.load(f)
+            elif self._fs.exists('progress.csv'):
+                with self._fs.open('progress.csv', 'rt') as f:
+                    self._operator = operator_time.parse_progress(f.read())
+        return self._operator
 
     def expand_str(self, s):
         return s.format(**self.env)
@@ -53,6 +107,19 @@ class AnalysisContext():
         value = self._station['paths'][key]
         return value.format(**self._station['paths'], **self.env)
 
+    def capture(self, name):
+        """Open a capture stored by the current test.
+
+        :param name: The capture name provided to
+            :meth:`pytation.Context.capture_open`.
+        :return: The :class:`pytation.capture.CaptureReader` instance,
+            which is closed automatically when the analysis completes.
+        """
+        from pytation.capture import CaptureReader
+        reader = CaptureReader(self.fs, name)
+        self._readers.append(reader)
+        return reader
+
     def run(self, tests=None):
         rc = 0
         names = [t['name'] for t in self.tests]
@@ -71,7 +138,7 @@ class AnalysisContext():
             tests = names
 
         for t in self.tests:
-            if t['name'] not in tests:
+            if t['name'] not in tests or 'reused' in t:
                 continue
             try:
                 m = importlib.import_module(t['name'])
@@ -79,19 +146,46 @@ class AnalysisContext():
                 continue
             if not hasattr(m, 'analyze'):
                 continue
-            self.fs = self._fs.opendir(t['name'])
-            try:
-                self.result = t['result']
-                self.details = t['detail']
-                self.config = t['config']
-                print(f'\n### {t["name"]} ###')
-                rc = m.analyze(self)
-                if rc:
-                    break
-            finally:
-                self.result = None
-                self.details = None
-                self.config = None
-                self.fs.close()
-                self.fs = None
+            rc = self._analyze(t, m)
+            if rc:
+                break
         return rc
+
+    def _analyze(self, t, m):
+        self.fs = self._fs.opendir(t['name'])
+        try:
+            self.result = t['result']
+            self.details = t['detail']
+            if detail.is_ref(self.details):
+                self.details = detail.load(self._fs, self.details)
+            elif isinstance(self.details, dict):
+                self.details = detail.DetailView(self.details, self._fs)
+            self.config = t['config']
+            print(f'\n### {t["name"]} ###')
+            return m.analyze(self)
+        finally:
+            self.result = None
+            self.details = None
+            self.config = None
+            while len(self._readers):
+                self._readers.pop().close()
+            self.fs.close()
+            self.fs = None
+
+
+def analyze_inline(path, test, module_name):
+    """Analyze a single test from a running suite.
+
+    :param path: The suite directory path.
+    :param test: The test output dict, as stored in "tests.json".
+    :param module_name: The name of the test module that provides
+        the analyze function.
+    :return: 0 or error code.
+
+    The station calls this function in a worker process when the station
+    "analysis_workers" option is enabled.
+    """
+    with AnalysisContext(path) as context:
+        context.tests = [test]
+        rc = context._analyze(test, importlib.import_module(module_name))
+        return 0 if rc is None else rc
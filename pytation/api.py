@@ -41,9 +41,17 @@ def test_prototype(context: Context):
               the station configuration.
             - env: The station environment.
             - fs: The filesystem instance for use by the test.
-            - config: The dict[str, object] of test configuration options.
-              The test may modify this configuration in place, and the
-              station will store the modified version for future analysis.
+            - events: The :class:`pytation.events.EventBus`.
+            - tracer: The :class:`pytation.trace.Tracer` for custom spans.
+            - config: The copy-on-write mapping of test configuration
+              options.  The test may modify this configuration in place,
+              and the station will store the modified version for future
+              analysis.  NumPy arrays are read-only, so assign a new
+              array to modify them.  The config and its nested lists
+              are a :class:`pytation.config.ConfigView` and
+              :class:`pytation.config.ListView`, not dict and list.
+              Use config.snapshot() for a plain dict, such as for
+              json.dumps().  pretty_json encodes the views directly.
 
         Interesting methods include:
             - expand_str
@@ -52,6 +60,8 @@ def test_prototype(context: Context):
             - progress
             - wait_for_user
             - prompt
+            - capture_open
+            - device_lease
 
     :return: One of the following:
         * None: test passed
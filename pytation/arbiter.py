@@ -0,0 +1,217 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Arbitrate exclusive device access between concurrent tests.
+
+An owner, usually a test name or thread, acquires a :class:`Lease` on a
+set of devices.  A lease is all-or-nothing, so a single acquisition
+never deadlocks.  Waiters queue per device in FIFO order, and a waiter
+is granted its lease only when it is at the head of the queue of every
+requested device.  An owner that requests more devices while holding a
+lease may deadlock with another owner.  The arbiter checks its wait-for
+graph whenever an owner starts waiting and raises :class:`DeadlockError`
+rather than blocking forever.
+"""
+
+import logging
+import threading
+import time
+
+
+_log = logging.getLogger(__name__)
+
+
+class DeadlockError(RuntimeError):
+    """The device acquisition would deadlock."""
+    pass
+
+
+class Lease:
+    """Exclusive access to a set of devices.
+
+    Use :meth:`Arbiter.acquire` to create instances.  Release the lease
+    with :meth:`release` or by using the lease as a context manager.
+    """
+
+    def __init__(self, arbiter, owner, devices, wait_time):
+        self._arbiter = arbiter
+        self.owner = owner  #: The lease owner.
+        self.devices = frozenset(devices)  #: The leased device names.
+        self.wait_time = wait_time  #: The time spent waiting in seconds.
+
+    def __repr__(self):
+        return f'Lease({self.owner!r}, {sorted(self.devices)!r})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    @property
+    def active(self):
+        """True until released."""
+        return self._arbiter is not None
+
+    def release(self):
+        """Release the devices.  Subsequent calls do nothing."""
+        if self._arbiter is not None:
+            self._arbiter._release(self)
+            self._arbiter = None
+
+
+class _Waiter:
+
+    def __init__(self, owner, devices):
+        self.owner = owner
+        self.devices = devices
+
+
+class Arbiter:
+    """Grant fair, exclusive device leases.
+
+    :param names: The optional iterable of known device names.  Other
+        device names are added on first use.
+    """
+
+    def __init__(self, names=None):
+        self._cv = threading.Condition()
+        self._owners = {}  # device name: owner
+        self._queues = {}  # device name: list of _Waiter in FIFO order
+        self._stats = {}
+        for name in (names or []):
+            self._device(name)
+
+    def _device(self, name):
+        if name not in self._queues:
+            self._queues[name] = []
+            self._stats[name] = {'leases': 0, 'waits': 0, 'wait_time': 0.0, 'wait_max': 0.0}
+        return self._queues[name]
+
+    def _grantable(self, waiter):
+        for name in waiter.devices:
+            if self._owners.get(name) is not None or self._queues[name][0] is not waiter:
+                return False
+        return True
+
+    def _blockers(self, owner):
+        """The owners that the owner is waiting on."""
+        blockers = set()
+        for name, queue in self._queues.items():
+            for idx, waiter in enumerate(queue):
+                if waiter.owner != owner:
+                    continue
+                holder = self._owners.get(name)
+                if holder is not None:
+                    blockers.add(holder)
+                blockers.update([w.owner for w in queue[:idx]])
+        blockers.discard(owner)
+        return blockers
+
+    def _cycle(self, owner):
+        """Find a wait-for cycle that includes the owner."""
+        path = [owner]
+        visited = set()
+
+        def search(node):
+            for blocker in self._blockers(node):
+                if blocker == owner:
+                    return True
+                if blocker in visited:
+                    continue
+                visited.add(blocker)
+                path.append(blocker)
+                if search(blocker):
+                    return True
+                path.pop()
+            return False
+
+        return path if search(owner) else None
+
+    def acquire(self, devices, owner=None, timeout=None):
+        """Acquire a lease.
+
+        :param devices: The iterable of device names.
+        :param owner: The hashable lease owner.  None (default) uses
+            the current thread.
+        :param timeout: The maximum time to wait in seconds.  None (default)
+            waits indefinitely.  0 only acquires immediately available
+            devices without waiting behind other owners.
+        :return: The :class:`Lease`, or None on timeout.  Devices that
+            the owner already holds are not included in the lease.
+        :raise DeadlockError: If waiting would deadlock.
+        """
+        owner = threading.get_ident() if owner is None else owner
+        t_start = time.monotonic()
+        with self._cv:
+            devices = frozenset([d for d in devices if self._owners.get(d) != owner])
+            waiter = _Waiter(owner, devices)
+            for name in devices:
+                self._device(name).append(waiter)
+            try:
+                if not self._grantable(waiter):
+                    if timeout is not None and timeout <= 0:
+                        return None
+                    cycle = self._cycle(owner)
+                    if cycle is not None:
+                        raise DeadlockError(f'device deadlock: {" -> ".join([str(x) for x in cycle + [owner]])}')
+                    if not self._cv.wait_for(lambda: self._grantable(waiter), timeout):
+                        return None
+                wait_time = time.monotonic() - t_start
+                for name in devices:
+                    self._owners[name] = owner
+                    stats = self._stats[name]
+                    stats['leases'] += 1
+                    if wait_time > 0.001:
+                        stats['waits'] += 1
+                    stats['wait_time'] += wait_time
+                    stats['wait_max'] = max(stats['wait_max'], wait_time)
+                if wait_time > 0.001:
+                    _log.info('%s waited %.3f seconds for %s', owner, wait_time, sorted(devices))
+                return Lease(self, owner, devices, wait_time)
+            finally:
+                for name in devices:
+                    self._queues[name].remove(waiter)
+                self._cv.notify_all()
+
+    def _release(self, lease):
+        with self._cv:
+            for name in lease.devices:
+                if self._owners.get(name) == lease.owner:
+                    self._owners.pop(name)
+            self._cv.notify_all()
+
+    def owner(self, name):
+        """Get the current device owner.
+
+        :param name: The device name.
+        :return: The owner or None if available.
+        """
+        with self._cv:
+            return self._owners.get(name)
+
+    def stats(self):
+        """Get the wait-time metrics.
+
+        :return: The dict mapping device name to the dict with keys
+            leases, waits, wait_time, wait_max, owner, and queued.
+            Times are in seconds.
+        """
+        with self._cv:
+            result = {}
+            for name, stats in self._stats.items():
+                result[name] = dict(stats, owner=self._owners.get(name), queued=len(self._queues[name]))
+            return result
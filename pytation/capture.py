@@ -0,0 +1,368 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Stream high-rate instrument data into the suite archive.
+
+A test opens a named capture using :meth:`pytation.Context.capture_open`
+and pushes NumPy blocks, often from an instrument callback thread.
+A writer thread appends the samples as chunks to "{name}.bin" in the
+test's directory and writes the chunk index to "{name}.json" when the
+capture closes.  Memory is bounded by the queue size.  When the queue
+is full, push() blocks until the writer catches up, so no samples are
+lost unless the optional push timeout expires.
+
+The index JSON contains:
+
+* version: The format version, currently 1.
+* dtype: The NumPy dtype string for each sample.
+* shape: The shape for each sample, [] for scalar samples.
+* sample_rate: The sample rate in Hz or None.
+* compression: None or "zlib".
+* sample_count: The total number of samples.
+* dropped: The number of samples dropped due to push timeouts.
+* chunks: The list of [offset, size, sample_start, sample_count] for
+  each chunk in the ".bin" file.
+* chunk_min, chunk_max: The list of the minimum and maximum values of
+  each chunk, with the sample shape, for numeric data types.  These
+  provide downsampled summaries without decompressing the data.
+
+Use :class:`CaptureReader`, which :meth:`pytation.AnalysisContext.capture`
+returns, to read sample ranges, time windows, and summaries.
+"""
+
+from pytation import pretty_json
+import numpy as np
+import bisect
+import json
+import logging
+import queue
+import threading
+import zlib
+
+
+VERSION = 1
+CHUNK_SAMPLES_DEFAULT = 65536
+QUEUE_BYTES_DEFAULT = 64 * 1024 * 1024
+COMPRESSION = [None, 'zlib']
+_ZLIB_LEVEL = 1  # favor throughput
+
+
+class Capture:
+    """A streaming capture channel.
+
+    :param fs: The filesystem directory for the capture files.
+    :param name: The capture name used for the filenames.
+    :param dtype: The NumPy sample data type.
+    :param shape: The shape of each sample, such as (2, ) for interleaved
+        current and voltage.  None or () for scalar samples.
+    :param sample_rate: The sample rate in Hz, if known.
+    :param compression: None or 'zlib'.
+    :param chunk_samples: The target number of samples per chunk.
+    :param queue_bytes: The maximum number of bytes pending for the writer.
+
+    Use :meth:`pytation.Context.capture_open` rather than constructing
+    this class directly.
+    """
+
+    def __init__(self, fs, name, dtype, shape=None, sample_rate=None, compression=None,
+                 chunk_samples=None, queue_bytes=None):
+        if compression not in COMPRESSION:
+            raise ValueError(f'unsupported compression: {compression}')
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape or ())
+        self.sample_rate = sample_rate
+        self.compression = compression
+        self._chunk_samples = int(chunk_samples or CHUNK_SAMPLES_DEFAULT)
+        self._queue_bytes = int(queue_bytes or QUEUE_BYTES_DEFAULT)
+        self._log = logging.getLogger(__name__)
+        self._fs = fs
+        self._queue = queue.Queue()
+        self._cv = threading.Condition()
+        self._pending = 0  # bytes in the queue
+        self._sample_count = 0
+        self._dropped = 0
+        self._chunks = []
+        self._summarize = self.dtype.kind in 'biuf'
+        self._chunk_min = []
+        self._chunk_max = []
+        self._error = None
+        self._closed = False
+        self._f = fs.open(f'{name}.bin', 'wb')
+        self._thread = threading.Thread(target=self._run, name=f'pytation_capture_{name}', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def sample_count(self):
+        """The number of samples written to the archive."""
+        return self._sample_count
+
+    @property
+    def dropped(self):
+        """The number of samples dropped due to push timeouts."""
+        return self._dropped
+
+    def push(self, block, timeout=None):
+        """Append samples to the capture.
+
+        :param block: The array-like samples with shape (N, ) + shape.
+            The samples are copied, so the caller may reuse the buffer.
+        :param timeout: The maximum time in seconds to wait for queue
+            space.  None (default) waits indefinitely, which is lossless.
+        :return: True if queued, False if dropped due to timeout.
+        :raise RuntimeError: If the capture is closed or the writer failed.
+        """
+        if self._closed:
+            raise RuntimeError(f'capture {self.name} closed')
+        if self._error is not None:
+            raise RuntimeError(f'capture {self.name} writer failed') from self._error
+        block = np.array(block, dtype=self.dtype, copy=True)
+        block = block.reshape((-1, ) + self.shape)
+        nbytes = block.nbytes
+        with self._cv:
+            ok = self._cv.wait_for(
+                lambda: self._closed or self._pending == 0 or self._pending + nbytes <= self._queue_bytes,
+                timeout=timeout)
+            if self._closed:  # queue only before the close() sentinel
+                raise RuntimeError(f'capture {self.name} closed')
+            if not ok:
+                self._dropped += len(block)
+                self._log.warning('capture %s dropped %d samples', self.name, len(block))
+                return False
+            self._pending += nbytes
+            self._queue.put(block)
+        return True
+
+    def _write_chunk(self, blocks):
+        data = np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+        b = data.tobytes()
+        if self.compression == 'zlib':
+            b = zlib.compress(b, _ZLIB_LEVEL)
+        offset = self._chunks[-1][0] + self._chunks[-1][1] if len(self._chunks) else 0
+        self._f.write(b)
+        self._chunks.append([offset, len(b), self._sample_count, len(data)])
+        self._sample_count += len(data)
+        if self._summarize:
+            self._chunk_min.append(np.min(data, axis=0).tolist())
+            self._chunk_max.append(np.max(data, axis=0).tolist())
+
+    def _run(self):
+        blocks = []
+        count = 0
+        while True:
+            block = self._queue.get()
+            if block is not None:
+                blocks.append(block)
+                count += len(block)
+            try:
+                if len(blocks) and (block is None or count >= self._chunk_samples):
+                    self._write_chunk(blocks)
+                    blocks, count = [], 0
+            except Exception as ex:
+                self._log.exception('capture %s write failed', self.name)
+                self._error = ex
+                blocks, count = [], 0  # drop the failed chunk
+            if block is not None:
+                with self._cv:
+                    self._pending -= block.nbytes
+                    self._cv.notify_all()
+            else:
+                return
+
+    def index(self):
+        """Get the capture index.
+
+        :return: The index dict.  See the module documentation.
+        """
+        return {
+            'version': VERSION,
+            'dtype': self.dtype.str,
+            'shape': list(self.shape),
+            'sample_rate': self.sample_rate,
+            'compression': self.compression,
+            'sample_count': self._sample_count,
+            'dropped': self._dropped,
+            'chunks': self._chunks,
+            'chunk_min': self._chunk_min,
+            'chunk_max': self._chunk_max,
+        }
+
+    def close(self):
+        """Flush all pending samples and write the index.
+
+        Calling close() on a closed capture does nothing.
+        """
+        with self._cv:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+            self._cv.notify_all()
+        self._thread.join()
+        self._f.close()
+        with self._fs.open(f'{self.name}.json', 'wt') as f:
+            pretty_json.dump(self.index(), f)
+        self._log.info('capture %s closed: %d samples, %d chunks, %d dropped',
+                       self.name, self._sample_count, len(self._chunks), self._dropped)
+
+
+class CaptureReader:
+    """Read a capture from a suite archive.
+
+    :param fs: The filesystem directory containing the capture files.
+    :param name: The capture name.
+
+    Only the chunks that overlap the requested range are read and
+    decompressed.  For uncompressed captures, only the requested bytes
+    are read.
+    """
+
+    def __init__(self, fs, name):
+        self.name = name
+        with fs.open(f'{name}.json', 'rt') as f:
+            self.index = json.load(f)
+        if self.index.get('version', 0) > VERSION:
+            raise ValueError(f'unsupported capture version {self.index["version"]}')
+        self.dtype = np.dtype(self.index['dtype'])
+        self.shape = tuple(self.index['shape'])
+        self.sample_rate = self.index['sample_rate']
+        self.sample_count = self.index['sample_count']
+        self._sample_size = self.dtype.itemsize * int(np.prod(self.shape, dtype=np.int64))
+        self._chunks = self.index['chunks']
+        self._chunk_starts = [c[2] for c in self._chunks]
+        self._cache = (None, None)  # (chunk index, data)
+        self._f = fs.open(f'{name}.bin', 'rb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.sample_count
+
+    def close(self):
+        """Close the capture data file."""
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def _range(self, start, stop):
+        start = 0 if start is None else max(0, int(start))
+        stop = self.sample_count if stop is None else min(self.sample_count, int(stop))
+        return start, max(start, stop)
+
+    def _chunk(self, idx):
+        if self._cache[0] == idx:
+            return self._cache[1]
+        offset, size, _, count = self._chunks[idx]
+        self._f.seek(offset)
+        b = self._f.read(size)
+        if self.index['compression'] == 'zlib':
+            b = zlib.decompress(b)
+        data = np.frombuffer(b, dtype=self.dtype).reshape((count, ) + self.shape)
+        self._cache = (idx, data)
+        return data
+
+    def _chunk_range(self, start, stop):
+        """The chunk indices [first, last) that contain samples [start, stop)."""
+        first = bisect.bisect_right(self._chunk_starts, start) - 1
+        last = bisect.bisect_left(self._chunk_starts, stop)
+        return max(0, first), last
+
+    def read(self, start=None, stop=None):
+        """Read a sample range.
+
+        :param start: The first sample index.  None (default) is 0.
+        :param stop: The sample index after the last sample to read.
+            None (default) reads to the end.
+        :return: The read-only NumPy array with shape (N, ) + shape.
+        """
+        start, stop = self._range(start, stop)
+        if start == stop:
+            return np.empty((0, ) + self.shape, dtype=self.dtype)
+        first, last = self._chunk_range(start, stop)
+        if self.index['compression'] is None:
+            offset = self._chunks[first][0] + (start - self._chunk_starts[first]) * self._sample_size
+            self._f.seek(offset)
+            b = self._f.read((stop - start) * self._sample_size)
+            return np.frombuffer(b, dtype=self.dtype).reshape((-1, ) + self.shape)
+        blocks = [self._chunk(idx) for idx in range(first, last)]
+        data = blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+        k = start - self._chunk_starts[first]
+        data = data[k:k + stop - start]
+        data.flags.writeable = False
+        return data
+
+    def _time_to_sample(self, t):
+        if t is None:
+            return None
+        if not self.sample_rate:
+            raise ValueError(f'capture {self.name} has no sample_rate')
+        return int(round(t * self.sample_rate))
+
+    def read_time(self, t_start=None, t_stop=None):
+        """Read a time window.
+
+        :param t_start: The start time in seconds relative to the first
+            sample.  None (default) is 0.
+        :param t_stop: The stop time in seconds.  None (default) reads
+            to the end.
+        :return: The read-only NumPy array.  See :meth:`read`.
+        :raise ValueError: If the capture has no sample_rate.
+        """
+        return self.read(self._time_to_sample(t_start), self._time_to_sample(t_stop))
+
+    def summary(self, bins, start=None, stop=None):
+        """Compute a downsampled min/max summary for plotting.
+
+        :param bins: The maximum number of bins.
+        :param start: The first sample index.  None (default) is 0.
+        :param stop: The sample index after the last sample.
+            None (default) is the end.
+        :return: The tuple (sample_start, min, max).  sample_start is the
+            integer array of the first sample index in each bin.  min and
+            max are the arrays of shape (bins, ) + shape.
+
+        When the range spans more chunks than bins, this method uses
+        the chunk summaries stored in the index without reading the data,
+        and the bins are aligned to the chunk boundaries.
+        """
+        start, stop = self._range(start, stop)
+        if start == stop or bins <= 0:
+            empty = np.empty((0, ) + self.shape, dtype=self.dtype)
+            return np.empty(0, dtype=np.int64), empty, empty
+        first, last = self._chunk_range(start, stop)
+        chunk_min = self.index.get('chunk_min')
+        if chunk_min is not None and len(chunk_min) == len(self._chunks) and (last - first) >= bins:
+            c_min = np.array(chunk_min[first:last], dtype=self.dtype).reshape((-1, ) + self.shape)
+            c_max = np.array(self.index['chunk_max'][first:last], dtype=self.dtype).reshape((-1, ) + self.shape)
+            edges = np.linspace(0, last - first, bins + 1).astype(np.int64)
+            edges = np.unique(edges)
+            s = np.array(self._chunk_starts[first:last], dtype=np.int64)[edges[:-1]]
+            return s, np.minimum.reduceat(c_min, edges[:-1]), np.maximum.reduceat(c_max, edges[:-1])
+        data = self.read(start, stop)
+        edges = np.unique(np.linspace(0, len(data), bins + 1).astype(np.int64))
+        return (edges[:-1] + start,
+                np.minimum.reduceat(data, edges[:-1]),
+                np.maximum.reduceat(data, edges[:-1]))
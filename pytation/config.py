@@ -0,0 +1,262 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Copy-on-write configuration for tests and devices.
+
+The station definition configuration is shared by every suite.  Rather
+than deep copying the configuration before each test, the test receives
+a :class:`ConfigView`.  Reads return the shared values directly when they
+are immutable.  Nested dicts return nested views, lists return
+:class:`ListView` instances that copy the list on the first
+modification, and NumPy arrays are returned as read-only views.  Other
+mutable containers are copied on first access.  Only the values that
+the test accesses or modifies are materialized.
+"""
+
+from collections.abc import Mapping, MutableMapping, MutableSequence
+from copy import deepcopy
+
+
+_IMMUTABLE = (str, bytes, int, float, complex, bool, type(None), frozenset)
+
+
+def _is_ndarray(value):
+    return type(value).__module__ == 'numpy' and hasattr(value, 'flags')
+
+
+def _view(value):
+    """Get a value for access without modifying the shared value."""
+    if isinstance(value, Mapping):
+        return ConfigView(value)
+    elif isinstance(value, list):
+        return ListView(value)
+    elif _is_ndarray(value):
+        value = value.view()
+        value.flags.writeable = False
+        return value
+    return deepcopy(value)
+
+
+def _snapshot(value):
+    return value.snapshot() if isinstance(value, (ConfigView, ListView)) else value
+
+
+def _equal(a, b):
+    """Compare configuration values, which may contain NumPy arrays."""
+    if a is b:
+        return True
+    if _is_ndarray(a) or _is_ndarray(b):
+        if not (_is_ndarray(a) and _is_ndarray(b)) or a.shape != b.shape or a.dtype != b.dtype:
+            return False
+        import numpy as np
+        try:
+            return bool(np.array_equal(a, b, equal_nan=True))
+        except TypeError:  # equal_nan requires a numeric dtype
+            return bool(np.array_equal(a, b))
+    if isinstance(a, Mapping) and isinstance(b, Mapping):
+        return a.keys() == b.keys() and all([_equal(a[k], b[k]) for k in a])
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return type(a) is type(b) and len(a) == len(b) and all([_equal(x, y) for x, y in zip(a, b)])
+    try:
+        return bool(a == b)
+    except Exception:
+        return False
+
+
+def _modified(value, base):
+    """Check a materialized value against its shared value."""
+    if isinstance(value, (ConfigView, ListView)):
+        return bool(value.modified)
+    elif _is_ndarray(value):
+        return False  # read-only view
+    return not _equal(value, base)  # copied container modified in place
+
+
+class ConfigView(MutableMapping):
+    """A copy-on-write view of a shared configuration dict.
+
+    :param base: The shared configuration mapping, which is never modified.
+    """
+
+    def __init__(self, base=None):
+        self._base = {} if base is None else base
+        self._local = {}  # materialized and modified values
+        self._copied = set()  # keys materialized by read access
+        self._deleted = set()
+
+    def __repr__(self):
+        return f'ConfigView({self.snapshot()!r})'
+
+    def __getitem__(self, key):
+        try:
+            return self._local[key]
+        except KeyError:
+            pass
+        if key in self._deleted:
+            raise KeyError(key)
+        value = self._base[key]
+        if isinstance(value, _IMMUTABLE):
+            return value
+        value = _view(value)
+        self._local[key] = value
+        self._copied.add(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._deleted.discard(key)
+        self._copied.discard(key)
+        self._local[key] = value
+
+    def __delitem__(self, key):
+        if key in self._deleted or (key not in self._local and key not in self._base):
+            raise KeyError(key)
+        self._local.pop(key, None)
+        self._copied.discard(key)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __iter__(self):
+        for key in self._base:
+            if key not in self._deleted:
+                yield key
+        for key in self._local:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        return len(self._base) - len(self._deleted) + len([k for k in self._local if k not in self._base])
+
+    def __contains__(self, key):
+        return key in self._local or (key in self._base and key not in self._deleted)
+
+    def copy(self):
+        """Get a new, independent view with the same contents."""
+        return ConfigView(self.snapshot())
+
+    @property
+    def modified(self):
+        """The set of keys that were modified or deleted."""
+        keys = set(self._deleted)
+        for key, value in self._local.items():
+            if key not in self._copied or _modified(value, self._base[key]):
+                keys.add(key)
+        return keys
+
+    def snapshot(self):
+        """Get the current contents as a plain dict without copying.
+
+        :return: The dict containing the shared values for unmodified
+            keys and the local values for accessed and modified keys.
+            Nested views are also converted to plain dicts.  The caller
+            must not modify the returned values.
+        """
+        d = {}
+        for key in self:
+            value = self._local[key] if key in self._local else self._base[key]
+            d[key] = _snapshot(value)
+        return d
+
+
+class ListView(MutableSequence):
+    """A copy-on-write view of a shared configuration list.
+
+    :param base: The shared configuration list, which is never modified.
+
+    Reads return the shared items, or views of them when mutable.  The
+    first modification copies the list itself, but not its items.
+    """
+
+    __hash__ = None
+
+    def __init__(self, base):
+        self._base = base
+        self._items = None  # the list copy after the first modification
+        self._views = {}  # index: item view, before the first modification
+
+    def __repr__(self):
+        return f'ListView({self.snapshot()!r})'
+
+    def __eq__(self, other):
+        if isinstance(other, ListView):
+            other = other.snapshot()
+        return self.snapshot() == other
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def _item(self, idx):
+        value = self._base[idx]
+        if isinstance(value, _IMMUTABLE):
+            return value
+        idx = range(len(self._base))[idx]  # normalize negative indices
+        if idx not in self._views:
+            self._views[idx] = _view(value)
+        return self._views[idx]
+
+    def _materialize(self):
+        if self._items is None:
+            self._items = [self._item(idx) for idx in range(len(self._base))]
+            self._views = {}
+        return self._items
+
+    def __getitem__(self, idx):
+        if self._items is not None:
+            return self._items[idx]
+        elif isinstance(idx, slice):
+            return [self._item(i) for i in range(len(self._base))[idx]]
+        return self._item(idx)
+
+    def __setitem__(self, idx, value):
+        self._materialize()[idx] = value
+
+    def __delitem__(self, idx):
+        del self._materialize()[idx]
+
+    def __len__(self):
+        return len(self._base if self._items is None else self._items)
+
+    def insert(self, idx, value):
+        self._materialize().insert(idx, value)
+
+    def sort(self, *args, **kwargs):
+        self._materialize().sort(*args, **kwargs)
+
+    def copy(self):
+        """Get a new, independent view with the same contents."""
+        return ListView(self.snapshot())
+
+    @property
+    def modified(self):
+        """True if the list or any of its items were modified."""
+        if self._items is not None:
+            return True
+        return any([_modified(value, self._base[idx]) for idx, value in self._views.items()])
+
+    def snapshot(self):
+        """Get the current contents as a plain list.
+
+        :return: The shared list when unmodified, otherwise a new list
+            containing the shared items and the modified items.  The
+            caller must not modify the returned values.
+        """
+        if self._items is not None:
+            return [_snapshot(value) for value in self._items]
+        elif not self.modified:
+            return self._base
+        return [_snapshot(self._views.get(idx, value)) for idx, value in enumerate(self._base)]
@@ -19,19 +19,37 @@ Handle test context.
 
 from pytation import time, __version__
 from pytation.progress import Progress
-from pytation.loader import SETUP_TEARDOWN_FN, ENV_EXCLUDE
+from pytation.loader import SETUP_TEARDOWN_FN, ENV_EXCLUDE, LazyRef, prewarm
 from pytation.keywords import *
 from pytation import pretty_json
+from pytation.retention import Retention
+from pytation.history import History, UnitIndex
+from pytation.config import ConfigView
+from pytation import detail as detail_mod
+from pytation.analysis import analyze_inline
+from pytation.arbiter import Arbiter
+from pytation import watchdog
+from pytation import events
+from pytation import metrics
+from pytation import trace
+from pytation import operator_time
+from pytation import replay
 from fs.zipfs import WriteZipFS
 from copy import deepcopy
 from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 import importlib
+import json
 import zipfile
 import os
 import logging
+import threading
+import types
 
 
-_FILE_FMT = "%(levelname)s:%(asctime)s:%(filename)s:%(lineno)d:%(name)s:%(message)s"
+_FILE_FMT = "%(levelname)s:%(asctime)s:%(filename)s:%(lineno)d:%(name)s:%(suite)s%(message)s"
+_SUITE_FMT = '%(asctime)s %(name)s %(levelname)s: %(message)s'
+_SUITE_TRACE_FMT = '%(asctime)s %(name)s %(levelname)s [%(trace_id)s:%(span_id)s]: %(message)s'
 _VALID_CHARS = \
     '-_. ' \
     + ''.join([chr(ord('a') + a) for a in range(26)]) \
@@ -55,6 +73,26 @@ def _time_finalize(d):
     return d
 
 
+def _test_result(test):
+    """Get the test result, including the inline analysis result."""
+    return test['result'] or test.get('analysis') or 0
+
+
+class _ThreadState(threading.local):
+    """The test state, which is separate for each concurrent test thread."""
+
+    def __init__(self):
+        self.config = None
+        self.fs = None
+        self.sections = []  # list of [name, start_time, span]
+        self.captures = []  # The list of open captures for the current test
+        self.tests = None   # The test outputs for a concurrent test, None for the suite list
+        self.owner = None   # The device lease owner, the test name while a test runs
+        self.cancel = None  # The watchdog.CancelToken for the guarded operation
+        self.log_id = None  # The concurrent test log identifier, also set on guard threads
+        self.env = None     # The suite environment while the pipeline thread finalizes the suite
+
+
 class DictReadOnlyWrapper(Mapping):
 
     def __init__(self, data):
@@ -80,37 +118,147 @@ class Context:
         but the environment is reinitialized to the station defaults at the
         start of every suite.
     :ivar do_quit: A boolean value to indicate that the station should quit.
+    :ivar events: The :class:`pytation.events.EventBus` that publishes the
+        station events.
+    :ivar metrics: The :class:`pytation.metrics.Registry` when the station
+        "metrics" option is enabled, otherwise None.
     """
 
     def __init__(self, station):
         self._log = logging.getLogger('pytation')
         self._log.setLevel(logging.DEBUG)
+        self._local = _ThreadState()
         self._env = {}  # cache station init to restore after each suite
-        self.env: dict[str: object] = station['env']  #: The station environment
+        self.env = station['env']
         self._station = station
 
         self._progress: Progress = None
         self._devices: dict[str, object] = {}  #: string to device object
+        self._arbiter = Arbiter(station['devices'].keys())
+        self._watchdog = watchdog.Watchdog()
+        self._abandoned = False  # True after abandoning a guarded thread that may still use devices
+        self._history = None  # The test History, when adaptive ordering is enabled
+        self._units = None    # The UnitIndex, when retest is enabled
         self.devices: dict[str, object] = DictReadOnlyWrapper(self._devices)  #: dict[str, object]
-        self.config: dict[str, object] = {}  #: The test configuration, populated before each test and saved after each test.
+        self.config = ConfigView()
         self._fs = None
         self._fs_path = None
-        self.fs = None  #: The filesystem for use by the test
+        self.events = events.EventBus()  #: The station event bus
+        self._event_log_handler = None
+        self.metrics = None  #: The metrics Registry, when enabled
+        self._station_metrics = None
+        self._metrics_server = None
+        self._tracer = trace.Tracer(enabled=False)  # replaced in station_start when enabled
+        self._station_span = None
+        self._suite_span = None
+        self._operator = operator_time.OperatorTime()
+        self._shift_log = None  # The operator ShiftLog, when enabled
+        self._recorder = None  # The device I/O Recorder, when enabled
         self._cbk = {'progress': [], 'state': [], 'wait_for_user': [], 'prompt': []}
+        self._cbk_subscriptions = {}  # (name, cbk): list of Subscription for progress and state
         self._progress_data = []
         self._progress_file = None
         self._progress_cbk = None
         self._station_log_handler = None
         self._suite_logfile = None
         self._suite_log_file_handler = None
+        self._progress_lock = threading.Lock()
         self._tests = []     # The list of test outputs
-        self._sections = []  # list of [name, start_time]
         self._state = None
+        policies = dict(station.get('retention', {}))
+        self._retention = Retention(self, policies, policies.pop('interval', None), self._archives_moved)
+        self._pipeline = None  # The suite finalization executor, when enabled
+        self._pipeline_futures = []
+        self._analysis = None  # The inline analysis executor, when enabled
+        self._analysis_futures = []  # list of [test, future]
         self.do_quit: bool = False  #: Set to True to quit, thread safe quit mechanism
 
     def __repr__(self):
         return 'Context(name=%s)' % self._station['name']
 
+    @property
+    def config(self) -> ConfigView:
+        """The copy-on-write test configuration, populated before each test and saved after each test."""
+        return self._local.config
+
+    @config.setter
+    def config(self, value):
+        self._local.config = value
+
+    @property
+    def fs(self):
+        """The filesystem for use by the test."""
+        return self._local.fs
+
+    @fs.setter
+    def fs(self, value):
+        self._local.fs = value
+
+    @property
+    def cancelled(self):
+        """True when the watchdog cancelled the current test or device operation."""
+        token = self._local.cancel
+        return token is not None and token.cancelled
+
+    def check_cancel(self):
+        """Check for watchdog cancellation.
+
+        :raise pytation.watchdog.WatchdogTimeout: If the current test or
+            device operation exceeded its timeout.
+
+        Long-running tests and devices should call this method
+        periodically, especially in polling loops, so that they stop
+        promptly when cancelled.
+        """
+        token = self._local.cancel
+        if token is not None:
+            token.check()
+
+    def _guarded(self, fn, timeout, name):
+        """Run fn with a timeout on a thread that shares this thread's test state."""
+        if not timeout:
+            return fn()
+        token = watchdog.CancelToken()
+        state = dict(self._local.__dict__)
+        span = self._tracer.current()
+
+        def target():
+            self._local.__dict__.update(state)
+            self._local.cancel = token
+            self._tracer.attach(span)
+            return fn()
+
+        try:
+            return watchdog.guard(self._watchdog, target, timeout, self._station['timeouts']['grace'], name, token)
+        except watchdog.WatchdogAbandoned:
+            self._abandoned = True  # halt the suite and set up the devices again
+            raise
+
+    def _device_timeout(self, name):
+        return self._station['devices'][name].get('timeout', self._station['timeouts']['device'])
+
+    def _device_recover(self, name):
+        """Recover a device after a timeout by closing and reopening it."""
+        self._log.warning('device_recover(%s)', name)
+        try:
+            self.device_close(name)
+        except Exception:
+            self._log.exception('device_recover(%s) close', name)
+        if self._station['devices'][name]['lifecycle'] == 'test':
+            return  # opened again for the next test
+        try:
+            self.device_open(name)
+        except Exception:
+            self._log.exception('device_recover(%s) open', name)
+
+    @property
+    def _sections(self):
+        return self._local.sections
+
+    @property
+    def _captures(self):
+        return self._local.captures
+
     @property
     def state(self):
         """The current state"""
@@ -123,12 +271,7 @@ class Context:
             raise RuntimeError(f'undefined state: {s}')
         self._log.info('Enter state %s', s)
         self._state = s
-        state_info = self._station['states'][s]
-        for fn in self._cbk['state']:
-            try:
-                fn(state_info)
-            except Exception:
-                self._log.exception('during state callback')
+        self.events.publish(events.STATE, state=self._station['states'][s])
 
     def _create_file_path_as_needed(self, path):
         dirpath = os.path.dirname(path)
@@ -145,6 +288,26 @@ class Context:
         """
         return s.format(**self.env)
 
+    @property
+    def env(self) -> dict[str, object]:
+        """The station environment.
+
+        While the pipeline thread finalizes a suite, it sees the
+        environment of that suite rather than the running suite.
+        """
+        env = self._local.env
+        return self._suite_env if env is None else env
+
+    @env.setter
+    def env(self, value):
+        self._suite_env = value
+
+    def _suite_tag(self, record):
+        """Tag station log records from the pipeline thread with their suite."""
+        env = self._local.env
+        record.suite = '' if env is None else f'[suite {env.get("suite_timestr")}] '
+        return True
+
     def _station_log_open(self):
         path = os.path.normpath(self.path('log'))
         self._create_file_path_as_needed(path)
@@ -152,14 +315,20 @@ class Context:
         file_hnd = logging.FileHandler(filename=path)
         file_hnd.setFormatter(file_fmt)
         file_hnd.setLevel(logging.DEBUG)
+        file_hnd.addFilter(self._suite_tag)
         self._station_log_handler = file_hnd
         logging.getLogger().addHandler(file_hnd)
+        self._event_log_handler = events.LogHandler(self.events)
+        logging.getLogger().addHandler(self._event_log_handler)
 
     def _station_log_close(self):
         if self._station_log_handler is not None:
             logging.getLogger().removeHandler(self._station_log_handler)
             self._station_log_handler.close()
             self._station_log_handler = None
+        if self._event_log_handler is not None:
+            logging.getLogger().removeHandler(self._event_log_handler)
+            self._event_log_handler = None
 
     def path(self, key):
         """Get the path from the station specification.
@@ -183,7 +352,9 @@ class Context:
         self._log.info('device_open(%s)', name)
         d = self._station['devices'][name]
         clz = d['clz']
-        if isinstance(clz, str):
+        if isinstance(clz, LazyRef):
+            clz = clz.resolve()
+        elif isinstance(clz, str):
             parts = clz.split('.')
             class_name = parts[-1]
             module_name = '.'.join(parts[:-1])
@@ -195,17 +366,49 @@ class Context:
             device = clz
         else:
             raise RuntimeError(f'Invalid device clz for {name}')
-        self.config, config = deepcopy(d['config']), self.config
+        self.config, config = ConfigView(d['config']), self.config
+        t_start = time.now()
+        span = self._tracer.start(f'device {name} setup', {'device': name})
         try:
-            device.setup(self)
-        except Exception:
+            self._guarded(lambda: device.setup(self), self._device_timeout(name), f'device {name} setup')
+        except Exception as ex:
+            self._tracer.end(span, error=repr(ex))
             self._log.error(f'Could not open device {name}')
             raise
         finally:
+            self._tracer.end(span)
             self.config = config
+        if self._recorder is not None:
+            device = self._recorder.wrap(name, device)
         self._devices[name] = device
+        self.events.publish(events.DEVICE_OPEN, name=name, duration=time.now() - t_start)
         return device
 
+    def device_lease(self, names, timeout=None):
+        """Acquire exclusive access to devices.
+
+        :param names: The list of device names.
+        :param timeout: The maximum time to wait in seconds.  None (default)
+            waits indefinitely.
+        :return: The :class:`pytation.arbiter.Lease`, which should be used
+            in a "with" statement, or None on timeout.
+        :raise pytation.arbiter.DeadlockError: If waiting would deadlock.
+
+        The station already leases each test's declared devices while
+        the test runs.  Use this method to access additional devices
+        or to access devices from other threads.  Devices that the
+        running test already holds are granted immediately.
+        """
+        return self._arbiter.acquire(names, owner=self._local.owner, timeout=timeout)
+
+    def device_stats(self):
+        """Get the device lease wait-time metrics.
+
+        :return: The dict mapping device name to the metrics dict.
+            See :meth:`pytation.arbiter.Arbiter.stats`.
+        """
+        return self._arbiter.stats()
+
     def device_close(self, name):
         self._log.info('device_close(%s)', name)
         try:
@@ -213,7 +416,19 @@ class Context:
         except KeyError:
             self._log.warning('device_close(%s), but not found', name)
             return
-        device.teardown()
+        t_start = time.now()
+        span = self._tracer.start(f'device {name} teardown', {'device': name})
+        try:
+            self._guarded(device.teardown, self._device_timeout(name), f'device {name} teardown')
+        except watchdog.WatchdogTimeout as ex:
+            self._tracer.end(span, error=repr(ex))
+            self._log.error('device_close(%s) timed out, device abandoned', name)
+        except Exception as ex:
+            self._tracer.end(span, error=repr(ex))
+            raise
+        finally:
+            self._tracer.end(span)
+            self.events.publish(events.DEVICE_CLOSE, name=name, duration=time.now() - t_start)
 
     def _devices_open(self, lifecycle, device_list=None):
         if device_list is None:
@@ -224,8 +439,10 @@ class Context:
             if d['lifecycle'] == lifecycle and name in device_list:
                 self.device_open(name)
 
-    def _devices_close(self, lifecycle):
+    def _devices_close(self, lifecycle, device_list=None):
         for name, d in self._station['devices'].items():
+            if device_list is not None and name not in device_list:
+                continue
             if d['lifecycle'] == lifecycle and name in self._devices:
                 try:
                     self.device_close(name)
@@ -256,8 +473,7 @@ class Context:
         else:
             name = fn.__name__.split('.')[-1]
         d['name'] = name
-        config = d.get('config', {})
-        config = deepcopy(config)
+        config = ConfigView(d.get('config', {}))
         fname = sanitize_filename(name)
         if d.get('skip'):
             self._log.info('--- TEST START %s --- ', name)
@@ -266,50 +482,164 @@ class Context:
             return
 
         self._log.info('--- TEST START %s --- ', name)
+        hook = self._is_hook(d)
+        self.events.publish(events.TEST_START, name=name, hook=hook)
+        span = self._tracer.start(f'test {name}', {'test': name})
+        t_start = time.now()
         test = {'name': name, 'config': config}
         self.config = config
+        module = None
+        devices = None
+        concurrent = self._local.tests is not None
+        if hook:  # may block on the operator, so only an explicit timeout applies
+            timeout = d.get('timeout')
+        else:
+            timeout = d.get('timeout', self._station['timeouts']['test'])
 
         try:
-            self._devices_open('test', d['devices'])
+            if isinstance(fn, LazyRef):
+                fn = fn.resolve()
+                if d['devices'] is None:
+                    d['devices'] = getattr(fn, 'DEVICES', [])
+            if isinstance(fn, types.ModuleType):
+                module = fn
+            devices = d['devices']
+            self._devices_open('test', devices)
 
             if self._fs is not None and name not in SETUP_TEARDOWN_FN:
-                self.fs = self._fs.makedir(fname)
+                self.fs = self._fs.makedir(fname, recreate=True)
 
-            for d in d['devices']:
-                if d not in self._devices:
-                    raise RuntimeError(f'required device {d} not found')
+            for device_name in devices:
+                if device_name not in self._devices:
+                    raise RuntimeError(f'required device {device_name} not found')
 
             with self.section(name):
                 if not callable(fn) and hasattr(fn, 'run'):
                     fn = fn.run
-                result = fn(self)
+                result = self._guarded(lambda: fn(self), timeout, f'test {name}')
                 if result is None:
                     result = 0
                 elif not isinstance(result, int):
                     result, detail = result
+        except watchdog.WatchdogTimeout:
+            self._log.error('Test %s timed out after %s seconds', name, timeout)
+            result = PYTATION_RETURN_CODE_TIMEOUT
+            for device_name in (devices or []):
+                if device_name in self._devices:
+                    self._device_recover(device_name)
         except Exception:
             self._log.exception(f'While running test {name}')
         finally:
-            self._devices_close('test')
+            if concurrent:  # only close this test's devices
+                self._devices_close('test', devices or [])
+            else:
+                self._devices_close('test')
             self._log.info('--- TEST DONE %s with status %s --- ', name, result)
             if result in [PYTATION_RETURN_CODE_SKIP_REMAINING_TESTS]:
                 test_result = 0
             else:
                 test_result = result
             test['result'] = test_result
+            test['duration'] = time.now() - t_start
+            threshold = self._station.get('detail_binary_threshold')
+            if self.fs is not None and threshold is not None:
+                try:
+                    detail = detail_mod.store(self._fs, fname, detail, threshold)
+                except Exception:
+                    self._log.exception('Could not store binary detail for %s', name)
             test['detail'] = detail
-            test['config'] = config
-            self._tests.append(test)
+            test['config'] = config.snapshot()
+            self.events.publish(events.TEST_DONE, name=name, result=test_result, duration=test['duration'],
+                                hook=hook)
+            if concurrent:
+                self._local.tests.append(test)
+            else:
+                self._tests.append(test)
+            self._captures_close()
+            if self.fs is not None and module is not None and hasattr(module, 'analyze'):
+                self._analysis_submit(test, module.__name__)
             self.fs = None
             self.config = None
 
-        for device_name, device in self._devices.items():
+        for device_name, device in list(self._devices.items()):
+            if concurrent and device_name not in (devices or []):
+                continue
+            t_start = time.now()
+            restore_span = self._tracer.start(f'device {device_name} restore', {'device': device_name})
             try:
-                device.restore()
-            except Exception:
+                self._guarded(device.restore, self._device_timeout(device_name), f'device {device_name} restore')
+            except watchdog.WatchdogTimeout as ex:
+                self._tracer.end(restore_span, error=repr(ex))
+                self._device_recover(device_name)
+            except Exception as ex:
+                self._tracer.end(restore_span, error=repr(ex))
                 self._log.exception('Device restore for %s', device_name)
+            self._tracer.end(restore_span)
+            self.events.publish(events.DEVICE_RESTORE, name=device_name, duration=time.now() - t_start)
+        if span is not None:
+            span.attributes['result'] = str(result)
+        self._tracer.end(span, error=f'result {result}' if result else None)
         return result
 
+    def _is_hook(self, d):
+        """Check for a station, suite, or test setup or teardown function."""
+        return any([d is self._station.get(k) for k in SETUP_TEARDOWN_FN])
+
+    def _analysis_submit(self, test, module_name):
+        if self._analysis is None:
+            return
+        # provide the same data that tests.json will contain
+        test_data = json.loads(pretty_json.dumps(test))
+        path = self._fs.getsyspath('/')
+        self._log.info('analysis submit %s', test['name'])
+        future = self._analysis.submit(analyze_inline, path, test_data, module_name)
+        self._analysis_futures.append([test, future])
+
+    def _analysis_wait(self):
+        """Wait for inline analysis and record the results."""
+        while len(self._analysis_futures):
+            test, future = self._analysis_futures.pop(0)
+            try:
+                rc = future.result()
+            except Exception:
+                self._log.exception('analysis failed for %s', test['name'])
+                rc = -1
+            self._log.info('analysis %s done with status %s', test['name'], rc)
+            test['analysis'] = rc
+
+    def capture_open(self, name, dtype, shape=None, sample_rate=None, compression=None,
+                     chunk_samples=None, queue_bytes=None):
+        """Open a streaming capture for high-rate instrument data.
+
+        :param name: The capture name, unique within the test.
+        :param dtype: The NumPy sample data type.
+        :param shape: The shape of each sample.  None for scalar samples.
+        :param sample_rate: The sample rate in Hz, if known.
+        :param compression: None (default) or 'zlib'.
+        :param chunk_samples: The target number of samples per chunk.
+        :param queue_bytes: The maximum number of bytes pending write.
+        :return: The :class:`pytation.capture.Capture` instance.  Call
+            push(block) from any thread.  The station closes the capture
+            automatically when the test completes.
+        :raise RuntimeError: If not called from within a test.
+        """
+        if self.fs is None:
+            raise RuntimeError('capture_open requires a running test')
+        from pytation.capture import Capture  # requires numpy
+        capture = Capture(self.fs, sanitize_filename(name), dtype, shape=shape,
+                          sample_rate=sample_rate, compression=compression,
+                          chunk_samples=chunk_samples, queue_bytes=queue_bytes)
+        self._captures.append(capture)
+        return capture
+
+    def _captures_close(self):
+        while len(self._captures):
+            capture = self._captures.pop(0)
+            try:
+                capture.close()
+            except Exception:
+                self._log.exception('capture %s close failed', capture.name)
+
     def _progress_exists(self):
         path = os.path.normpath(self.path('progress'))
         return os.path.isfile(path)
@@ -334,8 +664,25 @@ class Context:
         :see: station_run()
         :note: Included in station_run().
         """
+        self._trace_start()
         self._station_log_open()
         self._log.info('pytation version = %s', __version__)
+        if self._station.get('prewarm'):
+            prewarm(self._station)
+        if self._station.get('adaptive'):
+            self._history = History(os.path.normpath(self.path('history')))
+        if self._station.get('retest'):
+            self._units = UnitIndex(os.path.normpath(self.path('units')))
+        self._retention.apply(force=True)  # after loading the unit index, see _archives_moved()
+        if self._station.get('operator'):
+            self._shift_log = operator_time.ShiftLog(os.path.normpath(self.path('operator')))
+        if self._station.get('record'):
+            self._recorder = replay.Recorder(self, self._station['record']['devices'])
+        if self._station.get('pipeline'):
+            self._pipeline = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pytation_pipeline')
+        if self._station.get('analysis_workers'):
+            self._analysis = ProcessPoolExecutor(max_workers=self._station['analysis_workers'])
+        self._metrics_start()
         try:
             self._devices_open('station', True)
         except Exception:
@@ -353,6 +700,21 @@ class Context:
         """
         self.test_run(self._station.get('station_teardown'))
         self._devices_close('station')
+        self.pipeline_flush()
+        self.events.flush()
+        for name, stats in self._arbiter.stats().items():
+            if stats['waits']:
+                self._log.info('device %s: %d leases, %d waits, %.3f s total wait, %.3f s max wait', name,
+                               stats['leases'], stats['waits'], stats['wait_time'], stats['wait_max'])
+        if self._pipeline is not None:
+            self._pipeline.shutdown()
+            self._pipeline = None
+        if self._analysis is not None:
+            self._analysis.shutdown(cancel_futures=True)
+            self._analysis = None
+        self._watchdog.close()
+        self._metrics_stop()
+        self._trace_stop()
         self._station_log_close()
 
     def station_run(self, count=None):
@@ -374,6 +736,78 @@ class Context:
         finally:
             self.station_stop()
 
+    def _trace_start(self):
+        options = self._station.get('trace')
+        if options:
+            exporter = None
+            if options['export']:
+                exporter = trace.OtlpExporter(options['export'], {'station': self._station['name']},
+                                              options['timeout'])
+            self._tracer = trace.Tracer(exporter=exporter)
+        self._station_span = self._tracer.start('station', {'station': self._station['name']}, root=True)
+
+    def _trace_stop(self):
+        span, self._station_span = self._station_span, None
+        self._tracer.end(span)
+        if span is not None:
+            self._tracer.collect(span.trace_id)
+        self._tracer.close()
+        self._tracer.attach(None)
+
+    def _trace_log_configure(self, handler):
+        """Add the trace ids to a suite log handler when tracing."""
+        if self._tracer.enabled:
+            handler.addFilter(trace.LogFilter(self._tracer))
+            handler.setFormatter(logging.Formatter(_SUITE_TRACE_FMT))
+        else:
+            handler.setFormatter(logging.Formatter(_SUITE_FMT))
+
+    @property
+    def tracer(self):
+        """The :class:`pytation.trace.Tracer`.
+
+        Use "with context.tracer.span(name):" to trace additional
+        operations.  The tracer does nothing unless the station "trace"
+        option is enabled.
+        """
+        return self._tracer
+
+    def _metrics_start(self):
+        options = self._station.get('metrics')
+        if not options:
+            return
+        if self.metrics is None:
+            self.metrics = metrics.Registry()
+        self._station_metrics = metrics.StationMetrics(self, self.metrics)
+        if options['port'] is not None:
+            self._metrics_server = metrics.MetricsServer(self.metrics, options['host'], options['port'])
+
+    def _metrics_save(self):
+        if self._station_metrics is None:
+            return
+        path = os.path.normpath(self.path('metrics'))
+        try:
+            self.metrics.save(path)
+        except Exception:
+            self._log.exception('Could not save metrics %s', path)
+
+    def _metrics_stop(self):
+        if self._station_metrics is None:
+            return
+        self._metrics_save()
+        self._station_metrics.close()
+        self._station_metrics = None
+        if self._metrics_server is not None:
+            self._metrics_server.close()
+            self._metrics_server = None
+
+    @property
+    def metrics_address(self):
+        """The (host, port) metrics server address, or None when not serving."""
+        if self._metrics_server is None:
+            return None
+        return self._metrics_server.address
+
     def _suite_time_update(self):
         t = time.now()
         self.env['suite_timestamp'] = t
@@ -384,39 +818,65 @@ class Context:
         path = os.path.normpath(self.path('output'))
         self._log.info('suite file path = %s', path)
         self._create_file_path_as_needed(path)
-        self._fs = WriteZipFS(file=path,
-                              compression=zipfile.ZIP_STORED,
-                              temp_fs='temp://pytation')
-        self._fs_path = path
-        self._station['env'] = dict([(key, value) for key, value in self.env.items() if key not in ENV_EXCLUDE])
-        with self._fs.open('station.json', 'wt') as f:
-            pretty_json.dump(self._station, f)
-        self._station['env'] = {}
+        with self._tracer.span('archive open', {'path': path}):
+            self._fs = WriteZipFS(file=path,
+                                  compression=zipfile.ZIP_STORED,
+                                  temp_fs='temp://pytation')
+            self._fs_path = path
+            self._station['env'] = dict([(key, value) for key, value in self.env.items() if key not in ENV_EXCLUDE])
+            with self._fs.open('station.json', 'wt') as f:
+                pretty_json.dump(self._station, f)
+            self._station['env'] = {}
 
         # configure logging to ZIP file
         self._suite_logfile = self._fs.open('log.txt', 'wt')
         ch = logging.StreamHandler(self._suite_logfile)
         ch.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(asctime)s %(name)s %(levelname)s: %(message)s')
-        ch.setFormatter(formatter)
+        self._trace_log_configure(ch)
+        ch.addFilter(lambda record: self._local.env is None)  # exclude the previous suite's finalization
         logging.getLogger().addHandler(ch)
         self._suite_log_file_handler = ch
 
+    def _devices_reset(self):
+        """Set up all open devices again after abandoning a thread."""
+        threads = self._watchdog.abandoned()
+        self._log.warning('Resetting devices, %d abandoned threads still running', len(threads))
+        for name in list(self._devices.keys()):
+            self._device_recover(name)
+        self._abandoned = False
+
     def _suite_start(self):
+        if self._abandoned:
+            self._devices_reset()
+        if self._recorder is not None:
+            self._recorder.suite_start()
         self._tests.clear()
         self._sections.clear()
         self.env = dict(self._env)  # restore environment
         self._progress_update(0.0)
+        station_span = self._station_span
+        self._suite_span = self._tracer.start('suite', {
+            'station': self._station['name'],
+            'station.trace_id': None if station_span is None else station_span.trace_id,
+        }, root=True)
+        idle = self._operator.suite_start(time.now())  # include operator time in suite_setup
+        if idle is not None:
+            self.events.publish(events.OPERATOR, kind='idle', section=None, duration=idle)
         rc = self.test_run(self._station.get('suite_setup'))  # exclude from "progress" and logging
         if rc:
+            self._operator.suite_stop(time.now())
+            self._trace_suite_end(error=f'suite_setup returned {rc}')
             return rc
         self._suite_time_update()
+        if self._suite_span is not None:
+            self._suite_span.attributes['suite_timestr'] = self.env['suite_timestr']
         self._progress_data = []
         if self._progress is None:
             self._progress_open()
         self._suite_file_open()
         self._devices_open('suite', True)
         self._progress_file = self._fs.open('progress.csv', 'wt')
+        self.events.publish(events.SUITE_START, path=self._fs_path)
         self.section_enter('s')
         return 0
 
@@ -433,10 +893,23 @@ class Context:
         self._progress_file_close()
         self._devices_close('suite')
         self._progress_update(1.0)
+        self._analysis_wait()
+        self._history_update()
+        self._units_update()
         self.test_run(self._station.get('suite_teardown'))
-        self._log.info('*** %s ***', 'FAIL' if self.result else 'PASS')
+        result = self.result
+        self._log.info('*** %s ***', 'FAIL' if result else 'PASS')
+        self.events.publish(events.SUITE_DONE, path=self._fs_path, result=result)
         with self._fs.open('tests.json', 'wt') as f:
             pretty_json.dump(self._tests, f)
+        self._operator_save(result)
+        if self._recorder is not None:
+            self._recorder.suite_stop(self._fs)
+        suite_span = self._suite_span
+        spans = self._trace_suite_end(error=f'result {result}' if result else None)
+        if self._tracer.enabled:
+            with self._fs.open('trace.json', 'wt') as f:
+                pretty_json.dump([s.to_dict() for s in sorted(spans, key=lambda s: s.start)], f)
         if self._suite_log_file_handler:
             logging.getLogger().removeHandler(self._suite_log_file_handler)
             self._suite_log_file_handler.close()
@@ -445,31 +918,192 @@ class Context:
             self._suite_logfile.close()
             self._suite_logfile = None
 
-        self._log.info('Writing zip file (may take a while): %s', self._fs_path)
-        self._fs.close()
+        fs, path, tests = self._fs, self._fs_path, list(self._tests)
         self._fs = None
         self._fs_path = None
+        if self._pipeline is None:
+            self._suite_finalize(fs, path, tests, suite_span)
+        else:
+            depth = self._station['pipeline']
+            while len(self._pipeline_futures) >= depth:
+                self._pipeline_futures.pop(0).result()
+            self._log.info('Queue suite finalization: %s', path)
+            future = self._pipeline.submit(self._suite_finalize_guarded, dict(self.env), fs, path, tests, suite_span)
+            self._pipeline_futures.append(future)
+        self._retention.apply()  # on this thread, which owns the archive directories between suites
+
+    def _operator_save(self, result):
+        summary = self._operator.suite_stop(time.now())
+        if summary is None:
+            return
+        with self._fs.open('operator.json', 'wt') as f:
+            pretty_json.dump(summary, f)
+        if self._shift_log is not None:
+            record = dict(summary, time=self.env['suite_timestamp'], result=result, path=self._fs_path)
+            try:
+                self._shift_log.append(record)
+            except Exception:
+                self._log.exception('Could not append operator shift log %s', self._shift_log.path)
+
+    def _operator_record(self, kind, t_start, prompt=None):
+        section = self.section_name
+        duration = self._operator.record(kind, t_start, time.now(), section, prompt)
+        if duration is not None:
+            self.events.publish(events.OPERATOR, kind=kind, section=section, duration=duration)
+
+    def _history_update(self):
+        if self._history is None:
+            return
+        names = set([t['name'] for t in self._station['tests']])
+        tests = [dict(t, result=_test_result(t)) for t in self._tests if t['name'] in names and 'reused' not in t]
+        self._history.update(tests)
+        try:
+            self._history.save()
+        except Exception:
+            self._log.exception('Could not save history %s', self._history.path)
+
+    def _units_update(self):
+        if self._units is None:
+            return
+        retest = self._station['retest']
+        serial = self.env.get(retest['key'])
+        if serial is None:
+            return
+        names = set([t['name'] for t in self._station['tests']])
+        tests = [dict(t, result=_test_result(t)) for t in self._tests if t['name'] in names and 'reused' not in t]
+        t = self.env['suite_timestamp']
+        self._units.update(serial, self._fs_path, tests, t)
+        t_min = None if retest['validity'] is None else t - retest['validity']
+        self._units.prune(t_min, retest['units_max'])
+        try:
+            self._units.save()
+        except Exception:
+            self._log.exception('Could not save unit index %s', self._units.path)
+
+    def _archives_moved(self, moved):
+        """Update the unit index when retention compacts archives into bundles."""
+        if self._units is None or not self._units.relocate(moved):
+            return
+        try:
+            self._units.save()
+        except Exception:
+            self._log.exception('Could not save unit index %s', self._units.path)
+
+    def _test_reuse(self, d):
+        """Reuse the unit's previous passing result in retest mode.
+
+        :param d: The test definition.
+        :return: True if reused and the test should not run.
+        """
+        if self._units is None or not d.get('retest', True):
+            return False
+        retest = self._station['retest']
+        serial = self.env.get(retest['key'])
+        if serial is None:
+            return False  # unit not yet identified
+        entry = self._units.lookup(serial, d['name'])
+        if entry is None or entry['result']:
+            return False
+        if retest['validity'] is not None and time.now() - entry['time'] > retest['validity']:
+            return False
+        self._log.info('--- TEST REUSE %s from %s --- ', d['name'], entry['path'])
+        test = {
+            'name': d['name'],
+            'result': 0,
+            'detail': {},
+            'config': {},
+            'reused': {'path': entry['path'], 'time': time.time_to_isostr(entry['time'])},
+        }
+        self._tests.append(test)
+        return True
+
+    def _trace_suite_end(self, error=None):
+        """End the suite span.
+
+        :param error: The optional suite error message.
+        :return: The list of the suite trace's finished spans.
+        """
+        span, self._suite_span = self._suite_span, None
+        if span is None:
+            return []
+        self._tracer.end(span, error=error)
+        self._tracer.attach(self._station_span)  # discard spans left active by an interrupted test
+        return self._tracer.collect(span.trace_id)
+
+    def _suite_finalize(self, fs, path, tests, span=None):
+        """Write the suite archive and run the post-processing steps.
+
+        :param fs: The suite archive filesystem to close.
+        :param path: The suite archive path.
+        :param tests: The list of test outputs.
+        :param span: The ended suite span, which is the parent for the
+            archive write span.
+
+        In pipelined mode, this method runs on the pipeline thread
+        while the next suite starts, so it must not use the fixture.
+        """
+        self._log.info('Writing zip file (may take a while): %s', path)
+        t_start = time.now()
+        archive_span = self._tracer.start('archive write', {'path': path}, parent=span)
+        try:
+            fs.close()
+        except Exception as ex:
+            self._tracer.end(archive_span, error=repr(ex))
+            raise
+        self._tracer.end(archive_span)
+        self.events.publish(events.ARCHIVE_WRITE, path=path, duration=time.now() - t_start)
+        fn = self.handler('suite_done')
+        if fn is not None:
+            if isinstance(fn, LazyRef):
+                fn = fn.resolve()
+            try:
+                fn(self, path, tests)
+            except Exception:
+                self._log.exception('suite_done handler failed for %s', path)
+        self._metrics_save()
+
+    def _suite_finalize_guarded(self, env, fs, path, tests, span=None):
+        """Finalize a suite on the pipeline thread.
+
+        :param env: The suite environment snapshot taken when queued.
+        :param fs: The suite archive filesystem to close.
+        :param path: The suite archive path.
+        :param tests: The list of test outputs.
+        :param span: The ended suite span.
+        """
+        self._local.env = env
+        try:
+            self._suite_finalize(fs, path, tests, span)
+        except Exception:
+            self._log.exception('suite finalization failed for %s', path)
+        finally:
+            self._local.env = None
+
+    def pipeline_flush(self):
+        """Wait for all pending suite finalization to complete.
+
+        Only needed when the station "pipeline" option is enabled,
+        in which case the archive write and the "suite_done" handler
+        run on a background thread while the next suite starts.
+        """
+        while len(self._pipeline_futures):
+            self._pipeline_futures.pop(0).result()
 
     def suite_run(self):
         rc = self._suite_start()
         if rc:
             return rc
         try:
-            for d in self._station['tests']:
-                if self.do_quit:
-                    test = {'name': 'quit', 'result': 1, 'detail': {}}
-                    self._tests.append(test)
-                    return 1
-                self.test_run(self._station.get('test_setup'))
-                result = self.test_run(d)
-                self.test_run(self._station.get('test_teardown'))
-                if result == PYTATION_RETURN_CODE_SKIP_REMAINING_TESTS:
-                    break
-                elif result:
-                    self.env['error_count'] += 1
-                    if self.env['error_count'] >= self.env['error_count_to_halt']:
-                        self._log.info('Halting due to %d errors', self.env['error_count'])
-                        break
+            tests = self._station['tests']
+            if self._history is not None:
+                tests = self._history.order(tests)
+                self._log.info('adaptive test order: %s', ', '.join([t['name'] for t in tests]))
+            if self._station.get('concurrency', 1) > 1:
+                rc = self._tests_run_concurrent(tests)
+            else:
+                rc = self._tests_run(tests)
+            if rc:
+                return rc
         finally:
             self._suite_stop()
         result = self.result
@@ -477,6 +1111,177 @@ class Context:
         self._sections.clear()
         return result
 
+    def _test_run_full(self, d):
+        self.test_run(self._station.get('test_setup'))
+        result = self.test_run(d)
+        self.test_run(self._station.get('test_teardown'))
+        return result
+
+    def _test_skip_dependency(self, d, results):
+        """Check for a dependency that failed or did not run."""
+        for name in d.get('depends', []):
+            if results.get(name, 1):
+                self._log.info('--- TEST SKIP %s, dependency %s failed --- ', d['name'], name)
+                results[d['name']] = 1
+                return True
+        return False
+
+    def _test_result_update(self, result):
+        """Update the error count.
+
+        :return: True to halt the suite.
+        """
+        if result == PYTATION_RETURN_CODE_SKIP_REMAINING_TESTS:
+            return True
+        elif result:
+            self.env['error_count'] += 1
+            if self._abandoned:
+                self._log.error('Halting since an abandoned thread may still use the devices')
+                return True
+            if self.env['error_count'] >= self.env['error_count_to_halt']:
+                self._log.info('Halting due to %d errors', self.env['error_count'])
+                return True
+        return False
+
+    def _tests_quit(self):
+        test = {'name': 'quit', 'result': 1, 'detail': {}}
+        self._tests.append(test)
+        return 1
+
+    def _tests_run(self, tests):
+        results = {}
+        for d in tests:
+            if self.do_quit:
+                return self._tests_quit()
+            if self._test_skip_dependency(d, results):
+                continue
+            if self._test_reuse(d):
+                results[d['name']] = 0
+                continue
+            with self._arbiter.acquire(self._test_devices(d), owner=d['name']):
+                self._local.owner = d['name']
+                try:
+                    result = self._test_run_full(d)
+                finally:
+                    self._local.owner = None
+            results[d['name']] = result
+            if self._test_result_update(result):
+                break
+        return 0
+
+    def _test_devices(self, d):
+        """Get the devices required by a test, resolving lazy tests."""
+        if d['devices'] is None:
+            try:
+                fn = d['fn'].resolve()
+            except Exception:
+                return set()  # test_run reports the failure
+            d['devices'] = getattr(fn, 'DEVICES', [])
+        return set(d['devices'])
+
+    def _test_run_thread(self, d, sections, span=None):
+        """Run a test on a concurrent test thread.
+
+        :param d: The test definition.
+        :param sections: The section list for the suite.
+        :param span: The parent trace span.
+        :return: The tuple of the test result and list of test outputs.
+        """
+        self._local.sections = list(sections)
+        self._local.tests = []
+        self._tracer.attach(span)
+        self._local.owner = d['name']
+        self._local.log_id = log_id = object()
+        log_file, log_handler = None, None
+        if self._fs is not None:
+            fname = sanitize_filename(d['name'])
+            self._fs.makedir(fname, recreate=True)
+            log_file = self._fs.open(f'{fname}/log.txt', 'wt')
+            log_handler = logging.StreamHandler(log_file)
+            log_handler.setLevel(logging.DEBUG)
+            self._trace_log_configure(log_handler)
+            # filters run on the logging thread, which may be this test's guard thread
+            log_handler.addFilter(lambda record: self._local.log_id is log_id)
+            logging.getLogger().addHandler(log_handler)
+        try:
+            result = self._test_run_full(d)
+            return result, self._local.tests
+        finally:
+            if log_handler is not None:
+                logging.getLogger().removeHandler(log_handler)
+                log_handler.close()
+                log_file.close()
+            self._local.tests = None
+            self._local.sections = []
+            self._local.owner = None
+            self._local.log_id = None
+            self._tracer.attach(None)
+
+    def _tests_run_concurrent(self, tests):
+        """Run the tests concurrently as a dependency graph.
+
+        A test starts once all tests it "depends" upon have passed and
+        it acquires the lease for all of its devices.  Ready tests start
+        in the provided order.  When no test is running and the devices
+        of all ready tests are held elsewhere, the first ready test
+        waits for its devices.  The test outputs are stored in this
+        order, and each test also writes its own "log.txt".
+        """
+        pending = list(tests)
+        running = {}  # future: (test, lease)
+        results = {}
+        outputs = {}
+        halt = False
+
+        def start(d, lease):
+            pending.remove(d)
+            future = pool.submit(self._test_run_thread, d, self._sections, self._tracer.current())
+            running[future] = (d, lease)
+
+        with ThreadPoolExecutor(max_workers=self._station['concurrency'],
+                                thread_name_prefix='pytation_test') as pool:
+            while len(pending) or len(running):
+                halt = halt or self.do_quit
+                blocked = []  # ready tests waiting for devices
+                for d in list(pending):
+                    if halt or len(running) >= self._station['concurrency']:
+                        break
+                    if any([name not in results for name in d.get('depends', [])]):
+                        continue
+                    if self._test_skip_dependency(d, results):
+                        pending.remove(d)
+                        continue
+                    if self._test_reuse(d):
+                        pending.remove(d)
+                        outputs[d['name']] = [self._tests.pop()]
+                        results[d['name']] = 0
+                        continue
+                    lease = self._arbiter.acquire(self._test_devices(d), owner=d['name'], timeout=0)
+                    if lease is None:
+                        blocked.append(d)
+                        continue
+                    start(d, lease)
+                if not len(running):
+                    if halt or not len(pending):
+                        break
+                    # dependencies are earlier tests, so a pending test is ready
+                    d = blocked[0]
+                    self._log.info('%s waits for devices %s', d['name'], sorted(self._test_devices(d)))
+                    start(d, self._arbiter.acquire(self._test_devices(d), owner=d['name']))
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    d, lease = running.pop(future)
+                    lease.release()
+                    result, outputs[d['name']] = future.result()
+                    results[d['name']] = result
+                    halt = self._test_result_update(result) or halt
+        for d in tests:
+            self._tests.extend(outputs.get(d['name'], []))
+        if self.do_quit and len(pending):
+            return self._tests_quit()
+        return 0
+
     @property
     def result(self):
         """Get the test result.
@@ -484,8 +1289,9 @@ class Context:
         :return: 0 on success or error code on failure.
         """
         for test in self._tests:
-            if test['result']:
-                return test['result']
+            rc = _test_result(test)
+            if rc:
+                return rc
         return 0
 
     def result_str(self):
@@ -493,9 +1299,10 @@ class Context:
         rv = 0
         s.append('Test results:')
         for test in self._tests:
-            s.append('    %s: %s' % (test['name'], test['result']))
-            if test['result'] and rv == 0:
-                rv = test['result']
+            rc = _test_result(test)
+            s.append('    %s: %s' % (test['name'], rc))
+            if rc and rv == 0:
+                rv = rc
         s.append('*** FAIL ***' if rv else '*** PASS ***')
         return '\n'.join(s)
 
@@ -530,8 +1337,11 @@ class Context:
         section().
         """
         t_start = time.now()
-        self._sections.append([name, t_start])
-        self._log.info('%s start', self.section_name)
+        self._sections.append([name, t_start, None])
+        section_name = self.section_name
+        self._sections[-1][2] = self._tracer.start(f'section {section_name}', {'section': section_name})
+        self._log.info('%s start', section_name)
+        self.events.publish(events.SECTION_ENTER, name=section_name)
         self.progress('__enter__')
 
     def section_exit(self, name=None):
@@ -545,12 +1355,14 @@ class Context:
         if not len(self._sections):
             raise RuntimeError('section_stop with no section')
         section_name = self.section_name
-        s_name, start_time = self._sections.pop()
+        s_name, start_time, span = self._sections.pop()
+        self._tracer.end(span)
         if name is not None and s_name != name:
             raise RuntimeError(f'section_stop name mismatch: {name} != {s_name}')
         stop_time = time.now()
         duration = stop_time - start_time
         self._log.info('%s: done, duration=%.3f seconds', section_name, duration)
+        self.events.publish(events.SECTION_EXIT, name=section_name, duration=duration)
 
     def _progress_update(self, progress):
         """Inform callbacks about total suite progress.
@@ -558,11 +1370,7 @@ class Context:
         :param progress: The total suite progress as a fract from
             0.0 (starting) and 1.0 (done).
         """
-        for fn in self._cbk['progress']:
-            try:
-                fn(progress)
-            except Exception:
-                self._log.exception('during callback')
+        self.events.publish(events.PROGRESS, progress=progress)
 
     def progress(self, progress):
         """Signal a progress step.
@@ -576,8 +1384,9 @@ class Context:
         t = time.now() - self.env['suite_timestamp']
         section_name = self.section_name
         s = '%.3f,%s,%r\n' % (t, section_name, progress)
-        self._progress_data.append(s)
-        self._progress_file.write(s)
+        with self._progress_lock:
+            self._progress_data.append(s)
+            self._progress_file.write(s)
         self._log.debug('%s: %s', section_name, progress)
         if self._progress is not None:
             progress_total = self._progress.lookup(section_name, progress)
@@ -587,12 +1396,15 @@ class Context:
     def wait_for_user(self):
         """Wait for the user to perform an action."""
         self.progress('__wait_enter__ wait_for_user')
+        t_start = time.now()
         try:
             for fn in self._cbk['wait_for_user']:
                 if self.do_quit:
                     raise KeyboardInterrupt('do_quit signaled')
+                self.check_cancel()
                 fn()
         finally:
+            self._operator_record('wait', t_start)
             self.progress('__wait_exit__ wait_for_user')
 
     def prompt(self, prompt_str):
@@ -604,16 +1416,21 @@ class Context:
         prompt_str = str(prompt_str)
         p = f'prompt({prompt_str})'
         self.progress('__prompt_enter__ ' + p)
+        t_start = time.now()
         try:
             while True:
                 for fn in self._cbk['prompt']:
                     if self.do_quit:
                         raise KeyboardInterrupt('do_quit signaled')
+                    self.check_cancel()
                     result_str = fn(prompt_str)
                     if result_str is not None:
                         self._log.info('prompt(%s) -> %s', prompt_str, result_str)
+                        if self._recorder is not None:
+                            self._recorder.record(replay.OPERATOR, 'call', 'prompt', (prompt_str, ), {}, result_str)
                         return result_str
         finally:
+            self._operator_record('prompt', t_start, prompt_str)
             self.progress('__prompt_exit__ ' + p)
 
     def callback_register(self, name, cbk):
@@ -641,8 +1458,19 @@ class Context:
               - prompt_str: The string to display to the user
               - returns the string entered by the user or None on error.
         :raise KeyError: if name is not valid
+
+        The progress and state callbacks are synchronous subscribers
+        to :attr:`events`.  Use events.subscribe() directly for
+        asynchronous delivery and the other event types.
         """
         self._cbk[name].append(cbk)
+        if name == 'progress':
+            sub = self.events.subscribe(lambda e: cbk(e.data['progress']), [events.PROGRESS], sync=True)
+        elif name == 'state':
+            sub = self.events.subscribe(lambda e: cbk(e.data['state']), [events.STATE], sync=True)
+        else:
+            return
+        self._cbk_subscriptions.setdefault((name, cbk), []).append(sub)
 
     def callback_unregister(self, name, cbk):
         """Remove a previously registered callback function.
@@ -652,6 +1480,8 @@ class Context:
          :raise KeyError: if name is not valid.
          """
         self._cbk[name] = [fn for fn in self._cbk[name] if fn != cbk]
+        for sub in self._cbk_subscriptions.pop((name, cbk), []):
+            sub.close()
 
 
 class Section:
@@ -0,0 +1,130 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Store large numeric test details as binary sidecar files.
+
+Tests may return NumPy arrays in their details.  Rather than inflating
+large arrays into JSON text, the station saves each array with at least
+the threshold bytes as a ".npy" file in the suite archive.  tests.json
+contains a reference dict in place of the array:
+
+    {"__npy__": "test_name/detail.samples.npy", "dtype": "float64", "shape": [1000000]}
+
+The :class:`DetailView` loads referenced arrays on first access.
+"""
+
+from collections.abc import Mapping
+import re
+
+
+THRESHOLD_DEFAULT = 4096  # bytes
+REF_KEY = '__npy__'
+_re_invalid = re.compile(r'[^\w\-.]')
+
+
+def is_array(value):
+    """Check for a NumPy array without importing NumPy."""
+    return type(value).__module__ == 'numpy' and hasattr(value, 'nbytes') and hasattr(value, 'shape')
+
+
+def is_ref(value):
+    """Check for a binary detail reference."""
+    return isinstance(value, Mapping) and REF_KEY in value
+
+
+def store(fs, path, detail, threshold=THRESHOLD_DEFAULT):
+    """Save large arrays to binary files and replace them with references.
+
+    :param fs: The suite archive filesystem.
+    :param path: The directory path within fs for the test.
+    :param detail: The test detail, which is not modified.
+    :param threshold: The minimum array size in bytes to store as a
+        binary file.
+    :return: The detail with large arrays replaced by references.
+        Returns detail unmodified when it contains no large arrays.
+    """
+    return _store(fs, path, detail, threshold, 'detail')
+
+
+def _store(fs, path, value, threshold, name):
+    if is_array(value):
+        if value.nbytes < threshold or value.dtype.hasobject:
+            return value
+        import numpy as np
+        fpath = f'{path}/{name}.npy'
+        with fs.open(fpath, 'wb') as f:
+            np.save(f, value, allow_pickle=False)
+        return {REF_KEY: fpath, 'dtype': str(value.dtype), 'shape': list(value.shape)}
+    elif isinstance(value, Mapping):
+        d = {}
+        for k, v in value.items():
+            d[k] = _store(fs, path, v, threshold, name + '.' + _re_invalid.sub('_', str(k)))
+        if all([d[k] is v for k, v in value.items()]):
+            return value
+        return d
+    return value
+
+
+def load(fs, ref):
+    """Load a binary detail.
+
+    :param fs: The suite archive filesystem.
+    :param ref: The reference dict.
+    :return: The NumPy array.
+    """
+    import numpy as np
+    with fs.open(ref[REF_KEY], 'rb') as f:
+        return np.load(f, allow_pickle=False)
+
+
+class DetailView(Mapping):
+    """Read-only test details that load binary references on access.
+
+    :param detail: The detail dict from tests.json.
+    :param fs: The suite archive filesystem.
+    """
+
+    def __init__(self, detail, fs):
+        self._detail = detail
+        self._fs = fs
+        self._cache = {}
+
+    def __repr__(self):
+        return f'DetailView({self._detail!r})'
+
+    def __getitem__(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        value = self._detail[key]
+        if is_ref(value):
+            value = load(self._fs, value)
+        elif isinstance(value, Mapping):
+            value = DetailView(value, self._fs)
+        else:
+            return value
+        self._cache[key] = value
+        return value
+
+    def __len__(self):
+        return len(self._detail)
+
+    def __iter__(self):
+        return iter(self._detail)
+
+    def __eq__(self, other):
+        if isinstance(other, DetailView):
+            other = other._detail
+        return self._detail == other
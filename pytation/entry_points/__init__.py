@@ -12,6 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import analyze, cli, gui
-
-__all__ = ['analyze', 'cli', 'gui']
+# Entry point modules are imported by name when building the parser.
+# Keep their top-level imports light and defer heavy imports to on_cmd().
+__all__ = ['analyze', 'cli', 'gui', 'operator_time', 'replay', 'simulate', 'web']
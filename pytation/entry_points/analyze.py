@@ -13,7 +13,6 @@
 # limitations under the License.
 
 
-from pytation.analysis import AnalysisContext
 import glob
 import os
 
@@ -50,5 +49,6 @@ def on_cmd(args):
         print(available)
         return 1
 
-    context = AnalysisContext(path)
-    return context.run(args.test)
+    from pytation.analysis import AnalysisContext
+    with AnalysisContext(path) as context:
+        return context.run(args.test)
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 from pytation import loader
-from pytation import cli_runner
 
 
 def parser_config(p):
@@ -27,9 +26,10 @@ def parser_config(p):
 
 
 def on_cmd(args):
+    from pytation import cli_runner
     station = loader.load(args)
     obj = cli_runner.CliStation(station)
     iterations = args.iterations
     if iterations <= 0:
-        iterations = count
+        iterations = None
     return obj.run(count=iterations)
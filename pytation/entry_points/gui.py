@@ -13,7 +13,6 @@
 # limitations under the License.
 
 from pytation import loader
-from pytation import gui_runner
 
 
 def parser_config(p):
@@ -23,5 +22,6 @@ def parser_config(p):
 
 
 def on_cmd(args):
+    from pytation import gui_runner  # defer Qt import
     station = loader.load(args)
     return gui_runner.run(station)
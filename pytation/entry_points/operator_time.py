@@ -0,0 +1,55 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import os
+
+
+NAME = 'operator'
+
+
+def _shift(value):
+    name, sep, start = value.partition('=')
+    if not sep:
+        raise ValueError(f'invalid shift, expect name=HH:MM: {value}')
+    return {'name': name, 'start': start}
+
+
+def parser_config(p):
+    """Report throughput and operator time by shift."""
+    p.add_argument('--shift',
+                   action='append',
+                   type=_shift,
+                   help='The shift as name=HH:MM, the local start time.  Repeat for each shift.  '
+                        'If none specified, use the station "operator" shifts or report by calendar day.')
+    p.add_argument('--station',
+                   help='The fully-qualified station definition that provides the default shifts.')
+    p.add_argument('path',
+                   help='The path to the station operator.jsonl shift log.')
+    return on_cmd
+
+
+def on_cmd(args):
+    from pytation import operator_time
+    if not os.path.isfile(args.path):
+        print(f'File not found: {args.path}')
+        return 1
+    shifts = args.shift
+    if shifts is None and args.station:
+        from pytation import loader
+        station = loader.load(argparse.Namespace(station=args.station, exclude=None, include=None, lazy=True))
+        shifts = (station['operator'] or {}).get('shifts')
+    records = operator_time.ShiftLog(args.path).load()
+    print(operator_time.report(operator_time.aggregate(records, shifts)))
+    return 0
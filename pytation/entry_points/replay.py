@@ -0,0 +1,52 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pytation import loader
+
+
+def parser_config(p):
+    """Rerun tests offline against the device I/O recorded in a suite archive.
+
+    The suite must have run with the station "record" option enabled.
+    """
+    loader.parser_config(p)
+    p.add_argument('--test', '-t',
+                   action='append',
+                   help='Replay the specified test.  If none specified, replay all recorded tests.')
+    p.add_argument('--strict',
+                   action='store_true',
+                   help='Fail when the tests pass different arguments to the devices than recorded.')
+    p.add_argument('path',
+                   help='The path to the suite archive.')
+    return on_cmd
+
+
+def on_cmd(args):
+    from pytation import replay
+    station = loader.load(args)
+    r = replay.Replay(args.path, strict=args.strict)
+    rc = 0
+    try:
+        results = r.run(station, args.test)
+    except replay.ReplayError as ex:
+        print(f'Replay failed: {ex}')
+        return 1
+    for t in results:
+        status = 'same' if t['result'] == t['recorded'] else 'CHANGED'
+        print(f'{t["name"]:>24s}  result={t["result"]}  recorded={t["recorded"]}  {status}')
+        if t['result'] != t['recorded']:
+            rc = 1
+    for msg in r.player.mismatches:
+        print(f'mismatch: {msg}')
+    return rc
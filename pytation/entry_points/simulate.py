@@ -0,0 +1,55 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pytation import loader
+
+
+def parser_config(p):
+    """Simulate a station to predict its throughput without hardware."""
+    loader.parser_config(p)
+    p.add_argument('--iterations',
+                   default=100,
+                   type=int,
+                   help='The number of suites to simulate.')
+    p.add_argument('--archives',
+                   help='The directory containing the recorded suite archives.  '
+                        'Defaults to the station output directory.')
+    p.add_argument('--limit',
+                   type=int,
+                   help='The maximum number of most recent archives to use.')
+    p.add_argument('--seed',
+                   type=int,
+                   help='The random seed for repeatable simulations.')
+    return on_cmd
+
+
+def on_cmd(args):
+    from pytation import simulation
+    import glob
+    import os
+    station = loader.load(args)
+    if args.archives:
+        paths = sorted(glob.glob(os.path.join(args.archives, '*.zip')))
+        if args.limit:
+            paths = paths[-args.limit:]
+    else:
+        paths = simulation.archives_find(station, args.limit)
+    if not len(paths):
+        print('No recorded suite archives found')
+        return 1
+    model = simulation.TimingModel.from_archives(paths)
+    print(f'Timing model from {model.suites} suites')
+    sim = simulation.Simulation(station, model, seed=args.seed)
+    print(simulation.report(sim.run(args.iterations)))
+    return 0
@@ -0,0 +1,46 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from pytation import loader
+
+
+def parser_config(p):
+    """Headless runner with a local HTTP and WebSocket dashboard."""
+    loader.parser_config(p)
+    p.add_argument('--iterations',
+                   default=1,
+                   type=int,
+                   help='The number of iterations. 0=infinite')
+    p.add_argument('--host',
+                   default='127.0.0.1',
+                   help='The host address to serve.  Use 0.0.0.0 to allow remote connections.')
+    p.add_argument('--allow-host',
+                   action='append',
+                   help='An additional host name that clients use to reach the server, '
+                        'such as a DNS alias.  Repeat for each name.')
+    p.add_argument('--port',
+                   default=8080,
+                   type=int,
+                   help='The TCP port to serve.')
+    return on_cmd
+
+
+def on_cmd(args):
+    from pytation import web_runner
+    station = loader.load(args)
+    obj = web_runner.WebStation(station, host=args.host, port=args.port, allowed_hosts=args.allow_host)
+    iterations = args.iterations
+    if iterations <= 0:
+        iterations = None
+    return obj.run(count=iterations)
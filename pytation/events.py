@@ -0,0 +1,308 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Publish typed station events to subscribers.
+
+The :class:`EventBus` delivers each :class:`Event` to its subscribers.
+Synchronous subscribers run on the publishing thread, so they must be
+fast.  Asynchronous subscribers each have their own bounded queue and
+delivery thread, so slow subscribers, like user interfaces, metrics
+exporters, and uploaders, never delay the tests.  When an asynchronous
+subscriber falls behind, its queue policy decides what to discard:
+
+* drop_oldest: Discard the oldest queued event (default).
+* drop_newest: Discard the new event.
+* coalesce: Replace the queued event of the same kind with the new
+  event, for event types where only the latest value matters, like
+  progress and state.  Other events use drop_oldest.
+
+The :data:`TEST_START` and :data:`TEST_DONE` events include "hook",
+which is True for the station, suite, and test setup and teardown
+functions.
+"""
+
+from pytation import time
+import collections
+import logging
+import threading
+
+
+SUITE_START = 'suite_start'
+SUITE_DONE = 'suite_done'
+SECTION_ENTER = 'section_enter'
+SECTION_EXIT = 'section_exit'
+TEST_START = 'test_start'
+TEST_DONE = 'test_done'
+DEVICE_OPEN = 'device_open'
+DEVICE_RESTORE = 'device_restore'
+DEVICE_CLOSE = 'device_close'
+ARCHIVE_WRITE = 'archive_write'
+OPERATOR = 'operator'
+PROGRESS = 'progress'
+STATE = 'state'
+LOG = 'log'
+EVENT_TYPES = (SUITE_START, SUITE_DONE, SECTION_ENTER, SECTION_EXIT, TEST_START, TEST_DONE,
+               DEVICE_OPEN, DEVICE_RESTORE, DEVICE_CLOSE, ARCHIVE_WRITE, OPERATOR,
+               PROGRESS, STATE, LOG)
+COALESCE_TYPES = (PROGRESS, STATE)
+POLICIES = ('drop_oldest', 'drop_newest', 'coalesce')
+QUEUE_SIZE_DEFAULT = 1000
+_log = logging.getLogger(__name__)
+_delivering = threading.local()  # log is True while this thread delivers a LOG event
+
+
+class Event:
+    """A station event.
+
+    :param event_type: The event type, which is one of :data:`EVENT_TYPES`.
+    :param data: The event data dict.
+    """
+
+    __slots__ = ['type', 'time', 'data']
+
+    def __init__(self, event_type, data):
+        self.type = event_type  #: The event type str.
+        self.time = time.now()  #: The event time in seconds since the epoch.
+        self.data = data  #: The event data dict.
+
+    def __repr__(self):
+        return f'Event({self.type!r}, {self.data!r})'
+
+
+class Subscription:
+    """An event subscriber.
+
+    Use :meth:`EventBus.subscribe` to create instances.
+    """
+
+    def __init__(self, bus, fn, types, sync, queue_size, policy):
+        if policy not in POLICIES:
+            raise ValueError(f'invalid policy: {policy}')
+        self._bus = bus
+        self.fn = fn  #: The callable fn(event).
+        self.types = None if types is None else frozenset(types)  #: The subscribed event types or None for all.
+        self.sync = bool(sync)  #: True to deliver on the publishing thread.
+        self.policy = policy  #: The queue policy for asynchronous delivery.
+        self.delivered = 0  #: The number of delivered events.
+        self.dropped = 0  #: The number of discarded events.
+        self._queue_size = max(1, int(queue_size))
+        self._queue = collections.deque()  # of [event] boxes
+        self._coalesce = {}  # event type: queued box
+        self._cv = threading.Condition()
+        self._busy = False
+        self._quit = False
+        self._thread = None
+        if not self.sync:
+            self._thread = threading.Thread(target=self._run, name='pytation_events', daemon=True)
+            self._thread.start()
+
+    def _deliver(self, event):
+        delivering_log = getattr(_delivering, 'log', False)
+        _delivering.log = delivering_log or event.type == LOG
+        try:
+            self.fn(event)
+        except Exception:
+            _log.exception('event subscriber failed on %s', event.type)
+        finally:
+            _delivering.log = delivering_log
+        self.delivered += 1
+
+    def _put(self, event):
+        if self.sync:
+            return self._deliver(event)
+        with self._cv:
+            if self._quit:
+                return
+            if self.policy == 'coalesce' and event.type in COALESCE_TYPES:
+                box = self._coalesce.get(event.type)
+                if box is not None:
+                    box[0] = event
+                    self.dropped += 1
+                    return
+            if len(self._queue) >= self._queue_size:
+                self.dropped += 1
+                if self.policy == 'drop_newest':
+                    return
+                old = self._queue.popleft()
+                if self._coalesce.get(old[0].type) is old:
+                    del self._coalesce[old[0].type]
+            box = [event]
+            self._queue.append(box)
+            if self.policy == 'coalesce' and event.type in COALESCE_TYPES:
+                self._coalesce[event.type] = box
+            self._cv.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cv:
+                self._busy = False
+                self._cv.notify_all()
+                while not len(self._queue) and not self._quit:
+                    self._cv.wait()
+                if not len(self._queue):
+                    return
+                box = self._queue.popleft()
+                event = box[0]
+                if self._coalesce.get(event.type) is box:
+                    del self._coalesce[event.type]
+                self._busy = True
+            self._deliver(event)
+
+    @property
+    def queued(self):
+        """The number of events waiting for delivery."""
+        with self._cv:
+            return len(self._queue)
+
+    def flush(self, timeout=None):
+        """Wait for all queued events to be delivered.
+
+        :param timeout: The maximum time to wait in seconds.  None (default)
+            waits indefinitely.
+        :return: True if all events were delivered.
+        """
+        if self.sync or threading.current_thread() is self._thread:
+            return True
+        with self._cv:
+            return self._cv.wait_for(lambda: not len(self._queue) and not self._busy, timeout)
+
+    def close(self):
+        """Unsubscribe, deliver the queued events, and stop."""
+        self._bus._unsubscribe(self)
+        with self._cv:
+            self._quit = True
+            self._cv.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+
+class EventBus:
+    """Deliver events to synchronous and asynchronous subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        self._by_type = {}  # event type: tuple of subscriptions
+
+    def subscribe(self, fn, types=None, sync=False, queue_size=None, policy=None):
+        """Subscribe to events.
+
+        :param fn: The callable fn(event) for each :class:`Event`.
+        :param types: The iterable of event types.  None (default)
+            subscribes to all event types.
+        :param sync: True to call fn on the publishing thread.  False
+            (default) calls fn on the subscription's own thread.
+        :param queue_size: The maximum number of queued events for
+            asynchronous subscribers.  None uses :data:`QUEUE_SIZE_DEFAULT`.
+        :param policy: The queue policy, which is one of :data:`POLICIES`.
+            None uses drop_oldest.
+        :return: The :class:`Subscription`.  Call its close() method
+            to unsubscribe.
+        """
+        queue_size = QUEUE_SIZE_DEFAULT if queue_size is None else queue_size
+        policy = 'drop_oldest' if policy is None else policy
+        sub = Subscription(self, fn, types, sync, queue_size, policy)
+        with self._lock:
+            self._subscriptions.append(sub)
+            self._rebuild()
+        return sub
+
+    def _unsubscribe(self, sub):
+        with self._lock:
+            if sub in self._subscriptions:
+                self._subscriptions.remove(sub)
+                self._rebuild()
+
+    def _rebuild(self):
+        self._by_type = {}
+        for event_type in EVENT_TYPES:
+            self._by_type[event_type] = tuple([s for s in self._subscriptions
+                                               if s.types is None or event_type in s.types])
+
+    @property
+    def subscriptions(self):
+        """The list of current :class:`Subscription` instances."""
+        with self._lock:
+            return list(self._subscriptions)
+
+    def has_subscribers(self, event_type):
+        """Check for subscribers.
+
+        :param event_type: The event type.
+        :return: True if any subscriber receives the event type.
+        """
+        return bool(self._by_type.get(event_type))
+
+    def publish(self, event_type, **data):
+        """Publish an event.
+
+        :param event_type: The event type, which is one of :data:`EVENT_TYPES`.
+        :param data: The event data.
+        :return: The :class:`Event` or None if no subscribers.
+        """
+        subscriptions = self._by_type.get(event_type)
+        if not subscriptions:
+            return None
+        event = Event(event_type, data)
+        for sub in subscriptions:
+            sub._put(event)
+        return event
+
+    def flush(self, timeout=None):
+        """Wait for all asynchronous subscribers to deliver their events.
+
+        :param timeout: The maximum time to wait in seconds for each
+            subscriber.  None (default) waits indefinitely.
+        :return: True if all events were delivered.
+        """
+        return all([sub.flush(timeout) for sub in self.subscriptions])
+
+    def close(self):
+        """Close all subscriptions."""
+        for sub in self.subscriptions:
+            sub.close()
+
+
+class LogHandler(logging.Handler):
+    """Publish log records as :data:`LOG` events.
+
+    :param bus: The :class:`EventBus`.
+    :param level: The minimum log level.
+
+    The event data contains the logger name, level name, message,
+    and thread ident.  Records logged while a synchronous or
+    asynchronous subscriber handles a log event, including its
+    failures, are not published again, which would otherwise loop.
+    """
+
+    def __init__(self, bus, level=logging.INFO):
+        super().__init__(level)
+        self._bus = bus
+        self._active = threading.local()
+
+    def emit(self, record):
+        if not self._bus.has_subscribers(LOG) or getattr(self._active, 'value', False):
+            return
+        if getattr(_delivering, 'log', False):
+            return
+        self._active.value = True
+        try:
+            self._bus.publish(LOG, name=record.name, level=record.levelname,
+                              message=record.getMessage(), thread=record.thread)
+        except Exception:
+            self.handleError(record)
+        finally:
+            self._active.value = False
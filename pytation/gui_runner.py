@@ -16,6 +16,9 @@ import sys
 from pytation import __version__, Context
 from PySide6 import QtCore, QtWidgets, QtGui
 from time import sleep
+import collections
+import copy
+import itertools
 import pkgutil
 import queue
 import threading
@@ -29,6 +32,11 @@ LOG_COLOR = {
     logging.INFO: QtGui.QColor(0, 0, 0),
     logging.DEBUG: QtGui.QColor(128, 128, 128),
 }
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+LOG_LEVEL_DEFAULT = 'INFO'
+LOG_CAPACITY = 10000  # log records retained by the GUI
+LOG_FLUSH_INTERVAL_MS = 33  # batch log appends per display frame
+STATE_STYLE_DEFAULT = 'QLabel { background-color : white; color : black; font-size : 12pt; }'
 
 
 class Handler(logging.Handler):
@@ -53,6 +61,155 @@ class Formatter(logging.Formatter):
         return s
 
 
+class LogModel(QtCore.QAbstractListModel):
+    """A ring buffer of log records with level filtering.
+
+    :param formatter: The logging.Formatter for display.
+    :param capacity: The maximum number of records to retain.
+
+    Records are formatted only when first displayed.  Records below the
+    level when appended are discarded, so a flood of hidden records
+    never evicts the visible rows.
+    """
+
+    def __init__(self, formatter, capacity=None, parent=None):
+        super(LogModel, self).__init__(parent)
+        self._formatter = formatter
+        capacity = LOG_CAPACITY if capacity is None else capacity
+        self._records = collections.deque(maxlen=capacity)  # of [levelno, record, text]
+        self._rows = collections.deque()  # the visible subset of _records, in order
+        self._level = logging.getLevelName(LOG_LEVEL_DEFAULT)
+        self._brushes = dict([(k, QtGui.QBrush(v)) for k, v in LOG_COLOR.items()])
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        entry = self._rows[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            if entry[2] is None:
+                entry[2] = self._formatter.format(entry[1])
+            return entry[2]
+        elif role == QtCore.Qt.ForegroundRole:
+            return self._brushes.get(entry[0])
+        return None
+
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, level):
+        """Show only records with at least this level."""
+        if level == self._level:
+            return
+        self.beginResetModel()
+        self._level = level
+        self._rows = collections.deque([e for e in self._records if e[0] >= level])
+        self.endResetModel()
+
+    def append(self, records):
+        """Append a batch of log records.
+
+        :param records: The list of logging.LogRecord instances.
+        """
+        if not len(records):
+            return
+        records = [r for r in records if r.levelno >= self._level]
+        if not len(records):
+            return
+        maxlen = self._records.maxlen
+        records = records[-maxlen:]
+        entries = [[r.levelno, r, None] for r in records]
+        drop = max(0, len(self._records) + len(entries) - maxlen)
+        drop_rows = len([e for e in itertools.islice(self._records, drop) if e[0] >= self._level])
+        if drop_rows:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, drop_rows - 1)
+            for _ in range(drop_rows):
+                self._rows.popleft()
+            self.endRemoveRows()
+        self._records.extend(entries)
+        rows = [e for e in entries if e[0] >= self._level]
+        if len(rows):
+            first = len(self._rows)
+            self.beginInsertRows(QtCore.QModelIndex(), first, first + len(rows) - 1)
+            self._rows.extend(rows)
+            self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._records.clear()
+        self._rows.clear()
+        self.endResetModel()
+
+
+class StateCache:
+    """Decode and scale the state visuals once.
+
+    :param states: The station states dict.
+
+    Each state's pixmap is decoded once.  The scaled copy is cached
+    until the label size changes.
+    """
+
+    def __init__(self, states):
+        self._log = logging.getLogger('pytation.gui')
+        self._states = {}
+        self._pixmaps = {}  # resource path to decoded QPixmap or None
+        for name, state in states.items():
+            self.get(state)
+
+    def _pixmap_load(self, path):
+        if path not in self._pixmaps:
+            pixmap = QtGui.QPixmap(path)
+            if pixmap.isNull():
+                self._log.warning('QPixmap failed for resource %s', path)
+                pixmap = None
+            else:
+                self._log.info('image_label pixmap: %s => %s', path, pixmap.size())
+            self._pixmaps[path] = pixmap
+        return self._pixmaps[path]
+
+    def get(self, state):
+        """Get the cached visuals for a state.
+
+        :param state: The state information dict.
+        :return: The dict with pixmap, style, and html.
+        """
+        name = state.get('name')
+        entry = self._states.get(name)
+        if entry is None or entry['state'] is not state:
+            path = state.get('pixmap')
+            entry = {
+                'state': state,
+                'pixmap': None if path is None else self._pixmap_load(path),
+                'style': state.get('style', STATE_STYLE_DEFAULT),
+                'html': state.get('html', ''),
+                'scaled': None,
+            }
+            self._states[name] = entry
+        return entry
+
+    def scaled(self, entry, size):
+        """Get the state pixmap scaled to fit the size.
+
+        :param entry: The entry returned by :meth:`get`.
+        :param size: The QSize to fit.
+        :return: The scaled QPixmap or None.
+        """
+        pixmap = entry['pixmap']
+        if pixmap is None or size.isEmpty():
+            return pixmap
+        scaled = entry['scaled']
+        if scaled is None or scaled[0] != size:
+            p = pixmap.scaled(size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+            scaled = (QtCore.QSize(size), p)
+            entry['scaled'] = scaled
+        return scaled[1]
+
+
 class QResyncEvent(QtCore.QEvent):
     """An event containing a request for python message processing."""
     EVENT_TYPE = QtCore.QEvent.Type(QtCore.QEvent.registerEventType())
@@ -135,7 +292,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self._station_thread = None
         self._station = None
         self._queue = queue.Queue()
-        self._pixmap_bin = None
+        self._log_records = []  # pending batch, only accessed from the GUI thread
+        self._resync_lock = threading.Lock()
+        self._resync_pending = False
+        self._state_cache = StateCache(station['states'])
+        self._state_entry = None
+        self._stage_style = None
+        self._stage_html = None
 
         self.resize(800, 600)
 
@@ -167,6 +330,7 @@ class MainWindow(QtWidgets.QMainWindow):
         size_policy.setHeightForWidth(self._image_label.sizePolicy().hasHeightForWidth())
         self._image_label.setSizePolicy(size_policy)
         self._image_label.setAlignment(QtGui.Qt.AlignCenter)
+        self._image_label.setMinimumSize(1, 1)  # allow shrink, pixmap scaled to fit
         self._horizontal_layout.addWidget(self._image_label)
 
         self._stage_text = QtWidgets.QLabel(self._frame)
@@ -176,12 +340,27 @@ class MainWindow(QtWidgets.QMainWindow):
         self._stage_text.setAlignment(QtGui.Qt.AlignCenter)
         self._horizontal_layout.addWidget(self._stage_text)
 
-        self._logging_textEdit = QtWidgets.QTextEdit(self._central_widget)
-        self._logging_textEdit.setObjectName('_logging_textEdit')
-        self._logging_textEdit.setUndoRedoEnabled(False)
-        self._logging_textEdit.setReadOnly(True)
-        self._logging_textEdit.setTextInteractionFlags(QtGui.Qt.NoTextInteraction)
-        self._vertical_layout.addWidget(self._logging_textEdit)
+        self._log_level_layout = QtWidgets.QHBoxLayout()
+        self._log_level_layout.setObjectName('_log_level_layout')
+        self._log_level_label = QtWidgets.QLabel('Log level', self._central_widget)
+        self._log_level_layout.addWidget(self._log_level_label)
+        self._log_level_combo = QtWidgets.QComboBox(self._central_widget)
+        self._log_level_combo.setObjectName('_log_level_combo')
+        self._log_level_combo.addItems(LOG_LEVELS)
+        self._log_level_combo.setCurrentText(LOG_LEVEL_DEFAULT)
+        self._log_level_combo.currentTextChanged.connect(self._on_log_level)
+        self._log_level_layout.addWidget(self._log_level_combo)
+        self._log_level_layout.addStretch(1)
+        self._vertical_layout.addLayout(self._log_level_layout)
+
+        self._log_model = LogModel(self._formatter, parent=self)
+        self._logging_view = QtWidgets.QListView(self._central_widget)
+        self._logging_view.setObjectName('_logging_view')
+        self._logging_view.setUniformItemSizes(True)
+        self._logging_view.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self._logging_view.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self._logging_view.setModel(self._log_model)
+        self._vertical_layout.addWidget(self._logging_view)
 
         self._progress_bar = QtWidgets.QProgressBar(self._central_widget)
         self._progress_bar.setObjectName('_progress_bar')
@@ -199,6 +378,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self._shortcut_spacebar = QtGui.QShortcut(QtGui.QKeySequence(QtCore.Qt.Key_Space), self)
         self._shortcut_spacebar.activated.connect(self._on_spacebar)
 
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.timeout.connect(self._message_process)
+        self._log_timer.start(LOG_FLUSH_INTERVAL_MS)
+
         # self.showFullScreen()
         self.showMaximized()
         self._station_start(station)
@@ -219,31 +402,36 @@ class MainWindow(QtWidgets.QMainWindow):
     @QtCore.Slot(float)
     def _on_progress(self, progress):
         if progress <= 0:
-            self._logging_textEdit.clear()
+            self._log_records.clear()
+            self._log_model.clear()
         self._progress_bar.setValue(round(progress * 1000))
 
-    @QtCore.Slot(float)
-    def _on_state(self, state):
-        pixmap = state.get('pixmap')
-        style = state.get('style', 'QLabel { background-color : white; color : black; font-size : 12pt; }')
-        html = state.get('html', '')
+    def _image_update(self):
+        entry = self._state_entry
+        pixmap = None if entry is None else self._state_cache.scaled(entry, self._image_label.contentsRect().size())
         if pixmap is None:
             self._image_label.clear()
-            self._pixmap_bin = None
         else:
-            try:
-                pixmap_bin = QtGui.QPixmap(pixmap)
-                self._log.info('image_label pixmap: %s => %s', pixmap, pixmap_bin.size())
-                if pixmap_bin is None:
-                    self._log.warning('QPixmap failed for resource %s', state.get('pixmap'))
-                self._image_label.setPixmap(pixmap_bin)
-                self._pixmap_bin = pixmap_bin
-            except Exception:
-                self._log.warning('Could not load image')
-        if style is not None:
+            self._image_label.setPixmap(pixmap)
+
+    @QtCore.Slot(float)
+    def _on_state(self, state):
+        entry = self._state_cache.get(state)
+        if entry is not self._state_entry:
+            self._state_entry = entry
+            self._image_update()
+        style, html = entry['style'], entry['html']
+        if style is not None and style != self._stage_style:
             self._stage_text.setStyleSheet(style)
-        if html is not None:
+            self._stage_style = style
+        if html is not None and html != self._stage_html:
             self._stage_text.setText(html)
+            self._stage_html = html
+
+    def resizeEvent(self, event: QtGui.QResizeEvent):
+        super(MainWindow, self).resizeEvent(event)
+        if self._state_entry is not None:
+            QtCore.QTimer.singleShot(0, self._image_update)  # after layout
 
     @QtCore.Slot(str)
     def _on_prompt(self, prompt_str):
@@ -253,8 +441,14 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             self._station.prompt_result_str = s
 
+    @QtCore.Slot(str)
+    def _on_log_level(self, level_name):
+        level = logging.getLevelName(level_name)
+        self._handler.setLevel(level)
+        self._log_model.level = level
+
     def _logging_configure(self):
-        self._handler.setLevel(logging.INFO)
+        self._handler.setLevel(self._log_model.level)  # discard hidden records at the source
         self._log.addHandler(self._handler)
         self._log.setLevel(logging.DEBUG)
 
@@ -288,13 +482,17 @@ class MainWindow(QtWidgets.QMainWindow):
             return super(MainWindow, self).event(event)
 
     def _message_process(self):
+        with self._resync_lock:
+            self._resync_pending = False
         while True:
             try:
                 msg = self._queue.get(block=False)
                 msg_type = msg['type']
                 if msg_type == 'log':
-                    self.on_logRecord(msg['data'])
-                elif msg_type == 'progress':
+                    self._log_records.append(msg['data'])
+                    continue
+                self._log_flush()  # preserve order with state changes
+                if msg_type == 'progress':
                     self._on_progress(msg['data'])
                 elif msg_type == 'state':
                     self._on_state(msg['data'])
@@ -302,25 +500,44 @@ class MainWindow(QtWidgets.QMainWindow):
                     self._on_prompt(msg['data'])
             except queue.Empty:
                 break
+        self._log_flush()
+
+    def _log_flush(self):
+        if not len(self._log_records):
+            return
+        scrollbar = self._logging_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self._log_model.append(self._log_records)
+        self._log_records = []
+        if at_bottom:
+            self._logging_view.scrollToBottom()
 
     def on_message(self, msg):
         self._queue.put(msg)
+        with self._resync_lock:
+            if self._resync_pending:
+                return
+            self._resync_pending = True
         event = QResyncEvent()
         QtCore.QCoreApplication.postEvent(self, event)
 
     def _on_log_cbk(self, record):
-        msg = {
-            'type': 'log',
-            'data': record
-        }
-        self.on_message(msg)
+        # Merge the arguments and traceback now, since they may change or
+        # hold objects alive until displayed.  Copy since other handlers
+        # share the record.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._formatter.formatException(record.exc_info)
+            record.exc_info = None
+        # processed in batches by the log timer
+        self._queue.put({'type': 'log', 'data': record})
 
     @QtCore.Slot(object)
     def on_logRecord(self, record: logging.LogRecord):
-        txt = self._formatter.format(record)
-        color = LOG_COLOR[record.levelno]
-        self._logging_textEdit.setTextColor(color)
-        self._logging_textEdit.append(txt)
+        self._log_records.append(record)
 
     def closeEvent(self, event: QtGui.QCloseEvent):
         self._log.info('MainWindow.closeEvent')
@@ -0,0 +1,245 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Track test result history to order and skip tests.
+
+The station "adaptive" option reorders the tests so that likely failing,
+fast tests run first.  This minimizes the expected time to the first
+failure on a bad unit.  Each test's failure probability p and duration c
+come from the history file.  Tests run in increasing c / p order, subject
+to these constraints:
+
+* A test always runs after the tests it "depends" upon.
+* A test with "adaptive" set to False is a barrier.  It keeps its
+  position, and no test moves across it.
+
+The :class:`UnitIndex` records the latest result of each test for each
+unit serial number, which the station "retest" option uses to rerun
+only the tests that failed or have not recently passed.
+"""
+
+from pytation import pretty_json
+import logging
+import os
+
+
+VERSION = 1
+DECAY = 0.99  # per suite, so recent results dominate
+PRIOR_P_FAIL = 0.05
+PRIOR_WEIGHT = 1.0  # in runs
+DURATION_DEFAULT = 1.0  # seconds, for tests without history
+_log = logging.getLogger(__name__)
+
+
+def _json_save(path, data):
+    dirpath = os.path.dirname(path)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wt') as f:
+        pretty_json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _json_load(path):
+    try:
+        with open(path, 'rt') as f:
+            return pretty_json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        _log.warning('Could not load %s, ignoring', path)
+        return None
+
+
+class History:
+    """The per-test failure rate and duration history.
+
+    :param path: The JSON history file path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        data = _json_load(path)
+        if data is None or data.get('version') != VERSION:
+            data = {'version': VERSION, 'tests': {}}
+        self._tests = data['tests']
+
+    def __contains__(self, name):
+        return name in self._tests
+
+    def save(self):
+        """Save the history file."""
+        _json_save(self.path, {'version': VERSION, 'tests': self._tests})
+
+    def update(self, tests):
+        """Update the history with the results of a suite.
+
+        :param tests: The list of test output dicts, each with
+            name, result, and duration.
+        """
+        for t in tests:
+            if 'duration' not in t:
+                continue
+            h = self._tests.setdefault(t['name'], {'runs': 0.0, 'fails': 0.0, 'duration': None})
+            h['runs'] = h['runs'] * DECAY + 1.0
+            h['fails'] = h['fails'] * DECAY + (1.0 if t['result'] else 0.0)
+            if h['duration'] is None:
+                h['duration'] = t['duration']
+            else:
+                alpha = max(1.0 / h['runs'], 1.0 - DECAY)
+                h['duration'] += alpha * (t['duration'] - h['duration'])
+
+    def p_fail(self, name):
+        """Estimate the test failure probability.
+
+        :param name: The test name.
+        :return: The failure probability from 0.0 to 1.0.
+        """
+        h = self._tests.get(name, {'runs': 0.0, 'fails': 0.0})
+        return (h['fails'] + PRIOR_P_FAIL * PRIOR_WEIGHT) / (h['runs'] + PRIOR_WEIGHT)
+
+    def duration(self, name):
+        """Estimate the test duration.
+
+        :param name: The test name.
+        :return: The duration in seconds.
+        """
+        h = self._tests.get(name)
+        if h is None or h['duration'] is None:
+            return DURATION_DEFAULT
+        return h['duration']
+
+    def _key(self, t):
+        return self.duration(t['name']) / self.p_fail(t['name'])
+
+    def _order_segment(self, tests):
+        remaining = list(tests)
+        result = []
+        while len(remaining):
+            names = set([t['name'] for t in remaining])
+            ready = [t for t in remaining if not any([dep in names for dep in t.get('depends', [])])]
+            t = min(ready, key=self._key)  # min is stable for equal keys
+            remaining.remove(t)
+            result.append(t)
+        return result
+
+    def order(self, tests):
+        """Order tests to minimize the expected time to the first failure.
+
+        :param tests: The list of test definition dicts.
+        :return: The new, reordered list of tests.
+        """
+        result = []
+        segment = []
+        for t in tests:
+            if t.get('adaptive', True):
+                segment.append(t)
+            else:
+                result.extend(self._order_segment(segment))
+                result.append(t)
+                segment = []
+        result.extend(self._order_segment(segment))
+        return result
+
+
+class UnitIndex:
+    """The latest result of each test for each unit.
+
+    :param path: The JSON unit index file path.
+
+    The index maps each unit serial number to the latest result,
+    time, and suite archive path of each test.  The station "retest"
+    option uses the index to skip tests that the unit recently passed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        data = _json_load(path)
+        if data is None or data.get('version') != VERSION:
+            data = {'version': VERSION, 'units': {}}
+        self._units = data['units']
+
+    def __contains__(self, serial):
+        return str(serial) in self._units
+
+    def save(self):
+        """Save the unit index file."""
+        _json_save(self.path, {'version': VERSION, 'units': self._units})
+
+    def update(self, serial, path, tests, t):
+        """Update the index with the results of a suite.
+
+        :param serial: The unit serial number.
+        :param path: The suite archive path.
+        :param tests: The list of test output dicts, each with name
+            and result.
+        :param t: The suite time in seconds since the epoch.
+        """
+        unit = self._units.pop(str(serial), {})
+        self._units[str(serial)] = unit  # keep units ordered by latest update
+        for test in tests:
+            unit[test['name']] = {'result': test['result'], 'time': t, 'path': path}
+
+    def prune(self, t_min=None, count_max=None):
+        """Remove old entries so that the index does not grow forever.
+
+        :param t_min: Remove test results older than this time in seconds
+            since the epoch.  None keeps results of any age.
+        :param count_max: The maximum number of units.  The least recently
+            updated units are removed first.  None keeps all units.
+        :return: The number of removed units.
+        """
+        count = len(self._units)
+        if t_min is not None:
+            for serial, unit in list(self._units.items()):
+                unit = dict([(k, v) for k, v in unit.items() if v['time'] >= t_min])
+                if unit:
+                    self._units[serial] = unit
+                else:
+                    del self._units[serial]
+        if count_max is not None:
+            for serial in list(self._units.keys())[:max(0, len(self._units) - count_max)]:
+                del self._units[serial]
+        return count - len(self._units)
+
+    def lookup(self, serial, name):
+        """Get the latest result for a unit's test.
+
+        :param serial: The unit serial number.
+        :param name: The test name.
+        :return: The dict with result, time, and path, or None if the
+            test never ran for this unit.
+        """
+        return self._units.get(str(serial), {}).get(name)
+
+    def relocate(self, moved):
+        """Update the archive paths after retention moves archives.
+
+        :param moved: The dict mapping original path to new path.
+        :return: The number of updated entries.
+        """
+        moved = dict([(os.path.normpath(k), v) for k, v in moved.items()])
+        count = 0
+        for unit in self._units.values():
+            for entry in unit.values():
+                if entry.get('path') is None:
+                    continue
+                path = moved.get(os.path.normpath(entry['path']))
+                if path is not None:
+                    entry['path'] = path
+                    count += 1
+        return count
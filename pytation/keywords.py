@@ -17,6 +17,7 @@
 Keywords for pytation.
 """
 
-__all__ = ['PYTATION_RETURN_CODE_SKIP_REMAINING_TESTS']
+__all__ = ['PYTATION_RETURN_CODE_SKIP_REMAINING_TESTS', 'PYTATION_RETURN_CODE_TIMEOUT']
 
 PYTATION_RETURN_CODE_SKIP_REMAINING_TESTS = '__pytation_skip_remaining_tests__'
+PYTATION_RETURN_CODE_TIMEOUT = '__pytation_timeout__'
@@ -14,14 +14,32 @@
 
 
 from pytation import time
+from pytation import retention
+from pytation import detail
+from pytation import watchdog
+from pytation import operator_time
+from pytation.version import __version__
 import argparse
 import importlib
+import importlib.util
+import logging
 import os
+import pickle
+import sys
+import threading
+import types
 
 
 _LOG_PATH_DEFAULT = '{base_path}/{station}/log/{station_timestr}_{process_id}.log'
 _OUTPUT_PATH_DEFAULT = '{base_path}/{station}/data/{suite_timestr}.zip'
 _PROGRESS_PATH_DEFAULT = '{base_path}/{station}/progress.csv'
+_HISTORY_PATH_DEFAULT = '{base_path}/{station}/history.json'
+_UNITS_PATH_DEFAULT = '{base_path}/{station}/units.json'
+_METRICS_PATH_DEFAULT = '{base_path}/{station}/metrics.prom'
+_OPERATOR_PATH_DEFAULT = '{base_path}/{station}/operator.jsonl'
+_BASE_PATH_DEFAULT = os.path.join(os.path.expanduser('~'), 'pytation')
+_CACHE_PATH_DEFAULT = os.path.join(_BASE_PATH_DEFAULT, 'cache')
+_CACHE_VERSION = 3
 _DEVICE_LIFECYCLE = ['station', 'suite', 'test', 'manual']  # defaults to 'station'
 SETUP_TEARDOWN_FN = [
     'station_setup', 'station_teardown',
@@ -32,6 +50,36 @@ ENV_EXCLUDE = ['error_count', 'suite_timestamp', 'suite_timestr', 'suite_isostr'
 ENV_DEFAULTS = {
     'error_count_to_halt': 1,
 }
+RETEST_DEFAULTS = {
+    'key': 'serial_number',  # the env key that identifies the unit
+    'validity': 24 * 60 * 60,  # seconds that a passing result may be reused, None for forever
+    'units_max': 10000,  # the maximum number of units in the index, None for unlimited
+}
+METRICS_DEFAULTS = {
+    'host': '127.0.0.1',  # the metrics server address
+    'port': None,  # the metrics server TCP port, None for only the snapshot file
+}
+OPERATOR_DEFAULTS = {
+    'shifts': None,  # list of {'name': str, 'start': 'HH:MM'}, None for calendar days
+}
+RECORD_DEFAULTS = {
+    'devices': None,  # the list of device names to record, None for all devices
+}
+TRACE_DEFAULTS = {
+    'export': None,  # the OTLP/HTTP JSON traces URL, like http://127.0.0.1:4318/v1/traces
+    'timeout': None,  # the export request timeout in seconds
+}
+TIMEOUTS_DEFAULTS = {
+    'test': None,    # seconds, None for no timeout, override with the test "timeout", excludes setup and teardown
+    'device': None,  # seconds for setup, restore, and teardown, override with the device "timeout"
+    'grace': watchdog.GRACE_DEFAULT,  # seconds after cancellation before abandoning
+}
+_ENV_STATION = [
+    'station', 'process_id', 'error_count',
+    'station_timestamp', 'station_timestr', 'station_isostr',
+    'suite_timestamp', 'suite_timestr', 'suite_isostr',
+]  # populated by _env_validate on every load
+_log = logging.getLogger(__name__)
 
 
 def parser_config(p: argparse.ArgumentParser, station=None):
@@ -54,6 +102,12 @@ def parser_config(p: argparse.ArgumentParser, station=None):
                    help='The comma-separated list of tests to exlude.  Defaults to "".')
     p.add_argument('--include',
                    help='The comma-separated list of tests to include.  Defaults to all available tests.')
+    p.add_argument('--lazy',
+                   action='store_true',
+                   help='Defer test, device, and handler imports until first use.')
+    p.add_argument('--cache',
+                   action='store_true',
+                   help='Reuse the validated station when its source files are unchanged.')
 
 
 def _states_validate(states):
@@ -66,6 +120,131 @@ def _states_validate(states):
     return d
 
 
+class LazyRef:
+    """A reference to a module or module attribute that imports on first use.
+
+    :param name: The fully-qualified module or module attribute name.
+    :raise ModuleNotFoundError: If the module cannot be found.
+
+    The constructor validates that the module exists using
+    importlib.util.find_spec() without executing it.  Only the
+    parent packages are imported.  The attribute existence is checked
+    when the reference is resolved.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._target = None
+        parts = name.split('.')
+        parent = '.'.join(parts[:-1])
+        if parent:
+            spec = importlib.util.find_spec(parent)
+            if spec is None:
+                raise ModuleNotFoundError(f'No module named {parent!r}', name=parent)
+            if spec.submodule_search_locations is not None:  # package
+                if importlib.util.find_spec(name) is not None:
+                    self.module_name, self.attr_name = name, None
+                    return
+            self.module_name, self.attr_name = parent, parts[-1]
+        elif importlib.util.find_spec(name) is not None:
+            self.module_name, self.attr_name = name, None
+        else:
+            raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+
+    def __repr__(self):
+        return f'LazyRef({self.name})'
+
+    def __getstate__(self):
+        return {'name': self.name, 'module_name': self.module_name, 'attr_name': self.attr_name}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._target = None
+
+    @property
+    def default_name(self):
+        """The default name matching the resolved __name__."""
+        return self.name if self.attr_name is None else self.attr_name
+
+    @property
+    def is_resolved(self):
+        """True when the target is imported."""
+        return self._target is not None
+
+    def resolve(self):
+        """Import and return the referenced module or attribute.
+
+        :return: The referenced object.
+        :raise ImportError: If the module cannot be imported.
+        :raise AttributeError: If the attribute is not found.
+        """
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self.module_name)
+                    if self.attr_name is None:
+                        self._target = module
+                    else:
+                        self._target = getattr(module, self.attr_name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        target = self.resolve()
+        if not callable(target) and hasattr(target, 'run'):
+            target = target.run
+        return target(*args, **kwargs)
+
+
+def resolve(obj):
+    """Resolve an object that may be a :class:`LazyRef`.
+
+    :param obj: The object.
+    :return: The resolved object.
+    """
+    if isinstance(obj, LazyRef):
+        return obj.resolve()
+    return obj
+
+
+def _lazy_refs(station):
+    refs = []
+    tests = list(station['tests']) + [station.get(k) for k in SETUP_TEARDOWN_FN]
+    for t in tests:
+        if t is not None and isinstance(t['fn'], LazyRef):
+            refs.append(t['fn'])
+    for d in station['devices'].values():
+        if isinstance(d['clz'], LazyRef):
+            refs.append(d['clz'])
+    for h in station['handlers'].values():
+        if isinstance(h, LazyRef):
+            refs.append(h)
+    return refs
+
+
+def _prewarm_run(refs):
+    for ref in refs:
+        try:
+            ref.resolve()
+        except Exception:
+            _log.exception('prewarm %s failed', ref.name)  # report again on use
+
+
+def prewarm(station):
+    """Resolve all lazy references using a background thread.
+
+    :param station: The validated station.
+    :return: The started daemon thread or None if nothing to resolve.
+    """
+    refs = [r for r in _lazy_refs(station) if not r.is_resolved]
+    if not len(refs):
+        return None
+    thread = threading.Thread(target=_prewarm_run, args=(refs, ), name='pytation_prewarm', daemon=True)
+    thread.start()
+    return thread
+
+
 def _fn_load(fn_str):
     parts = fn_str.split('.')
     fn_name = parts[-1]
@@ -74,12 +253,20 @@ def _fn_load(fn_str):
     return getattr(module, fn_name)
 
 
-def _test_validate(test):
+def _test_validate(test, lazy=False):
     if test is None:
         return None
     t = dict(test)
     fn = t['fn']
     fn_str = '__unknown__'
+    if isinstance(fn, str) and lazy:
+        if 'name' not in t:  # the NAME attribute is only available after import
+            raise ValueError(f'Lazy test {fn} requires a name')
+        fn = LazyRef(fn)
+        t['fn'] = fn
+        t.setdefault('config', {})
+        t.setdefault('devices', None)  # resolved on first use
+        return t
     if isinstance(fn, str):
         fn_str = fn
         try:
@@ -94,27 +281,42 @@ def _test_validate(test):
     return t
 
 
-def _tests_validate(test_list):
+def _tests_validate(test_list, lazy=False):
     d = []
     names = {}
     for t in test_list:
-        t = _test_validate(t)
+        t = _test_validate(t, lazy)
         name = t['name']
         if name in names:
             raise ValueError(f'Duplicate test name: {name}')
+        depends = t.get('depends', [])
+        if isinstance(depends, str):
+            depends = [depends]
+        for dep in depends:
+            if dep not in names:
+                raise ValueError(f'Test {name} depends on {dep}, which must be an earlier test')
+        if 'depends' in t:
+            t['depends'] = list(depends)
         d.append(t)
         names[name] = t
     return d
 
 
-def _devices_validate(devices_list):
+def _devices_validate(devices_list, lazy=False):
     """Convert self._station['devices'] from list of defs to dict name:def."""
     devices_map = {}
     for d in devices_list:
         d = dict(d)
         clz = d['clz']
+        if isinstance(clz, str) and lazy:
+            clz = LazyRef(clz)
+            d['clz'] = clz
         if 'name' in d:
             name = d['name']
+        elif isinstance(clz, str):
+            name = clz.split('.')[-1]
+        elif isinstance(clz, LazyRef):
+            name = clz.name.split('.')[-1]  # same as the eager str
         elif hasattr(clz, 'NAME'):
             name = clz.NAME
         else:
@@ -131,32 +333,154 @@ def _devices_validate(devices_list):
     return devices_map
 
 
-def _handlers_validate(kwargs):
+def _handlers_validate(kwargs, lazy=False):
     handlers_map = {}
     for name, value in kwargs.items():
         if isinstance(value, str):
-            value = _fn_load(value)
+            value = LazyRef(value) if lazy else _fn_load(value)
         if not callable(value):
             raise ValueError(f'Could not load handler {name}')
         handlers_map[name] = value
     return handlers_map
 
 
-def validate(station):
-    """Validate the station and fully populate optional fields.
+def _retention_validate(policies, paths):
+    d = {}
+    for key, policy in policies.items():
+        if key == 'interval':
+            d[key] = float(policy)
+            continue
+        if key not in paths:
+            raise ValueError(f'retention path key not found: {key}')
+        d[key] = retention.policy_validate(policy)
+    return d
+
+
+def _pipeline_validate(pipeline):
+    """Get the maximum number of suites pending finalization, 0 to disable."""
+    if pipeline is True:
+        return 1
+    elif not pipeline:
+        return 0
+    pipeline = int(pipeline)
+    if pipeline < 0:
+        raise ValueError(f'invalid pipeline depth: {pipeline}')
+    return pipeline
+
+
+def _analysis_workers_validate(workers):
+    """Get the number of inline analysis worker processes, 0 to disable."""
+    if workers is True:
+        return os.cpu_count() or 1
+    elif not workers:
+        return 0
+    workers = int(workers)
+    if workers < 0:
+        raise ValueError(f'invalid analysis_workers: {workers}')
+    return workers
+
+
+def _timeouts_validate(timeouts):
+    """Validate the default test and device timeouts in seconds."""
+    d = dict(TIMEOUTS_DEFAULTS)
+    for key, value in timeouts.items():
+        if key not in d:
+            raise ValueError(f'invalid timeouts key: {key}')
+        if value is not None:
+            value = float(value)
+            if value <= 0:
+                raise ValueError(f'invalid {key} timeout: {value}')
+        d[key] = value
+    if d['grace'] is None:
+        d['grace'] = watchdog.GRACE_DEFAULT
+    return d
+
+
+def _retest_validate(retest):
+    """Validate the retest options, or None when disabled."""
+    if not retest:
+        return None
+    d = dict(RETEST_DEFAULTS)
+    if isinstance(retest, dict):
+        for key, value in retest.items():
+            if key not in d:
+                raise ValueError(f'invalid retest key: {key}')
+            d[key] = value
+    if d['validity'] is not None:
+        d['validity'] = float(d['validity'])
+    if d['units_max'] is not None:
+        d['units_max'] = int(d['units_max'])
+    return d
 
-    :param station: The station data structure.
-    :return: The station modified in place.
-    """
-    s = {}
-    s['name'] = station['name']
-    s['full_name'] = station.get('full_name', station['name'])
 
-    # Construct the environment
+def _metrics_validate(metrics):
+    """Validate the metrics options, or None when disabled."""
+    if not metrics:
+        return None
+    d = dict(METRICS_DEFAULTS)
+    if isinstance(metrics, dict):
+        for key, value in metrics.items():
+            if key not in d:
+                raise ValueError(f'invalid metrics key: {key}')
+            d[key] = value
+    if d['port'] is not None:
+        d['port'] = int(d['port'])
+    return d
+
+
+def _trace_validate(trace):
+    """Validate the trace options, or None when disabled."""
+    if not trace:
+        return None
+    d = dict(TRACE_DEFAULTS)
+    if isinstance(trace, dict):
+        for key, value in trace.items():
+            if key not in d:
+                raise ValueError(f'invalid trace key: {key}')
+            d[key] = value
+    if d['timeout'] is not None:
+        d['timeout'] = float(d['timeout'])
+    return d
+
+
+def _operator_validate(operator):
+    """Validate the operator shift log options, or None when disabled."""
+    if not operator:
+        return None
+    d = dict(OPERATOR_DEFAULTS)
+    if isinstance(operator, dict):
+        for key, value in operator.items():
+            if key not in d:
+                raise ValueError(f'invalid operator key: {key}')
+            d[key] = value
+    operator_time.shifts_validate(d['shifts'])
+    return d
+
+
+def _record_validate(record, devices):
+    """Validate the device I/O record options, or None when disabled."""
+    if not record:
+        return None
+    d = dict(RECORD_DEFAULTS)
+    if isinstance(record, dict):
+        for key, value in record.items():
+            if key not in d:
+                raise ValueError(f'invalid record key: {key}')
+            d[key] = value
+    if d['devices'] is not None:
+        d['devices'] = list(d['devices'])
+        for name in d['devices']:
+            if name not in devices:
+                raise ValueError(f'invalid record device: {name}')
+    return d
+
+
+def _env_validate(name, station_env):
+    """Construct the environment from the station definition environment."""
     station_start_time = time.now()
     env = {}
     env_no_override = {
-        'station': station['name'],
+        'station': name,
         'process_id': os.getpid(),
         'error_count': 0,
 
@@ -169,44 +493,214 @@ def validate(station):
         'suite_timestr': time.time_to_filename(0),
         'suite_isostr': time.time_to_isostr(0),
     }
-    env.update(station.get('env', {}))
+    env.update(station_env)
     env.update(env_no_override)
     for key, value in ENV_DEFAULTS.items():
         env.setdefault(key, value)
-    s['env'] = env
+    return env
+
+
+def validate(station, lazy=None):
+    """Validate the station and fully populate optional fields.
+
+    :param station: The station data structure.
+    :param lazy: True to defer importing test, device, and handler
+        strings until first use.  Module existence is still validated
+        with importlib.util.find_spec(), which imports the parent
+        packages but not the module itself.  None (default) uses the
+        station "lazy" value, which defaults to False.  Lazy test
+        strings, including the setup and teardown hooks, must
+        specify "name", and resolve DEVICES when run.
+    :return: The station modified in place.
+    """
+    if lazy is None:
+        lazy = bool(station.get('lazy', False))
+    s = {}
+    s['name'] = station['name']
+    s['full_name'] = station.get('full_name', station['name'])
+    s['env'] = _env_validate(station['name'], station.get('env', {}))
 
     # Construct the station
     paths = station.get('paths', {})
-    paths.setdefault('base_path', os.path.join(os.path.expanduser('~'), 'pytation'))
+    paths.setdefault('base_path', _BASE_PATH_DEFAULT)
     paths.setdefault('log', _LOG_PATH_DEFAULT)
     paths.setdefault('output', _OUTPUT_PATH_DEFAULT)
     paths.setdefault('progress', _PROGRESS_PATH_DEFAULT)
+    paths.setdefault('history', _HISTORY_PATH_DEFAULT)
+    paths.setdefault('units', _UNITS_PATH_DEFAULT)
+    paths.setdefault('metrics', _METRICS_PATH_DEFAULT)
+    paths.setdefault('operator', _OPERATOR_PATH_DEFAULT)
     s['paths'] = paths
     s['states'] = _states_validate(station.get('states', {}))
-    s['tests'] = _tests_validate(station['tests'])
-    s['devices'] = _devices_validate(station['devices'])
-    s['handlers'] = _handlers_validate(station.get('handlers', {}))
+    s['tests'] = _tests_validate(station['tests'], lazy)
+    s['devices'] = _devices_validate(station['devices'], lazy)
+    s['handlers'] = _handlers_validate(station.get('handlers', {}), lazy)
     for k in SETUP_TEARDOWN_FN:
-        s[k] = _test_validate(station.get(k, None))
+        s[k] = _test_validate(station.get(k, None), lazy)
+    s['lazy'] = lazy
+    s['prewarm'] = bool(station.get('prewarm', False))
+    s['cache_deps'] = [os.path.abspath(path) for path in station.get('cache_deps', [])]
     s['gui_resources'] = station.get('gui_resources', [])
-    
+    s['retention'] = _retention_validate(station.get('retention', {}), paths)
+    s['detail_binary_threshold'] = station.get('detail_binary_threshold', detail.THRESHOLD_DEFAULT)
+    s['pipeline'] = _pipeline_validate(station.get('pipeline', False))
+    s['analysis_workers'] = _analysis_workers_validate(station.get('analysis_workers', 0))
+    s['concurrency'] = max(1, int(station.get('concurrency', 1)))
+    s['timeouts'] = _timeouts_validate(station.get('timeouts', {}))
+    s['adaptive'] = bool(station.get('adaptive', False))
+    s['retest'] = _retest_validate(station.get('retest', False))
+    s['metrics'] = _metrics_validate(station.get('metrics', False))
+    s['trace'] = _trace_validate(station.get('trace', False))
+    s['operator'] = _operator_validate(station.get('operator', False))
+    s['record'] = _record_validate(station.get('record', False), s['devices'])
+
     return s
 
 
-def load(args):
+def _module_names(station):
+    names = set()
+    tests = list(station['tests']) + [station.get(k) for k in SETUP_TEARDOWN_FN]
+    objs = [t['fn'] for t in tests if t is not None]
+    objs += [d['clz'] for d in station['devices'].values()]
+    objs += list(station['handlers'].values())
+    for obj in objs:
+        if isinstance(obj, LazyRef):
+            names.add(obj.module_name)
+        elif isinstance(obj, types.ModuleType):
+            names.add(obj.__name__)
+        elif isinstance(obj, str):
+            names.add(obj.rsplit('.', 1)[0])
+        elif isinstance(getattr(obj, '__module__', None), str):
+            names.add(obj.__module__)
+    return names
+
+
+def _package_module_names(module_name):
+    """The imported modules in the station module's top-level package."""
+    top = module_name.split('.')[0]
+    return set([name for name in list(sys.modules) if name == top or name.startswith(top + '.')])
+
+
+def _cache_files(paths):
+    deps = []
+    for path in paths:
+        if not os.path.isfile(path):
+            continue
+        st = os.stat(path)
+        deps.append([path, st.st_mtime_ns, st.st_size])
+    return deps
+
+
+def _cache_deps(module_names):
+    paths = []
+    for name in sorted(module_names):
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None or not spec.has_location or not os.path.isfile(spec.origin):
+            continue
+        paths.append(spec.origin)
+    return _cache_files(paths)
+
+
+def _cache_filename(cache_path, args, lazy):
+    name = args.station + ('.lazy' if lazy else '') + '.pickle'
+    return os.path.join(cache_path, name)
+
+
+def _cache_key(args, lazy):
+    return [_CACHE_VERSION, __version__, sys.version, args.station, bool(lazy)]
+
+
+def _cache_load(path, key, module_name):
+    """Load the cached station without building and validating it."""
+    try:
+        with open(path, 'rb') as f:
+            key_cached, deps = pickle.load(f)
+            if key_cached != key or deps[0][0] != _cache_deps([module_name])[0][0]:
+                return None
+            for dep_path, mtime_ns, size in deps:
+                st = os.stat(dep_path)
+                if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                    return None
+            station = pickle.load(f)
+    except Exception:
+        _log.debug('station cache miss: %s', path)
+        return None
+    station['env'] = _env_validate(station['name'], station['env'])
+    _log.info('station cache hit: %s', path)
+    return station
+
+
+def _cache_picklable(test):
+    if test is None or not isinstance(test['fn'], types.ModuleType):
+        return test
+    test = dict(test)
+    test['fn'] = LazyRef(test['fn'].__name__)  # modules cannot be pickled
+    return test
+
+
+def _cache_save(path, key, module_name, station):
+    station = dict(station)
+    station['tests'] = [_cache_picklable(t) for t in station['tests']]
+    for k in SETUP_TEARDOWN_FN:
+        station[k] = _cache_picklable(station[k])
+    station['env'] = dict([(k, v) for k, v in station['env'].items() if k not in _ENV_STATION])
+    module_names = _module_names(station) | _package_module_names(module_name)
+    deps = _cache_deps([module_name]) + _cache_deps(module_names - {module_name})
+    deps += _cache_files(station['cache_deps'])
+    tmp_path = path + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, deps), f)
+            pickle.dump(station, f)
+        os.replace(tmp_path, path)
+    except Exception:
+        _log.info('station cache not supported for %s', path)  # unpicklable objects
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+
+
+def load(args, cache_path=None):
     """Load a station from the command-line arguments.
 
     :param args: The command-line arguments.
+    :param cache_path: The directory for cached stations when
+        args.cache is True.  None (default) uses ~/pytation/cache.
     :return: The station, which is also fully validated.
     :see: parser_config()
     :see: validate()
+
+    When args.cache is True, the validated station is saved using
+    pickle along with the path, mtime, and size of the station module,
+    every imported module in the station module's top-level package,
+    every module providing a test, device, or handler, and the files
+    in the station "cache_deps" list.  The next load reuses the cached
+    station when none of these files changed, which skips building
+    and validating the station.  Unpickling still imports the modules
+    that define the tests, devices, and handlers, including the
+    station module when it defines them.  Combine with args.lazy to
+    also defer these imports.  Stations that contain unpicklable
+    objects, such as lambdas, are not cached.
     """
     parts = args.station.split('.')
     def_name = parts[-1]
     module_name = '.'.join(parts[:-1])
-    module = importlib.import_module(module_name)
-    station = getattr(module, def_name)
-    station = validate(station)
+    lazy = True if getattr(args, 'lazy', False) else None
+    station = None
+    if getattr(args, 'cache', False):
+        cache_path = _CACHE_PATH_DEFAULT if cache_path is None else cache_path
+        cache_filename = _cache_filename(cache_path, args, lazy)
+        cache_key = _cache_key(args, lazy)
+        station = _cache_load(cache_filename, cache_key, module_name)
+    if station is None:
+        module = importlib.import_module(module_name)
+        station = getattr(module, def_name)
+        station = validate(station, lazy=lazy)
+        if getattr(args, 'cache', False):
+            _cache_save(cache_filename, cache_key, module_name, station)
 
     if args.exclude is not None:
         exclude = args.exclude.split(',')
@@ -0,0 +1,435 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Collect station metrics in the Prometheus text exposition format.
+
+The :class:`Registry` holds counters, gauges, and histograms.  When the
+station "metrics" option is enabled, :class:`StationMetrics` populates
+the standard station metrics from the context events, the station
+writes the snapshot file after each suite, and the optional
+:class:`MetricsServer` serves GET /metrics for a local Prometheus
+scraper.  The snapshot file is compatible with the node_exporter
+textfile collector.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pytation import events
+import logging
+import math
+import os
+import threading
+
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, math.inf)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+_log = logging.getLogger(__name__)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _fmt(value):
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _labels_str(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if len(pairs) else ''
+
+
+class _Metric:
+    TYPE = None
+
+    def __init__(self, name, help, labels=None):
+        self.name = name  #: The metric name.
+        self.help = help  #: The metric description.
+        self.labels = tuple(labels or [])  #: The label names.
+        self._lock = threading.Lock()
+        self._values = {}  # label values tuple: value
+
+    def _key(self, labels):
+        if len(labels) != len(self.labels):
+            raise ValueError(f'{self.name} labels mismatch: {sorted(labels)} != {list(self.labels)}')
+        try:
+            return tuple([str(labels[n]) for n in self.labels])
+        except KeyError as ex:
+            raise ValueError(f'{self.name} missing label {ex}')
+
+    def _samples(self):
+        """Get the samples as the list of (suffix, label values, extra label, value)."""
+        with self._lock:
+            return [('', key, None, value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        """Render the metric in the text exposition format.
+
+        :return: The list of str lines.
+        """
+        lines = [f'# HELP {self.name} {_escape(self.help)}', f'# TYPE {self.name} {self.TYPE}']
+        for suffix, key, extra, value in self._samples():
+            lines.append(f'{self.name}{suffix}{_labels_str(self.labels, key, extra)} {_fmt(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+    TYPE = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increment the counter.
+
+        :param amount: The non-negative increment.
+        :param labels: The label values.
+        """
+        if amount < 0:
+            raise ValueError('counter increment must be non-negative')
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Get the current count."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """A value that may increase and decrease."""
+    TYPE = 'gauge'
+
+    def __init__(self, name, help, labels=None):
+        super().__init__(name, help, labels)
+        self._functions = {}  # label values tuple: fn
+
+    def set(self, value, **labels):
+        """Set the value.
+
+        :param value: The new value.
+        :param labels: The label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        """Increment the value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        """Decrement the value."""
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn, **labels):
+        """Compute the value on demand.
+
+        :param fn: The callable fn() -> value, called on each render.
+        :param labels: The label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    def value(self, **labels):
+        """Get the current value."""
+        key = self._key(labels)
+        with self._lock:
+            fn = self._functions.get(key)
+            if fn is None:
+                return self._values.get(key, 0)
+        return fn()
+
+    def _samples(self):
+        samples = super()._samples()
+        with self._lock:
+            functions = sorted(self._functions.items())
+        for key, fn in functions:
+            try:
+                samples.append(('', key, None, float(fn())))
+            except Exception:
+                _log.exception('gauge %s function failed', self.name)
+        return samples
+
+
+class Histogram(_Metric):
+    """The distribution of observed values.
+
+    :param buckets: The increasing bucket upper bounds.  None uses
+        :data:`DURATION_BUCKETS`.
+    """
+    TYPE = 'histogram'
+
+    def __init__(self, name, help, labels=None, buckets=None):
+        super().__init__(name, help, labels)
+        buckets = sorted(DURATION_BUCKETS if buckets is None else buckets)
+        if buckets[-1] != math.inf:
+            buckets.append(math.inf)
+        self.buckets = tuple(buckets)  #: The bucket upper bounds.
+
+    def observe(self, value, **labels):
+        """Record an observation.
+
+        :param value: The observed value, such as a duration in seconds.
+        :param labels: The label values.
+        """
+        key = self._key(labels)
+        with self._lock:
+            h = self._values.get(key)
+            if h is None:
+                h = [[0] * len(self.buckets), 0.0, 0]  # counts, sum, count
+                self._values[key] = h
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    h[0][idx] += 1
+                    break
+            h[1] += value
+            h[2] += 1
+
+    def value(self, **labels):
+        """Get the observation summary.
+
+        :return: The tuple of (count, sum).
+        """
+        with self._lock:
+            h = self._values.get(self._key(labels))
+            return (0, 0.0) if h is None else (h[2], h[1])
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            items = sorted([(key, [list(h[0]), h[1], h[2]]) for key, h in self._values.items()])
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                samples.append(('_bucket', key, ('le', _fmt(bound)), cumulative))
+            samples.append(('_sum', key, None, total))
+            samples.append(('_count', key, None, count))
+        return samples
+
+
+class Registry:
+    """The collection of metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get(self, clz, name, help, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = clz(name, help, labels, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, clz):
+                raise ValueError(f'metric {name} already registered as {metric.TYPE}')
+            return metric
+
+    def counter(self, name, help, labels=None):
+        """Get or create a :class:`Counter`.
+
+        :param name: The metric name.
+        :param help: The metric description.
+        :param labels: The list of label names.
+        :return: The counter.
+        """
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name, help, labels=None):
+        """Get or create a :class:`Gauge`.
+
+        :param name: The metric name.
+        :param help: The metric description.
+        :param labels: The list of label names.
+        :return: The gauge.
+        """
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(self, name, help, labels=None, buckets=None):
+        """Get or create a :class:`Histogram`.
+
+        :param name: The metric name.
+        :param help: The metric description.
+        :param labels: The list of label names.
+        :param buckets: The bucket upper bounds.
+        :return: The histogram.
+        """
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def __getitem__(self, name):
+        with self._lock:
+            return self._metrics[name]
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._metrics
+
+    def render(self):
+        """Render all metrics in the text exposition format.
+
+        :return: The str text.
+        """
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path):
+        """Atomically write the snapshot file.
+
+        :param path: The file path.
+        """
+        dirpath = os.path.dirname(path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        _log.debug('%s %s', self.address_string(), format % args)
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ['/', '/metrics']:
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """Serve the metrics over HTTP on a background thread.
+
+    :param registry: The :class:`Registry`.
+    :param host: The host address.
+    :param port: The TCP port.  0 selects an available port.
+    """
+
+    def __init__(self, registry, host='127.0.0.1', port=0):
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.registry = registry
+        self._thread = threading.Thread(target=self._server.serve_forever, name='pytation_metrics', daemon=True)
+        self._thread.start()
+        _log.info('metrics serving http://%s:%d/metrics', *self.address)
+
+    @property
+    def address(self):
+        """The (host, port) server address."""
+        return self._server.server_address[:2]
+
+    def close(self):
+        """Stop the server."""
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+
+
+class StationMetrics:
+    """Populate the standard station metrics from the context events.
+
+    :param context: The :class:`pytation.context.Context`.
+    :param registry: The :class:`Registry`.
+    """
+
+    def __init__(self, context, registry):
+        self.registry = registry
+        self._suite_start = None
+        self._units = registry.counter('pytation_units_total', 'Units tested by suite result.', ['result'])
+        self._suite_duration = registry.histogram('pytation_suite_duration_seconds', 'Suite duration.')
+        self._tests = registry.counter('pytation_tests_total', 'Tests run by result.', ['test', 'result'])
+        self._test_duration = registry.histogram('pytation_test_duration_seconds', 'Test duration.', ['test'])
+        self._section_duration = registry.histogram('pytation_section_duration_seconds', 'Section duration.',
+                                                    ['section'])
+        self._device_duration = registry.histogram('pytation_device_operation_seconds',
+                                                   'Device open, restore, and close latency.',
+                                                   ['device', 'operation'])
+        self._archive_duration = registry.histogram('pytation_archive_write_seconds', 'Suite archive write time.')
+        self._operator_duration = registry.histogram('pytation_operator_seconds',
+                                                     'Operator wait, prompt, and idle time.', ['kind'])
+        queue_depth = registry.gauge('pytation_queue_depth', 'Pending work items.', ['queue'])
+        queue_depth.set_function(lambda: len(context._pipeline_futures), queue='pipeline')
+        queue_depth.set_function(lambda: len(context._analysis_futures), queue='analysis')
+        queue_depth.set_function(lambda: sum([s.queued for s in context.events.subscriptions]),
+                                 queue='events')
+        self._handlers = {
+            events.SUITE_START: self._on_suite_start,
+            events.SUITE_DONE: self._on_suite_done,
+            events.TEST_DONE: self._on_test_done,
+            events.SECTION_EXIT: self._on_section_exit,
+            events.DEVICE_OPEN: self._on_device,
+            events.DEVICE_RESTORE: self._on_device,
+            events.DEVICE_CLOSE: self._on_device,
+            events.ARCHIVE_WRITE: self._on_archive_write,
+            events.OPERATOR: self._on_operator,
+        }
+        self._subscription = context.events.subscribe(self._on_event, self._handlers.keys(), sync=True)
+
+    @staticmethod
+    def _result_str(result):
+        return 'fail' if result else 'pass'
+
+    def _on_event(self, event):
+        self._handlers[event.type](event)
+
+    def _on_suite_start(self, event):
+        self._suite_start = event.time
+
+    def _on_suite_done(self, event):
+        self._units.inc(result=self._result_str(event.data['result']))
+        if self._suite_start is not None:
+            self._suite_duration.observe(event.time - self._suite_start)
+            self._suite_start = None
+
+    def _on_test_done(self, event):
+        d = event.data
+        if d.get('hook'):
+            return  # setup and teardown, which the section durations include
+        self._tests.inc(test=d['name'], result=self._result_str(d['result']))
+        self._test_duration.observe(d['duration'], test=d['name'])
+
+    def _on_section_exit(self, event):
+        self._section_duration.observe(event.data['duration'], section=event.data['name'])
+
+    def _on_device(self, event):
+        operation = event.type.split('_')[-1]
+        self._device_duration.observe(event.data['duration'], device=event.data['name'], operation=operation)
+
+    def _on_archive_write(self, event):
+        self._archive_duration.observe(event.data['duration'])
+
+    def _on_operator(self, event):
+        self._operator_duration.observe(event.data['duration'], kind=event.data['kind'])
+
+    def close(self):
+        """Stop collecting metrics."""
+        self._subscription.close()
@@ -0,0 +1,330 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Account for the time the station spends waiting on the operator.
+
+Each suite records three kinds of operator time:
+
+* wait: Context.wait_for_user() calls, which usually load or unload
+  the unit.
+* prompt: Context.prompt() calls, from display to response.
+* idle: The time between the end of the previous suite and the start
+  of this suite's suite_setup.  Waits and prompts within suite_setup
+  and suite_teardown count as wait and prompt time.
+
+The station stores the per-suite summary as "operator.json" in the
+suite archive.  The station "operator" option also appends each
+summary to the shift log, and :func:`aggregate` combines the shift log
+into per-shift throughput and operator time statistics.  For older
+archives, :func:`parse_progress` reconstructs the wait and prompt
+times from the progress.csv markers.
+"""
+
+import ast
+import datetime
+import json
+import logging
+import os
+import threading
+
+
+VERSION = 1
+KINDS = ('idle', 'wait', 'prompt')
+_log = logging.getLogger(__name__)
+
+
+def summarize(events, duration, idle=None):
+    """Summarize the operator time for a suite.
+
+    :param events: The list of event dicts, each with kind, section,
+        start relative to the suite start, duration, and the optional
+        prompt string.
+    :param duration: The suite duration in seconds.
+    :param idle: The idle time before the suite in seconds or None
+        for the first suite.
+    :return: The operator.json summary dict.
+    """
+    summary = {'version': VERSION, 'suite_duration': duration, 'idle': idle}
+    operator = 0.0
+    for kind in ['wait', 'prompt']:
+        durations = [e['duration'] for e in events if e['kind'] == kind]
+        summary[kind] = {
+            'count': len(durations),
+            'total': sum(durations),
+            'max': max(durations) if len(durations) else 0.0,
+        }
+        operator += summary[kind]['total']
+    summary['operator'] = operator
+    summary['machine'] = max(0.0, duration - operator)
+    summary['events'] = events
+    return summary
+
+
+class OperatorTime:
+    """Record the operator time for the current suite.
+
+    All methods are thread safe, since concurrent tests may wait for
+    the operator.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suite_end = None
+        self._suite_start = None
+        self._idle = None
+        self._events = []
+
+    @property
+    def active(self):
+        """True while a suite is recording."""
+        return self._suite_start is not None
+
+    def suite_start(self, t):
+        """Start recording a suite.
+
+        :param t: The suite start time in seconds since the epoch.
+        :return: The idle time since the previous suite in seconds,
+            or None for the first suite.
+        """
+        with self._lock:
+            self._idle = None if self._suite_end is None else max(0.0, t - self._suite_end)
+            self._suite_start = t
+            self._events = []
+            return self._idle
+
+    def record(self, kind, t_start, t_end, section=None, prompt=None):
+        """Record an operator interaction.
+
+        :param kind: The kind, either 'wait' or 'prompt'.
+        :param t_start: The start time in seconds since the epoch.
+        :param t_end: The end time in seconds since the epoch.
+        :param section: The section name.
+        :param prompt: The prompt string for 'prompt'.
+        :return: The duration in seconds, or None when no suite is
+            recording.
+        """
+        with self._lock:
+            if self._suite_start is None:
+                return None
+            e = {'kind': kind, 'section': section, 'start': t_start - self._suite_start,
+                 'duration': t_end - t_start}
+            if prompt is not None:
+                e['prompt'] = prompt
+            self._events.append(e)
+            return e['duration']
+
+    def suite_stop(self, t):
+        """Stop recording a suite.
+
+        :param t: The suite stop time in seconds since the epoch.
+        :return: The summary dict, see :func:`summarize`.
+        """
+        with self._lock:
+            if self._suite_start is None:
+                return None
+            events = sorted(self._events, key=lambda e: e['start'])
+            summary = summarize(events, t - self._suite_start, self._idle)
+            self._suite_start = None
+            self._suite_end = t
+            self._events = []
+            return summary
+
+
+def parse_progress(txt):
+    """Reconstruct the operator time from progress.csv markers.
+
+    :param txt: The progress.csv text.
+    :return: The summary dict, see :func:`summarize`.  The idle time
+        is not available and is None.
+    """
+    events = []
+    pending = {}  # (kind, section): [start, prompt]
+    t = 0.0
+    for line in txt.split('\n'):
+        if not len(line) or line.startswith('#'):
+            continue
+        t_str, section, value = line.split(',', 2)
+        t = float(t_str)
+        try:
+            value = ast.literal_eval(value)  # written with %r
+        except (ValueError, SyntaxError):
+            continue
+        if not isinstance(value, str):
+            continue
+        if value.startswith('__wait_enter__'):
+            pending[('wait', section)] = [t, None]
+        elif value.startswith('__prompt_enter__'):
+            pending[('prompt', section)] = [t, value[len('__prompt_enter__ prompt('):-1]]
+        elif value.startswith('__wait_exit__') or value.startswith('__prompt_exit__'):
+            kind = 'wait' if value.startswith('__wait_exit__') else 'prompt'
+            entry = pending.pop((kind, section), None)
+            if entry is None:
+                continue
+            e = {'kind': kind, 'section': section, 'start': entry[0], 'duration': t - entry[0]}
+            if entry[1] is not None:
+                e['prompt'] = entry[1]
+            events.append(e)
+    return summarize(events, t)
+
+
+class ShiftLog:
+    """The append-only log of per-suite operator time summaries.
+
+    :param path: The JSON lines file path.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def append(self, record):
+        """Append a suite record.
+
+        :param record: The summary dict with the additional keys time,
+            the suite start in seconds since the epoch, result, and path.
+            The events are not stored in the log.
+        """
+        record = dict([(k, v) for k, v in record.items() if k != 'events'])
+        dirpath = os.path.dirname(self.path)
+        if dirpath:
+            os.makedirs(dirpath, exist_ok=True)
+        with open(self.path, 'at', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def load(self):
+        """Load all records.
+
+        :return: The list of record dicts.  Invalid lines are skipped.
+        """
+        records = []
+        try:
+            with open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        _log.warning('Skipping invalid line in %s', self.path)
+        except FileNotFoundError:
+            pass
+        return records
+
+
+def _minutes(hhmm):
+    hours, minutes = hhmm.split(':')
+    value = int(hours) * 60 + int(minutes)
+    if not 0 <= value < 24 * 60:
+        raise ValueError(f'invalid time of day: {hhmm}')
+    return value
+
+
+def shifts_validate(shifts):
+    """Validate the shift definitions.
+
+    :param shifts: The list of dicts, each with name and start as the
+        local "HH:MM" time of day.  None or empty uses a single shift
+        per calendar day.
+    :return: The list of (start_minutes, name) sorted by start.
+    """
+    if not shifts:
+        return []
+    result = []
+    for shift in shifts:
+        result.append((_minutes(shift['start']), str(shift['name'])))
+    result.sort()
+    if len(set([s[0] for s in result])) != len(result):
+        raise ValueError('duplicate shift start')
+    return result
+
+
+def shift_key(t, shifts):
+    """Get the shift for a time.
+
+    :param t: The time in seconds since the epoch.
+    :param shifts: The validated shifts from :func:`shifts_validate`.
+    :return: The tuple of (date, shift name).  The date is the local
+        ISO date when the shift started, so that overnight shifts group
+        together.
+    """
+    dt = datetime.datetime.fromtimestamp(t)
+    if not shifts:
+        return dt.date().isoformat(), 'day'
+    minutes = dt.hour * 60 + dt.minute
+    for start, name in reversed(shifts):
+        if minutes >= start:
+            return dt.date().isoformat(), name
+    previous = dt.date() - datetime.timedelta(days=1)  # before the first shift starts
+    return previous.isoformat(), shifts[-1][1]
+
+
+def _mean(values):
+    return sum(values) / len(values) if len(values) else 0.0
+
+
+def aggregate(records, shifts=None):
+    """Aggregate the operator time by shift.
+
+    :param records: The list of shift log records.
+    :param shifts: The list of shift definitions, see :func:`shifts_validate`.
+    :return: The list of shift dicts in time order with keys date, shift,
+        units, fail, span, units_per_hour, and for each of idle,
+        wait, and prompt, the total and mean in seconds.  The
+        operator_fraction is the fraction of the shift span spent
+        waiting on the operator.
+    """
+    shifts = shifts_validate(shifts)
+    groups = {}
+    for r in sorted(records, key=lambda r: r['time']):
+        groups.setdefault(shift_key(r['time'], shifts), []).append(r)
+    result = []
+    for (date, name), rs in groups.items():
+        t_start = rs[0]['time']
+        t_end = max([r['time'] + r['suite_duration'] for r in rs])
+        span = t_end - t_start
+        idle = [r['idle'] for r in rs[1:] if r.get('idle') is not None]  # first idle crosses shifts
+        wait = [r['wait']['total'] for r in rs]
+        prompt = [r['prompt']['total'] for r in rs]
+        operator = sum(idle) + sum(wait) + sum(prompt)
+        result.append({
+            'date': date,
+            'shift': name,
+            'units': len(rs),
+            'fail': len([r for r in rs if r.get('result')]),
+            'span': span,
+            'units_per_hour': len(rs) * 3600.0 / span if span > 0 else 0.0,
+            'idle_total': sum(idle),
+            'idle_mean': _mean(idle),
+            'wait_total': sum(wait),
+            'wait_mean': _mean(wait),
+            'prompt_total': sum(prompt),
+            'prompt_mean': _mean(prompt),
+            'operator_fraction': operator / span if span > 0 else 0.0,
+        })
+    return result
+
+
+def report(rows):
+    """Format the aggregated shifts as a text table.
+
+    :param rows: The list from :func:`aggregate`.
+    :return: The str table.
+    """
+    header = ['date', 'shift', 'units', 'fail', 'units/h', 'idle', 'wait', 'prompt', 'operator']
+    lines = ['  '.join([f'{h:>10s}' for h in header])]
+    for r in rows:
+        fields = [r['date'], r['shift'], str(r['units']), str(r['fail']),
+                  f'{r["units_per_hour"]:.1f}', f'{r["idle_mean"]:.1f}', f'{r["wait_mean"]:.1f}',
+                  f'{r["prompt_mean"]:.1f}', f'{100 * r["operator_fraction"]:.1f}%']
+        lines.append('  '.join([f'{f:>10s}' for f in fields]))
+    return '\n'.join(lines)
@@ -1,6 +1,18 @@
 # Copyright 2022 Jetperch LLC
 
 
+"""
+Write human-readable JSON with flat lists on a single line.
+
+The encoder makes a single pass over the object and streams the
+output directly to the file.  Flat lists, which contain only strings,
+numbers, booleans, and null, are encoded in one call to the C-accelerated
+json encoder.  NumPy arrays and scalars are converted natively.  Other
+Mapping and Sequence instances, such as the pytation.config views, are
+encoded as dicts and lists.
+"""
+
+from collections.abc import Mapping, Sequence
 import json
 import re
 
@@ -11,9 +23,16 @@ load = json.load
 loads = json.loads
 _re_dump = re.compile(r'\[[^\[\]\{\}]+\]')
 _re_replace = re.compile(r'\s*\n\s*')
+_SCALAR_TYPES = frozenset([str, int, float, bool, type(None)])
+_KWARGS_SUPPORTED = ['indent', 'default', 'sort_keys', 'ensure_ascii', 'allow_nan']
+_WRITE_SIZE = 65536
 
 
 def _json_default(obj):
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    elif isinstance(obj, Sequence) and not isinstance(obj, (str, bytes, bytearray)):
+        return list(obj)
     return '__pyobject__'
 
 
@@ -22,13 +41,149 @@ def _replace(matchobj):
     return _re_replace.sub(' ', s)
 
 
-def dump(obj, f, *args, **kwargs):
-    s = dumps(obj, *args, **kwargs)
-    f.write(s)
-
-
-def dumps(*args, **kwargs):
+def _dumps_regex(*args, **kwargs):
+    """The original implementation used for unsupported options."""
     kwargs.setdefault('indent', 2)
     kwargs.setdefault('default', _json_default)
     s = json.dumps(*args, **kwargs)
     return _re_dump.sub(_replace, s)
+
+
+def _numpy_convert(obj):
+    if type(obj).__module__ != 'numpy':
+        return obj
+    if hasattr(obj, 'tolist'):  # ndarray and numpy scalars
+        return obj.tolist()
+    return obj
+
+
+def _key_str(key):
+    if isinstance(key, str):
+        return key
+    elif key is True:
+        return 'true'
+    elif key is False:
+        return 'false'
+    elif key is None:
+        return 'null'
+    elif isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError(f'keys must be str, int, float, bool or None, not {type(key).__name__}')
+
+
+class _Encoder:
+
+    def __init__(self, indent=2, default=None, sort_keys=False, ensure_ascii=True, allow_nan=True):
+        if isinstance(indent, int):
+            indent = ' ' * indent
+        self._indent = indent
+        self._default = _json_default if default is None else default
+        self._sort_keys = sort_keys
+        self._scalar = json.JSONEncoder(
+            ensure_ascii=ensure_ascii,
+            allow_nan=allow_nan,
+            separators=(', ', ': '),
+        ).encode
+
+    def _flat(self, obj):
+        s = self._scalar(obj)
+        return '[ ' + s[1:-1] + ' ]'
+
+    def _prepare(self, obj):
+        while True:
+            obj = _numpy_convert(obj)
+            if type(obj) in _SCALAR_TYPES or isinstance(obj, (Mapping, list, tuple, str, int, float)):
+                return obj
+            elif isinstance(obj, Sequence) and not isinstance(obj, (bytes, bytearray)):
+                return list(obj)
+            obj = self._default(obj)
+
+    def iterencode(self, obj, level=0):
+        obj = self._prepare(obj)
+        if type(obj) in _SCALAR_TYPES:
+            yield self._scalar(obj)
+        elif isinstance(obj, Mapping):
+            yield from self._iterencode_dict(obj, level)
+        elif isinstance(obj, (list, tuple)):
+            yield from self._iterencode_list(obj, level)
+        else:  # subclasses, such as enum
+            yield self._scalar(obj)
+
+    def _iterencode_list(self, obj, level):
+        if not len(obj):
+            yield '[]'
+        elif all(map(_SCALAR_TYPES.__contains__, map(type, obj))):
+            yield self._flat(obj)
+        else:
+            items = [self._prepare(x) for x in obj]
+            if not any([isinstance(x, (Mapping, list, tuple)) for x in items]):
+                yield self._flat(items)
+                return
+            separator = ',\n' + self._indent * (level + 1)
+            yield '[\n' + self._indent * (level + 1)
+            for idx, item in enumerate(items):
+                if idx:
+                    yield separator
+                yield from self.iterencode(item, level + 1)
+            yield '\n' + self._indent * level + ']'
+
+    def _iterencode_dict(self, obj, level):
+        if not len(obj):
+            yield '{}'
+            return
+        items = obj.items()
+        if self._sort_keys:
+            items = sorted(items)
+        separator = ',\n' + self._indent * (level + 1)
+        yield '{\n' + self._indent * (level + 1)
+        for idx, (key, value) in enumerate(items):
+            if idx:
+                yield separator
+            yield self._scalar(_key_str(key)) + ': '
+            yield from self.iterencode(value, level + 1)
+        yield '\n' + self._indent * level + '}'
+
+
+def _encoder(kwargs):
+    kwargs = dict(kwargs)
+    kwargs.setdefault('indent', 2)
+    if kwargs['indent'] is None or any([k not in _KWARGS_SUPPORTED for k in kwargs.keys()]):
+        return None
+    return _Encoder(**kwargs)
+
+
+def dump(obj, f, *args, **kwargs):
+    """Serialize obj as pretty JSON to a text file.
+
+    :param obj: The object to serialize.
+    :param f: The text file object, which must support write().
+    :param kwargs: The json.dump keyword arguments.  The indent,
+        default, sort_keys, ensure_ascii, and allow_nan arguments
+        use the streaming encoder.
+    """
+    encoder = None if len(args) else _encoder(kwargs)
+    if encoder is None:
+        f.write(_dumps_regex(obj, *args, **kwargs))
+        return
+    chunks = []
+    sz = 0
+    for chunk in encoder.iterencode(obj):
+        chunks.append(chunk)
+        sz += len(chunk)
+        if sz >= _WRITE_SIZE:
+            f.write(''.join(chunks))
+            chunks.clear()
+            sz = 0
+    if len(chunks):
+        f.write(''.join(chunks))
+
+
+def dumps(*args, **kwargs):
+    """Serialize obj to a pretty JSON formatted str.
+
+    :see: dump()
+    """
+    encoder = None if len(args) != 1 else _encoder(kwargs)
+    if encoder is None:
+        return _dumps_regex(*args, **kwargs)
+    return ''.join(encoder.iterencode(args[0]))
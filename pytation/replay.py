@@ -0,0 +1,404 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Record device I/O and replay it to rerun tests without hardware.
+
+When the station "record" option is enabled, the station wraps each
+opened device in a recording proxy.  The proxy records every method
+call, attribute read, and attribute write made by the test code, along
+with the return value or exception, the device name, and the current
+section.  The operator's prompt() answers are also recorded.  The
+station saves the records as "replay.pkl" in the suite archive.
+
+The :class:`Replay` reruns the tests from a suite archive using
+:class:`ReplayDevice` instances that return the recorded values.  Each
+device and section has its own record sequence, so you may replay a
+subset of the tests.  The tests run at full speed without instruments,
+which makes it practical to bisect test logic regressions and to
+check test changes in continuous integration.
+
+The device setup, restore, and teardown methods are not recorded, and
+objects returned by the device are recorded by value, not wrapped.
+The records use pickle, so only load archives from trusted sources.
+"""
+
+from pytation import retention
+from pytation import events
+import collections
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import zipfile
+
+
+VERSION = 1
+FILENAME = 'replay.pkl'
+LIFECYCLE = ('setup', 'restore', 'teardown')
+OPERATOR = '__operator__'  # the pseudo-device name for prompt() answers
+_log = logging.getLogger(__name__)
+
+
+class ReplayError(RuntimeError):
+    """The test made a device access that does not match the recording."""
+    pass
+
+
+def _dumps(value):
+    try:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+
+class Recorder:
+    """Record device I/O for the suite archive.
+
+    :param context: The station :class:`pytation.Context`.
+    :param devices: The list of device names to record.  None records
+        all devices.
+
+    Records made outside of a suite, such as by station_setup, are
+    saved with every suite so that replay can run them too.
+    """
+
+    def __init__(self, context, devices=None):
+        self._context = context
+        self._devices = None if devices is None else set(devices)
+        self._lock = threading.Lock()
+        self._station_records = []
+        self._suite_records = None  # list while a suite is active
+
+    def wrap(self, name, device):
+        """Wrap a device for recording.
+
+        :param name: The device name.
+        :param device: The device object, after setup.
+        :return: The recording proxy, or device when not recorded.
+        """
+        if self._devices is not None and name not in self._devices:
+            return device
+        return _RecordingProxy(self, name, device)
+
+    def record(self, device, kind, attr, args=None, kwargs=None, result=None, error=None):
+        """Record one device access.
+
+        :param device: The device name.
+        :param kind: The access kind: 'call', 'get', or 'set'.
+        :param attr: The method or attribute name.
+        :param args: The positional arguments for 'call', or the value for 'set'.
+        :param kwargs: The keyword arguments for 'call'.
+        :param result: The return value or attribute value.
+        :param error: The exception raised, or None.
+        """
+        r = {
+            'device': device,
+            'section': self._context.section_name,
+            'kind': kind,
+            'attr': attr,
+            'args': _dumps(args),
+            'kwargs': _dumps(kwargs),
+            'result': _dumps(result),
+            'error': None if error is None else (_dumps(error) or _dumps(RuntimeError(repr(error)))),
+        }
+        with self._lock:
+            records = self._station_records if self._suite_records is None else self._suite_records
+            records.append(r)
+
+    def suite_start(self):
+        """Start recording a suite."""
+        with self._lock:
+            self._suite_records = []
+
+    def suite_stop(self, fs):
+        """Save the suite records.
+
+        :param fs: The suite archive filesystem.
+        """
+        with self._lock:
+            records = self._station_records + (self._suite_records or [])
+            self._suite_records = None
+        with fs.open(FILENAME, 'wb') as f:
+            pickle.dump({'version': VERSION, 'records': records}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class _RecordingProxy:
+    """Forward attribute access to a device and record it."""
+
+    def __init__(self, recorder, name, device):
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_device', device)
+
+    def __repr__(self):
+        return f'Recording({self._device!r})'
+
+    def __getattr__(self, attr):
+        value = getattr(self._device, attr)
+        if attr in LIFECYCLE or attr.startswith('_'):
+            return value
+        if not callable(value):
+            self._recorder.record(self._name, 'get', attr, result=value)
+            return value
+        recorder, name = self._recorder, self._name
+
+        def method(*args, **kwargs):
+            try:
+                result = value(*args, **kwargs)
+            except Exception as ex:
+                recorder.record(name, 'call', attr, args, kwargs, error=ex)
+                raise
+            recorder.record(name, 'call', attr, args, kwargs, result=result)
+            return result
+
+        return method
+
+    def __setattr__(self, attr, value):
+        setattr(self._device, attr, value)
+        if not attr.startswith('_'):
+            self._recorder.record(self._name, 'set', attr, value)
+
+
+def load(path):
+    """Load the device I/O records from a suite archive.
+
+    :param path: The suite archive path, see
+        :func:`pytation.retention.open_member`.
+    :return: The list of record dicts.
+    :raise ValueError: If the archive does not contain a recording.
+    """
+    with retention.open_member(path) as f, zipfile.ZipFile(f) as z:
+        if FILENAME not in z.namelist():
+            raise ValueError(f'no device recording in {path}, enable the station "record" option')
+        data = pickle.loads(z.read(FILENAME))
+    if data.get('version') != VERSION:
+        raise ValueError(f'unsupported recording version {data.get("version")}')
+    return data['records']
+
+
+class Player:
+    """Serve the recorded device accesses in order.
+
+    :param records: The list of record dicts from :func:`load`.
+    :param strict: True to raise :class:`ReplayError` when call
+        arguments or written values differ from the recording.  False
+        (default) logs a warning.
+    """
+
+    def __init__(self, records, strict=False):
+        self.strict = bool(strict)
+        self.mismatches = []  #: The list of mismatch messages, including ReplayError messages.
+        self._lock = threading.Lock()
+        self._queues = {}  # (device, section): deque of records
+        for r in records:
+            self._queues.setdefault((r['device'], r['section']), collections.deque()).append(r)
+
+    def peek(self, device, section):
+        """Get the next record without consuming it, or None."""
+        with self._lock:
+            q = self._queues.get((device, section))
+            return q[0] if q else None
+
+    def next(self, device, section, kind, attr):
+        """Consume the next record.
+
+        :param device: The device name.
+        :param section: The current section name.
+        :param kind: The access kind: 'call', 'get', or 'set'.
+        :param attr: The method or attribute name.
+        :return: The record dict.
+        :raise ReplayError: If the access does not match the recording.
+        """
+        with self._lock:
+            q = self._queues.get((device, section))
+            if not q:
+                msg = f'{section}: unrecorded {kind} {device}.{attr}'
+            elif q[0]['kind'] != kind or q[0]['attr'] != attr:
+                msg = f'{section}: {kind} {device}.{attr} but recorded {q[0]["kind"]} {device}.{q[0]["attr"]}'
+            else:
+                return q.popleft()
+            self.mismatches.append(msg)  # the test may catch the exception
+        raise ReplayError(msg)
+
+    def check(self, r, name, value):
+        """Compare a value with the recording.
+
+        :param r: The record dict.
+        :param name: The record field name, 'args' or 'kwargs'.
+        :param value: The value from the replayed test.
+        """
+        if r[name] is None or _dumps(value) == r[name]:
+            return
+        recorded = pickle.loads(r[name])
+        if recorded == value:
+            return
+        msg = f'{r["section"]}: {r["device"]}.{r["attr"]} {name} {value!r} != recorded {recorded!r}'
+        with self._lock:
+            self.mismatches.append(msg)
+        if self.strict:
+            raise ReplayError(msg)
+        _log.warning(msg)
+
+    @staticmethod
+    def result(r):
+        """Get the recorded result, or raise the recorded exception."""
+        if r['error'] is not None:
+            raise pickle.loads(r['error'])
+        if r['result'] is None:
+            raise ReplayError(f'{r["section"]}: {r["device"]}.{r["attr"]} result was not recorded')
+        return pickle.loads(r['result'])
+
+    def remaining(self):
+        """Get the number of records not yet consumed."""
+        with self._lock:
+            return sum([len(q) for q in self._queues.values()])
+
+
+class ReplayDevice:
+    """A device that returns the recorded values.
+
+    :param name: The device name.
+    :param player: The :class:`Player`.
+    """
+
+    def __init__(self, name, player):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_player', player)
+        object.__setattr__(self, '_context', None)
+
+    def setup(self, context):
+        object.__setattr__(self, '_context', context)
+
+    def restore(self):
+        pass
+
+    def teardown(self):
+        pass
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        player, name = self._player, self._name
+        section = self._context.section_name
+        r = player.peek(name, section)
+        if r is not None and r['kind'] == 'get' and r['attr'] == attr:
+            return player.result(player.next(name, section, 'get', attr))
+
+        def method(*args, **kwargs):
+            r = player.next(name, self._context.section_name, 'call', attr)
+            player.check(r, 'args', args)
+            player.check(r, 'kwargs', kwargs)
+            return player.result(r)
+
+        return method
+
+    def __setattr__(self, attr, value):
+        r = self._player.next(self._name, self._context.section_name, 'set', attr)
+        self._player.check(r, 'args', value)
+
+
+class Replay:
+    """Rerun the tests from a suite archive against the recorded device I/O.
+
+    :param path: The suite archive path.
+    :param strict: True to fail when the replayed test passes different
+        arguments to the devices than the recording.
+    """
+
+    def __init__(self, path, strict=False):
+        self.path = path
+        self.player = Player(load(path), strict=strict)
+        from pytation.analysis import AnalysisContext
+        with AnalysisContext(path) as analysis:
+            self.tests = dict([(t['name'], t) for t in analysis.tests])  #: The recorded test outputs.
+
+    def _on_prompt(self, prompt_str):
+        context = self._context
+        r = self.player.next(OPERATOR, context.section_name, 'call', 'prompt')
+        self.player.check(r, 'args', (prompt_str, ))
+        return self.player.result(r)
+
+    def station(self, station, base_path, tests=None):
+        """Construct the replay station.
+
+        :param station: The validated station that defines the tests
+            and their configuration.
+        :param base_path: The base path for the replay outputs.
+        :param tests: The list of test names to replay.  None replays
+            all recorded tests.
+        :return: The new validated station.
+        """
+        s = dict(station)
+        paths = dict(s['paths'])
+        paths['base_path'] = base_path
+        for key, value in paths.items():
+            if key != 'base_path' and '{base_path}' not in value:
+                paths[key] = '{base_path}/{station}/' + os.path.basename(value)
+        s['paths'] = paths
+        s['env'] = dict(s['env'])
+        s['devices'] = dict([(name, dict(d, clz=ReplayDevice(name, self.player), timeout=None))
+                             for name, d in s['devices'].items()])
+        names = list(self.tests.keys()) if tests is None else tests
+        s['tests'] = [t for t in s['tests'] if t['name'] in names and t['name'] in self.tests]
+        s['station_teardown'] = None  # runs after the last suite, so never recorded
+        s['handlers'] = {}  # do not report replayed units
+        for key in ['retention', 'retest', 'metrics', 'trace', 'record', 'operator']:
+            s[key] = {} if key == 'retention' else None
+        s['adaptive'] = False
+        s['analysis_workers'] = 0
+        s['pipeline'] = None
+        s['concurrency'] = 1
+        return s
+
+    def run(self, station, tests=None, base_path=None):
+        """Replay the tests.
+
+        :param station: The validated station that defines the tests.
+        :param tests: The list of test names to replay.  None replays
+            all recorded tests.
+        :param base_path: The base path for the replay outputs.  None
+            (default) uses a temporary directory that is removed after
+            the replay.
+        :return: The list of dicts with name, result, and recorded,
+            the recorded result, for each replayed test.
+        """
+        from pytation.context import Context
+        tempdir = None
+        if base_path is None:
+            tempdir = tempfile.TemporaryDirectory(prefix='pytation_replay_')
+            base_path = tempdir.name
+        results = []
+        s = self.station(station, base_path, tests)
+        names = set([t['name'] for t in s['tests']])
+
+        def on_test_done(event):
+            name = event.data['name']
+            if name in names:
+                recorded = self.tests.get(name, {}).get('result')
+                results.append({'name': name, 'result': event.data['result'], 'recorded': recorded})
+
+        try:
+            self._context = Context(s)
+            self._context.callback_register('prompt', self._on_prompt)
+            self._context.callback_register('wait_for_user', lambda: None)
+            self._context.events.subscribe(on_test_done, [events.TEST_DONE], sync=True)
+            self._context.station_run(count=1)
+        finally:
+            self._context = None
+            if tempdir is not None:
+                tempdir.cleanup()
+        return results
@@ -0,0 +1,340 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Bound the size of the station data and log directories.
+
+The station writes one ZIP file per suite to the "output" path and one
+log file per station start to the "log" path.  Stations that run
+continuously accumulate files forever.  This module prunes files by
+age, total size, and count, and compacts the many small suite ZIP files
+into one bundle per UTC day.  Each bundle has a JSON index sidecar that
+lists the member archives with their size, time, and suite result.
+"""
+
+from pytation import time
+import datetime
+import fnmatch
+import json
+import logging
+import os
+import zipfile
+
+
+BUNDLE_DIR = 'bundles'
+POLICY_DEFAULTS = {
+    'max_age': None,        # seconds, remove files older than this
+    'max_size': None,       # bytes, remove the oldest files until below
+    'max_count': None,      # remove the oldest files until below
+    'compact_after': None,  # seconds, bundle suite ZIP files older than this
+    'pattern': '*',         # the filename pattern for managed files
+}
+INTERVAL_DEFAULT = 3600.0   # seconds between automatic apply
+_log = logging.getLogger(__name__)
+
+
+def policy_validate(policy):
+    """Validate a single retention policy and populate defaults.
+
+    :param policy: The dict retention policy.
+    :return: The new, fully populated policy dict.
+    :raise ValueError: On unsupported keys or invalid values.
+    """
+    p = dict(POLICY_DEFAULTS)
+    for key, value in policy.items():
+        if key not in POLICY_DEFAULTS:
+            raise ValueError(f'invalid retention policy key: {key}')
+        if key != 'pattern' and value is not None and value < 0:
+            raise ValueError(f'invalid retention policy value: {key}={value}')
+        p[key] = value
+    return p
+
+
+def _day(filename, mtime):
+    name = os.path.splitext(os.path.basename(filename))[0]
+    try:
+        t = time.filename_to_time(name)
+    except ValueError:
+        t = mtime
+    return datetime.datetime.fromtimestamp(t, datetime.timezone.utc).strftime('%Y%m%d')
+
+
+def scan(path, pattern='*'):
+    """Scan a directory for managed files.
+
+    :param path: The directory path.
+    :param pattern: The fnmatch filename pattern.
+    :return: The list of (path, mtime, size) sorted from oldest to newest.
+        Files in the bundle subdirectory are included.
+    """
+    files = []
+    for dirpath in [path, os.path.join(path, BUNDLE_DIR)]:
+        try:
+            entries = list(os.scandir(dirpath))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if not entry.is_file() or not fnmatch.fnmatch(entry.name, pattern):
+                continue
+            if dirpath != path and not entry.name.endswith('.zip'):
+                continue  # index sidecars follow their bundle
+            st = entry.stat()
+            files.append((entry.path, st.st_mtime, st.st_size))
+    files.sort(key=lambda x: x[1])
+    return files
+
+
+def _remove(path):
+    _log.info('retention remove %s', path)
+    os.remove(path)
+    if os.path.basename(os.path.dirname(path)) == BUNDLE_DIR:
+        index_path = os.path.splitext(path)[0] + '.json'
+        if os.path.isfile(index_path):
+            os.remove(index_path)
+
+
+def prune(path, max_age=None, max_size=None, max_count=None, pattern='*', now=None, exclude=None):
+    """Remove the oldest files from a directory.
+
+    :param path: The directory path.
+    :param max_age: The maximum file age in seconds.  None is unlimited.
+    :param max_size: The maximum total size in bytes.  None is unlimited.
+    :param max_count: The maximum number of files.  None is unlimited.
+    :param pattern: The fnmatch filename pattern for managed files.
+    :param now: The current time.  None (default) uses time.now().
+    :param exclude: The list of file paths that must not be removed,
+        such as the currently open log file.
+    :return: The list of removed file paths.
+    """
+    now = time.now() if now is None else now
+    exclude = [os.path.normpath(p) for p in (exclude or [])]
+    files = scan(path, pattern)
+    total_size = sum([f[2] for f in files])
+    count = len(files)
+    removed = []
+    for fpath, mtime, size in files:
+        if os.path.normpath(fpath) in exclude:
+            continue
+        if max_age is not None and now - mtime > max_age:
+            pass
+        elif max_size is not None and total_size > max_size:
+            pass
+        elif max_count is not None and count > max_count:
+            pass
+        else:
+            break  # files are sorted, so all remaining files are newer
+        try:
+            _remove(fpath)
+        except OSError:
+            _log.warning('retention could not remove %s', fpath)
+            continue
+        removed.append(fpath)
+        total_size -= size
+        count -= 1
+    return removed
+
+
+def _suite_result(fpath):
+    try:
+        with zipfile.ZipFile(fpath, 'r') as z:
+            with z.open('tests.json') as f:
+                tests = json.load(f)
+    except Exception:
+        return None
+    for test in tests:
+        if test.get('result'):
+            return test['result']
+    return 0
+
+
+def index_load(bundle_path):
+    """Load the index for a bundle.
+
+    :param bundle_path: The path to the bundle ZIP file.
+    :return: The list of index entries, which are dicts with
+        keys name, size, mtime, and result.
+    """
+    index_path = os.path.splitext(bundle_path)[0] + '.json'
+    if not os.path.isfile(index_path):
+        return []
+    with open(index_path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _index_save(bundle_path, index):
+    index_path = os.path.splitext(bundle_path)[0] + '.json'
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+
+
+def compact(path, older_than, now=None, pattern='*.zip', moved=None):
+    """Compact suite ZIP files into per-day bundles.
+
+    :param path: The data directory path containing suite ZIP files.
+    :param older_than: Only compact files older than this duration
+        in seconds.
+    :param now: The current time.  None (default) uses time.now().
+    :param pattern: The fnmatch filename pattern for suite files.
+    :param moved: The optional dict that receives the original path
+        mapped to the new bundle member path for each compacted file.
+    :return: The list of bundle paths that were modified.
+
+    Bundles are stored in the "bundles" subdirectory as YYYYMMDD.zip
+    along with the YYYYMMDD.json index.  Existing bundles are appended.
+    Use :func:`open_member` to read an archive from a bundle.
+    """
+    now = time.now() if now is None else now
+    groups = {}
+    for fpath, mtime, size in scan(path, pattern):
+        if os.path.dirname(fpath) != path or now - mtime <= older_than:
+            continue
+        groups.setdefault(_day(fpath, mtime), []).append((fpath, mtime, size))
+
+    bundles = []
+    for day, files in sorted(groups.items()):
+        bundle_path = os.path.join(path, BUNDLE_DIR, day + '.zip')
+        os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+        index = index_load(bundle_path)
+        names = set([entry['name'] for entry in index])
+        mode = 'a' if os.path.isfile(bundle_path) else 'w'
+        added = []
+        with zipfile.ZipFile(bundle_path, mode, compression=zipfile.ZIP_DEFLATED) as z:
+            for fpath, mtime, size in files:
+                name = os.path.basename(fpath)
+                if name in names:
+                    _log.warning('retention bundle %s already contains %s', bundle_path, name)
+                    continue
+                z.write(fpath, name)
+                index.append({
+                    'name': name,
+                    'size': size,
+                    'mtime': mtime,
+                    'result': _suite_result(fpath),
+                })
+                names.add(name)
+                added.append(fpath)
+        _index_save(bundle_path, index)
+        for fpath in added:  # only remove once the bundle is safely written
+            os.remove(fpath)
+            if moved is not None:
+                moved[fpath] = os.path.join(bundle_path, os.path.basename(fpath))
+        _log.info('retention compacted %d files into %s', len(added), bundle_path)
+        bundles.append(bundle_path)
+    return bundles
+
+
+class _BundleMember:
+    """A bundle member file object that also closes its bundle."""
+
+    def __init__(self, bundle, f):
+        self._bundle = bundle
+        self._f = f
+
+    def __getattr__(self, name):
+        return getattr(self._f, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        try:
+            self._f.close()
+        finally:
+            self._bundle.close()
+
+
+def open_member(path):
+    """Open a suite archive that may have been compacted into a bundle.
+
+    :param path: The path to the suite ZIP file, or the path formed
+        by joining a bundle path with the member name, such as
+        "data/bundles/20261019.zip/20261019_153000_000000.zip".
+    :return: The readable, seekable binary file object, which the
+        caller must close.  Use it in a "with" statement.
+    :raise FileNotFoundError: If the archive does not exist.
+    """
+    if os.path.isfile(path):
+        return open(path, 'rb')
+    bundle_path, name = os.path.split(path)
+    if not os.path.isfile(bundle_path):
+        raise FileNotFoundError(path)
+    z = zipfile.ZipFile(bundle_path, 'r')
+    try:
+        return _BundleMember(z, z.open(name, 'r'))
+    except KeyError:
+        z.close()
+        raise FileNotFoundError(path)
+
+
+class Retention:
+    """Apply the station retention policies.
+
+    :param context: The station context, used to resolve paths.
+    :param policies: The dict mapping path keys, such as "output" and
+        "log", to the policy dict.  See :data:`POLICY_DEFAULTS`.
+    :param interval: The minimum duration in seconds between
+        automatic :meth:`apply` invocations.
+    :param on_move: The optional callable(moved) called with the dict
+        mapping original path to bundle member path after compaction,
+        so that indices can update their archive paths.
+    """
+
+    def __init__(self, context, policies, interval=None, on_move=None):
+        self._context = context
+        self._policies = policies
+        self._interval = INTERVAL_DEFAULT if interval is None else interval
+        self._on_move = on_move
+        self._last = None
+
+    def __bool__(self):
+        return bool(self._policies)
+
+    def apply(self, force=False):
+        """Apply all retention policies.
+
+        :param force: True to apply regardless of the interval.
+        :return: The dict mapping path key to the list of removed files.
+        """
+        t = time.now()
+        if not self._policies:
+            return {}
+        if not force and self._last is not None and (t - self._last) < self._interval:
+            return {}
+        self._last = t
+        removed = {}
+        moved = {}
+        for key, policy in self._policies.items():
+            path = os.path.normpath(self._context.path(key))
+            dirpath = os.path.dirname(path)
+            try:
+                if policy['compact_after'] is not None:
+                    compact(dirpath, policy['compact_after'], now=t, moved=moved)
+                removed[key] = prune(dirpath,
+                                     max_age=policy['max_age'],
+                                     max_size=policy['max_size'],
+                                     max_count=policy['max_count'],
+                                     pattern=policy['pattern'],
+                                     now=t,
+                                     exclude=[path])
+            except Exception:
+                _log.exception('retention %s failed', key)
+        if len(moved) and self._on_move is not None:
+            self._on_move(moved)
+        return removed
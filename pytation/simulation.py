@@ -0,0 +1,402 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Simulate a station without hardware to predict its throughput.
+
+The :class:`TimingModel` collects the recorded timing of previous
+suites from their archives:
+
+* tests.json: The duration and result of each test, including the
+  setup and teardown functions.
+* operator.json: The wait_for_user() and prompt() durations within
+  each test.
+* trace.json: The device setup, restore, and teardown durations and
+  failures.  Enable the station "trace" option to record these.
+
+The :class:`Simulation` runs the station with each device replaced by a
+:class:`VirtualDevice` and each test replaced by a :class:`VirtualTest`.
+Both draw their duration and result from the recorded samples and
+advance the virtual clock, :func:`pytation.time.advance`, instead of
+waiting.  The simulation answers wait_for_user() and prompt()
+automatically after the recorded operator time, and it disables the
+station handlers, device I/O recording, and the operator shift log so
+that simulated units do not mix with real ones.  The station still
+runs its normal suite flow, including adaptive ordering, pipelining,
+and archive writes, so changes to these options show in the predicted
+units per hour.
+"""
+
+from pytation import time
+from pytation import retention
+from pytation.history import DURATION_DEFAULT
+from pytation.loader import SETUP_TEARDOWN_FN
+from pytation import events
+import glob
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import zipfile
+
+
+ARCHIVES_LIMIT_DEFAULT = 100
+_log = logging.getLogger(__name__)
+
+
+def _zip_json(z, names, name):
+    if name not in names:
+        return None
+    return json.loads(z.read(name))
+
+
+class TimingModel:
+    """The recorded test, device, and operator timing samples."""
+
+    def __init__(self):
+        self.suites = 0  #: The number of suites added.
+        self.tests = {}  #: test name: list of sample dicts with duration, result, and operator.
+        self.devices = {}  #: (device name, operation): list of (duration, failed).
+
+    @staticmethod
+    def from_archives(paths):
+        """Construct a model from suite archives.
+
+        :param paths: The list of suite archive paths.
+        :return: The new :class:`TimingModel`.
+        """
+        model = TimingModel()
+        for path in paths:
+            try:
+                model.add_archive(path)
+            except Exception:
+                _log.warning('Could not add archive %s, skipping', path)
+        return model
+
+    def add_archive(self, path):
+        """Add the samples from a suite archive.
+
+        :param path: The suite archive path, see
+            :func:`pytation.retention.open_member`.
+        """
+        with retention.open_member(path) as f, zipfile.ZipFile(f) as z:
+            names = set(z.namelist())
+            tests = _zip_json(z, names, 'tests.json') or []
+            operator = _zip_json(z, names, 'operator.json') or {}
+            spans = _zip_json(z, names, 'trace.json') or []
+        self.add_suite(tests, operator.get('events', []), spans)
+
+    def add_suite(self, tests, operator_events=None, spans=None):
+        """Add the samples from one suite.
+
+        :param tests: The tests.json list of test output dicts.
+        :param operator_events: The operator.json events list.
+        :param spans: The trace.json span dict list.
+        """
+        operator_events = operator_events or []
+        spans = spans or []
+        by_id = dict([(s['span_id'], s) for s in spans])
+        device_time = {}  # test name: device setup and teardown time within the test
+        for s in spans:
+            device = s['attributes'].get('device')
+            if device is None or s['duration'] is None:
+                continue
+            operation = s['name'].rsplit(' ', 1)[-1]
+            self.devices.setdefault((device, operation), []).append((s['duration'], s['error'] is not None))
+            parent = by_id.get(s['parent_id'])
+            if operation != 'restore' and parent is not None and 'test' in parent['attributes']:
+                name = parent['attributes']['test']
+                device_time[name] = device_time.get(name, 0.0) + s['duration']
+        for t in tests:
+            if 'duration' not in t or 'reused' in t:
+                continue
+            name = t['name']
+            operator = [[e['kind'], e['duration'], e.get('prompt')] for e in operator_events
+                        if e.get('section') and name in e['section'].split('.')]
+            duration = max(0.0, t['duration'] - device_time.get(name, 0.0))
+            self.tests.setdefault(name, []).append({
+                'duration': duration,
+                'result': t['result'],
+                'operator': operator,
+            })
+        self.suites += 1
+
+    def test_sample(self, name, rng):
+        """Draw a test sample.
+
+        :param name: The test name.
+        :param rng: The random.Random instance.
+        :return: The sample dict with duration, result, and operator,
+            the list of [kind, duration, prompt].  Tests without
+            samples pass after :data:`pytation.history.DURATION_DEFAULT`.
+        """
+        samples = self.tests.get(name)
+        if not samples:
+            return {'duration': DURATION_DEFAULT, 'result': 0, 'operator': []}
+        return rng.choice(samples)
+
+    def device_sample(self, name, operation, rng):
+        """Draw a device operation sample.
+
+        :param name: The device name.
+        :param operation: The operation: setup, restore, or teardown.
+        :param rng: The random.Random instance.
+        :return: The tuple of (duration, failed).  Operations without
+            samples succeed immediately.
+        """
+        samples = self.devices.get((name, operation))
+        if not samples:
+            return 0.0, False
+        return rng.choice(samples)
+
+
+def archives_find(station, limit=None):
+    """Find the most recent suite archives for a station.
+
+    :param station: The validated station.
+    :param limit: The maximum number of archives.  None uses
+        :data:`ARCHIVES_LIMIT_DEFAULT`.
+    :return: The list of archive paths, oldest first.
+    """
+    limit = ARCHIVES_LIMIT_DEFAULT if limit is None else limit
+    paths = station['paths']
+    env = dict(station['env'], station=station['name'])
+    try:
+        dirpath = os.path.dirname(paths['output']).format(**paths, **env)
+    except KeyError:
+        return []
+    files = sorted(glob.glob(os.path.join(os.path.normpath(dirpath), '*.zip')))
+    return files[-limit:] if limit else files
+
+
+class VirtualDevice:
+    """A device that only models the recorded timing.
+
+    :param name: The device name.
+    :param model: The :class:`TimingModel`.
+    :param rng: The random.Random instance.
+
+    Tests that call device methods other than setup, restore, and
+    teardown are replaced by :class:`VirtualTest` and never call them.
+    """
+
+    def __init__(self, name, model, rng):
+        self.name = name
+        self._model = model
+        self._rng = rng
+
+    def _operation(self, operation):
+        duration, failed = self._model.device_sample(self.name, operation, self._rng)
+        time.advance(duration)
+        if failed:
+            raise RuntimeError(f'simulated device {self.name} {operation} failure')
+
+    def setup(self, context):
+        self._operation('setup')
+
+    def restore(self):
+        self._operation('restore')
+
+    def teardown(self):
+        self._operation('teardown')
+
+
+class VirtualTest:
+    """A test function that only models the recorded timing.
+
+    :param simulation: The :class:`Simulation`.
+    :param name: The test name.
+    """
+
+    def __init__(self, simulation, name):
+        self.NAME = name
+        self._simulation = simulation
+
+    def __call__(self, context):
+        sample = self._simulation.model.test_sample(self.NAME, self._simulation.rng)
+        operator = sum([e[1] for e in sample['operator']])
+        time.advance(max(0.0, sample['duration'] - operator))
+        for kind, duration, prompt in sample['operator']:
+            self._simulation.operator_next(duration)
+            if kind == 'wait':
+                context.wait_for_user()
+            else:
+                context.prompt(prompt or '')
+        return sample['result']
+
+
+class Simulation:
+    """Run a station with virtual devices and tests.
+
+    :param station: The validated station.
+    :param model: The :class:`TimingModel`.
+    :param seed: The random seed for repeatable simulations.
+    :param base_path: The base path for the simulated station outputs.
+        None (default) uses a temporary directory that is removed
+        after :meth:`run`.
+
+    Concurrent test execution is not simulated, since the virtual
+    clock is shared by all threads.  The simulation runs the tests
+    sequentially.
+    """
+
+    def __init__(self, station, model, seed=None, base_path=None):
+        self.model = model
+        self.rng = random.Random(seed)
+        self._base_path = base_path
+        self._station = station
+        self._operator_duration = 0.0
+        self._lock = threading.Lock()
+
+    def operator_next(self, duration):
+        """Set the operator time for the next wait_for_user() or prompt().
+
+        :param duration: The duration in seconds.
+        """
+        with self._lock:
+            self._operator_duration = duration
+
+    def _operator_answer(self):
+        with self._lock:
+            duration, self._operator_duration = self._operator_duration, 0.0
+        time.advance(duration)
+
+    def _on_wait_for_user(self):
+        self._operator_answer()
+
+    def _on_prompt(self, prompt_str):
+        self._operator_answer()
+        return ''
+
+    def station(self, base_path):
+        """Construct the simulated station.
+
+        :param base_path: The base path for the station outputs.
+        :return: The new validated station.
+        """
+        s = dict(self._station)
+        paths = dict(s['paths'])
+        paths['base_path'] = base_path
+        for key, value in paths.items():
+            if key != 'base_path' and '{base_path}' not in value:
+                paths[key] = '{base_path}/{station}/' + os.path.basename(value)
+        s['paths'] = paths
+        s['env'] = dict(s['env'])
+        s['devices'] = dict([(name, dict(d, clz=VirtualDevice(name, self.model, self.rng), timeout=None))
+                             for name, d in s['devices'].items()])
+        s['tests'] = [dict(t, fn=VirtualTest(self, t['name']), devices=self._test_devices(t))
+                      for t in s['tests']]
+        for key in SETUP_TEARDOWN_FN:
+            if s.get(key) is not None:
+                s[key] = dict(s[key], fn=VirtualTest(self, s[key]['name']), devices=[])
+        if s.get('concurrency', 1) > 1:
+            _log.warning('simulation runs tests sequentially, ignoring concurrency %d', s['concurrency'])
+            s['concurrency'] = 1
+        s['handlers'] = {}  # do not report simulated units
+        for key in ['retest', 'metrics', 'trace', 'record', 'operator']:
+            s[key] = None
+        s['retention'] = {}
+        s['analysis_workers'] = 0
+        return s
+
+    @staticmethod
+    def _test_devices(t):
+        if t.get('devices') is not None:
+            return t['devices']
+        try:
+            return list(getattr(t['fn'].resolve(), 'DEVICES', []))
+        except Exception:
+            return []
+
+    def run(self, count):
+        """Run the simulation.
+
+        :param count: The number of suites to simulate.
+        :return: The report dict with the keys:
+            * units: The number of suites completed.
+            * fail: The number of failed suites.
+            * duration: The simulated duration in seconds.
+            * real_duration: The actual elapsed duration in seconds.
+            * units_per_hour: The predicted throughput.
+            * yield: The fraction of passing units.
+            * tests: The dict of test name to the dict with runs,
+              fails, and the mean duration in seconds.
+        """
+        from pytation.context import Context
+        tempdir = None
+        base_path = self._base_path
+        if base_path is None:
+            tempdir = tempfile.TemporaryDirectory(prefix='pytation_sim_')
+            base_path = tempdir.name
+        units = []
+        tests = {}
+
+        def on_event(event):
+            if event.type == events.SUITE_DONE:
+                units.append(event.data['result'])
+            else:
+                t = tests.setdefault(event.data['name'], {'runs': 0, 'fails': 0, 'duration': 0.0})
+                t['runs'] += 1
+                t['fails'] += 1 if event.data['result'] else 0
+                t['duration'] += event.data['duration']
+
+        try:
+            with time.virtual():
+                offset = time.offset()
+                t_start = time.now()
+                context = Context(self.station(base_path))
+                context.callback_register('wait_for_user', self._on_wait_for_user)
+                context.callback_register('prompt', self._on_prompt)
+                context.events.subscribe(on_event, [events.SUITE_DONE, events.TEST_DONE], sync=True)
+                context.station_run(count=count)
+                duration = time.now() - t_start
+                real_duration = duration - (time.offset() - offset)
+        finally:
+            if tempdir is not None:
+                tempdir.cleanup()
+        for t in tests.values():
+            t['duration'] = t['duration'] / t['runs']
+        fail = len([u for u in units if u])
+        return {
+            'units': len(units),
+            'fail': fail,
+            'duration': duration,
+            'real_duration': real_duration,
+            'units_per_hour': len(units) * 3600.0 / duration if duration > 0 else 0.0,
+            'yield': (len(units) - fail) / len(units) if len(units) else 0.0,
+            'tests': tests,
+        }
+
+
+def report(result):
+    """Format the simulation report as text.
+
+    :param result: The report dict from :meth:`Simulation.run`.
+    :return: The str report.
+    """
+    lines = [
+        f'units:          {result["units"]}',
+        f'fail:           {result["fail"]}',
+        f'yield:          {100 * result["yield"]:.1f}%',
+        f'duration:       {result["duration"]:.1f} s simulated, {result["real_duration"]:.1f} s actual',
+        f'units per hour: {result["units_per_hour"]:.1f}',
+        '',
+        f'{"test":>24s}  {"runs":>6s}  {"fails":>6s}  {"mean s":>8s}',
+    ]
+    for name, t in result['tests'].items():
+        lines.append(f'{name:>24s}  {t["runs"]:6d}  {t["fails"]:6d}  {t["duration"]:8.3f}')
+    return '\n'.join(lines)
@@ -0,0 +1,78 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark the pretty JSON encoder against the original regex implementation.
+
+Run with "python -m pytation.test.bench_pretty_json".
+"""
+
+from pytation import pretty_json
+import io
+import random
+import time
+
+
+def _tests_json(count, length):
+    """Create a structure similar to tests.json with large details."""
+    tests = []
+    for idx in range(count):
+        tests.append({
+            'name': f'test{idx}',
+            'config': {'mode': 'normal', 'gains': [random.random() for _ in range(16)]},
+            'result': 0,
+            'detail': {
+                'samples': [random.random() for _ in range(length)],
+                'counts': list(range(length)),
+                'nested': [[1, 2, 3], {'a': 'b'}],
+            },
+        })
+    return tests
+
+
+def _run(name, fn, obj, repeat):
+    t_start = time.perf_counter()
+    for _ in range(repeat):
+        f = io.StringIO()
+        fn(obj, f)
+    duration = (time.perf_counter() - t_start) / repeat
+    print(f'{name:>10s}: {duration * 1000:9.2f} ms, {len(f.getvalue())} chars')
+    return f.getvalue()
+
+
+def _regex_dump(obj, f):
+    f.write(pretty_json._dumps_regex(obj))
+
+
+def run():
+    random.seed(0)
+    for count, length, repeat in [(100, 10, 50), (20, 10000, 5), (4, 200000, 1)]:
+        obj = _tests_json(count, length)
+        print(f'tests={count}, length={length}')
+        s1 = _run('original', _regex_dump, obj, repeat)
+        s2 = _run('streaming', pretty_json.dump, obj, repeat)
+        if s1 != s2:
+            print('  MISMATCH')
+    try:
+        import numpy as np
+    except ImportError:
+        return
+    obj = {'detail': {'samples': np.random.default_rng(0).random(1000000)}}
+    print('numpy length=1000000')
+    _run('original', _regex_dump, obj, 1)
+    _run('streaming', pretty_json.dump, obj, 1)
+
+
+if __name__ == '__main__':
+    run()
@@ -17,7 +17,9 @@ Test the Analysis module.
 """
 
 import unittest
+import json
 import os
+import zipfile
 from unittest.mock import Mock
 from pytation import Context, AnalysisContext
 from pytation.loader import validate
@@ -51,14 +53,33 @@ class TestAnalysis(unittest.TestCase):
         TestAnalysis.path = context.path('output')
 
     def test_basic(self):
-        a = AnalysisContext(TestAnalysis.path)
-        self.assertEqual(42, a.run())
+        with AnalysisContext(TestAnalysis.path) as a:
+            self.assertEqual(42, a.run())
 
     def test_analyze_single(self):
-        a = AnalysisContext(TestAnalysis.path)
-        self.assertEqual(42, a.run(['pytation.test.test_01']))
+        with AnalysisContext(TestAnalysis.path) as a:
+            self.assertEqual(42, a.run(['pytation.test.test_01']))
 
     def test_analyze_invalid(self):
-        a = AnalysisContext(TestAnalysis.path)
-        with self.assertRaises(KeyError):
-            a.run(['invalid'])
+        with AnalysisContext(TestAnalysis.path) as a:
+            with self.assertRaises(KeyError):
+                a.run(['invalid'])
+
+
+class TestInlineAnalysis(unittest.TestCase):
+
+    def test_inline(self):
+        station = dict(STATION)
+        station['name'] = 'test_inline_analysis'
+        station['env'] = {'error_count_to_halt': 2}
+        station['tests'] = [
+            {'fn': 'pytation.test.test_01', 'config': {'override': 'their_override'}},
+            {'fn': 'pytation.test.tmodule'},
+        ]
+        station['analysis_workers'] = 1
+        context = Context(validate(station))
+        context.station_run(count=1)
+        with zipfile.ZipFile(context.path('output')) as z:
+            tests = json.loads(z.read('tests.json'))
+        self.assertEqual(42, tests[0]['analysis'])
+        self.assertEqual(0, tests[1]['analysis'])
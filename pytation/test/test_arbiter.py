@@ -0,0 +1,99 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the device arbiter.
+"""
+
+import unittest
+import threading
+import time
+from pytation.arbiter import Arbiter, DeadlockError
+
+
+class TestArbiter(unittest.TestCase):
+
+    def _wait_queued(self, arbiter, name, count):
+        for _ in range(500):
+            if arbiter.stats()[name]['queued'] >= count:
+                return
+            time.sleep(0.002)
+        raise AssertionError('waiter not queued')
+
+    def _acquire_thread(self, arbiter, devices, owner, order):
+        def run():
+            with arbiter.acquire(devices, owner=owner):
+                order.append(owner)
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def test_exclusive(self):
+        a = Arbiter(['x', 'y'])
+        lease = a.acquire(['x'], owner='t1')
+        self.assertEqual('t1', a.owner('x'))
+        self.assertIsNone(a.acquire(['x', 'y'], owner='t2', timeout=0))
+        self.assertIsNone(a.owner('y'))
+        with a.acquire(['y'], owner='t2') as lease2:
+            self.assertEqual({'y'}, lease2.devices)
+        lease.release()
+        lease.release()
+        self.assertFalse(lease.active)
+        self.assertIsNone(a.owner('x'))
+
+    def test_reentrant(self):
+        a = Arbiter()
+        with a.acquire(['x'], owner='t1'):
+            with a.acquire(['x', 'y'], owner='t1', timeout=0) as lease:
+                self.assertEqual({'y'}, lease.devices)
+            self.assertEqual('t1', a.owner('x'))
+
+    def test_fifo(self):
+        a = Arbiter()
+        order = []
+        lease = a.acquire(['x'], owner='t1')
+        threads = [self._acquire_thread(a, ['x', 'y'], 't2', order)]
+        self._wait_queued(a, 'x', 1)
+        threads.append(self._acquire_thread(a, ['y'], 't3', order))
+        self._wait_queued(a, 'y', 2)
+        self.assertIsNone(a.acquire(['y'], owner='t4', timeout=0))  # no overtaking
+        time.sleep(0.01)
+        lease.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(['t2', 't3'], order)
+        stats = a.stats()
+        self.assertEqual(2, stats['x']['leases'])
+        self.assertEqual(1, stats['x']['waits'])
+        self.assertGreater(stats['x']['wait_max'], 0.005)
+
+    def test_deadlock(self):
+        a = Arbiter()
+        order = []
+        lease1 = a.acquire(['x'], owner='t1')
+        lease2 = a.acquire(['y'], owner='t2')
+        thread = self._acquire_thread(a, ['x'], 't2', order)
+        self._wait_queued(a, 'x', 1)
+        with self.assertRaises(DeadlockError):
+            a.acquire(['y'], owner='t1')
+        lease1.release()
+        thread.join()
+        lease2.release()
+        self.assertEqual(['t2'], order)
+
+    def test_timeout(self):
+        a = Arbiter()
+        with a.acquire(['x'], owner='t1'):
+            self.assertIsNone(a.acquire(['x'], owner='t2', timeout=0.01))
+        self.assertEqual(0, a.stats()['x']['queued'])
@@ -0,0 +1,219 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the streaming capture.
+"""
+
+import unittest
+import json
+import threading
+import zipfile
+import zlib
+from pytation import Context, AnalysisContext
+from pytation.loader import validate
+from fs.memoryfs import MemoryFS
+
+try:
+    import numpy as np
+    from pytation.capture import Capture, CaptureReader
+except ImportError:
+    np = None
+
+BLOCK_SIZE = 1000
+BLOCK_COUNT = 50
+
+
+def capture_test(context):
+    capture = context.capture_open('iv', np.float32, shape=(2, ), sample_rate=1e6, compression='zlib',
+                                   chunk_samples=4096, queue_bytes=BLOCK_SIZE * 8 * 4)
+
+    def instrument():
+        buffer = np.empty((BLOCK_SIZE, 2), dtype=np.float32)
+        for idx in range(BLOCK_COUNT):
+            buffer[:, 0] = np.arange(BLOCK_SIZE) + idx * BLOCK_SIZE
+            buffer[:, 1] = -buffer[:, 0]
+            capture.push(buffer)  # buffer reused
+
+    thread = threading.Thread(target=instrument)
+    thread.start()
+    thread.join()
+    return 0
+
+
+def run(context):
+    return capture_test(context)
+
+
+def analyze(context):
+    iv = context.capture('iv')
+    expect = np.arange(BLOCK_SIZE * BLOCK_COUNT, dtype=np.float32)
+    if len(iv) != len(expect) or not np.array_equal(expect[4000:9000], iv.read_time(0.004, 0.009)[:, 0]):
+        return 1
+    return 0
+
+
+def _read(z, path):
+    index = json.loads(z.read(path + '.json'))
+    data = z.read(path + '.bin')
+    blocks = []
+    for offset, size, sample_start, sample_count in index['chunks']:
+        b = data[offset:offset + size]
+        if index['compression'] == 'zlib':
+            b = zlib.decompress(b)
+        blocks.append(np.frombuffer(b, dtype=index['dtype']).reshape([-1] + index['shape']))
+    return index, np.concatenate(blocks)
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestCapture(unittest.TestCase):
+
+    def test_capture_memory(self):
+        fs = MemoryFS()
+        with Capture(fs, 'c', np.uint16, chunk_samples=10) as c:
+            for idx in range(10):
+                c.push(np.arange(idx * 3, idx * 3 + 3))
+        index = json.loads(fs.readtext('c.json'))
+        self.assertEqual(30, index['sample_count'])
+        self.assertEqual([0, 24, 0, 12], index['chunks'][0])
+        np.testing.assert_array_equal(np.arange(30, dtype=np.uint16), np.frombuffer(fs.readbytes('c.bin'), np.uint16))
+        with self.assertRaises(RuntimeError):
+            c.push([1])
+
+    def test_push_timeout_drops(self):
+        c = Capture(MemoryFS(), 'c', np.uint8, queue_bytes=10)
+        with c._cv:  # hold the writer so the queue remains full
+            c._pending = 10
+        self.assertFalse(c.push(np.zeros(5), timeout=0.01))
+        self.assertEqual(5, c.dropped)
+        with c._cv:
+            c._pending = 0
+        c.close()
+
+    def test_close_while_push_waits(self):
+        c = Capture(MemoryFS(), 'c', np.uint8, queue_bytes=10)
+        with c._cv:  # hold the writer so the queue remains full
+            c._pending = 10
+        errors = []
+
+        def push():
+            try:
+                c.push(np.zeros(5))
+            except RuntimeError as ex:
+                errors.append(ex)
+
+        thread = threading.Thread(target=push, daemon=True)
+        thread.start()
+        thread.join(0.05)
+        c.close()
+        thread.join(5.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(1, len(errors))
+        self.assertTrue(c._queue.empty())
+
+    def test_write_error_drops_chunk(self):
+        fs = MemoryFS()
+        c = Capture(fs, 'c', np.uint8, chunk_samples=3)
+        f, release = c._f, threading.Event()
+        writes = []
+
+        class FailOnce:
+            def write(self, b):
+                writes.append(b)
+                if len(writes) == 1:
+                    release.wait(5.0)
+                    raise IOError('write failed')
+                return f.write(b)
+
+            def close(self):
+                f.close()
+
+        c._f = FailOnce()
+        c.push([0, 1, 2])
+        c.push([3, 4, 5])
+        release.set()
+        c.close()
+        self.assertEqual(3, c.sample_count)
+        self.assertEqual(bytes([3, 4, 5]), fs.readbytes('c.bin'))
+
+    def test_suite(self):
+        station = validate({
+            'name': 'test_capture',
+            'tests': [{'name': 'capture', 'fn': capture_test}],
+            'devices': [],
+        })
+        context = Context(station)
+        context.station_run(count=1)
+        with zipfile.ZipFile(context.path('output')) as z:
+            index, data = _read(z, 'capture/iv')
+        self.assertEqual(BLOCK_SIZE * BLOCK_COUNT, index['sample_count'])
+        self.assertEqual(0, index['dropped'])
+        self.assertGreater(len(index['chunks']), 1)
+        expect = np.arange(BLOCK_SIZE * BLOCK_COUNT, dtype=np.float32)
+        np.testing.assert_array_equal(expect, data[:, 0])
+        np.testing.assert_array_equal(-expect, data[:, 1])
+
+    def _reader_fs(self, compression):
+        fs = MemoryFS()
+        with Capture(fs, 'c', np.int32, shape=(2, ), sample_rate=1000, compression=compression,
+                     chunk_samples=100) as c:
+            for idx in range(10):
+                x = np.arange(idx * 97, (idx + 1) * 97, dtype=np.int32)
+                c.push(np.stack([x, -x], axis=1))
+        return fs
+
+    def test_reader(self):
+        expect = np.arange(970, dtype=np.int32)
+        for compression in [None, 'zlib']:
+            with self.subTest(compression=compression):
+                with CaptureReader(self._reader_fs(compression), 'c') as r:
+                    self.assertEqual(970, len(r))
+                    self.assertEqual((2, ), r.shape)
+                    np.testing.assert_array_equal(expect, r.read()[:, 0])
+                    np.testing.assert_array_equal(expect[150:420], r.read(150, 420)[:, 0])
+                    np.testing.assert_array_equal(-expect[5:7], r.read(5, 7)[:, 1])
+                    np.testing.assert_array_equal(expect[900:], r.read(900, 2000)[:, 0])
+                    np.testing.assert_array_equal(expect[250:500], r.read_time(0.25, 0.5)[:, 0])
+                    self.assertEqual((0, 2), r.read(500, 500).shape)
+                    self.assertFalse(r.read(0, 200).flags.writeable)
+
+    def test_summary(self):
+        fs = self._reader_fs('zlib')
+        index = json.loads(fs.readtext('c.json'))
+        self.assertEqual(len(index['chunks']), len(index['chunk_min']))
+        n = index['chunks'][0][3]
+        self.assertEqual([0, 1 - n], index['chunk_min'][0])
+        self.assertEqual([n - 1, 0], index['chunk_max'][0])
+        with CaptureReader(fs, 'c') as r:
+            start, v_min, v_max = r.summary(5)  # from chunk summaries
+            self.assertEqual(5, len(start))
+            self.assertEqual(0, start[0])
+            self.assertEqual([0, -969], v_min.min(axis=0).tolist())
+            self.assertEqual([969, 0], v_max.max(axis=0).tolist())
+            np.testing.assert_array_equal(start[1:], v_min[1:, 0])
+            start, v_min, v_max = r.summary(20, 100, 300)  # from data
+            self.assertEqual(20, len(start))
+            np.testing.assert_array_equal(np.arange(100, 300, 10), v_min[:, 0])
+            np.testing.assert_array_equal(np.arange(109, 300, 10), v_max[:, 0])
+
+    def test_analysis(self):
+        station = validate({
+            'name': 'test_capture',
+            'tests': [{'fn': 'pytation.test.test_capture'}],
+            'devices': [],
+        })
+        context = Context(station)
+        context.station_run(count=1)
+        with AnalysisContext(context.path('output')) as analysis:
+            self.assertEqual(0, analysis.run())
@@ -0,0 +1,118 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the copy-on-write configuration.
+"""
+
+import unittest
+from pytation.config import ConfigView
+from pytation import pretty_json
+
+
+class TestConfigView(unittest.TestCase):
+
+    def setUp(self):
+        self.table = list(range(1000))
+        self.base = {'a': 1, 'b': 'str', 'table': self.table, 'nested': {'x': [1, 2], 'y': 2}}
+        self.c = ConfigView(self.base)
+
+    def test_read_shares_immutable(self):
+        self.assertEqual(1, self.c['a'])
+        self.assertEqual(4, len(self.c))
+        self.assertEqual(['a', 'b', 'table', 'nested'], list(self.c))
+        self.assertEqual(set(), self.c.modified)
+        self.assertIs(self.table, self.c.snapshot()['table'])
+
+    def test_modify_does_not_change_base(self):
+        self.c['a'] = 2
+        self.c['table'].append(1000)
+        self.c['nested']['x'].append(3)
+        self.c['new'] = 'value'
+        self.assertEqual(1, self.base['a'])
+        self.assertEqual(1000, len(self.table))
+        self.assertEqual([1, 2], self.base['nested']['x'])
+        self.assertEqual({'a', 'table', 'nested', 'new'}, self.c.modified)
+        self.assertEqual(1001, len(self.c['table']))
+        self.assertEqual([1, 2, 3], self.c.snapshot()['nested']['x'])
+
+    def test_read_copy_is_not_modified(self):
+        self.c['table']
+        self.c['nested']['y']
+        self.assertEqual(set(), self.c.modified)
+
+    def test_delete(self):
+        del self.c['a']
+        self.assertNotIn('a', self.c)
+        self.assertEqual(3, len(self.c))
+        self.assertIn('a', self.base)
+        with self.assertRaises(KeyError):
+            self.c['a']
+        with self.assertRaises(KeyError):
+            del self.c['a']
+        self.c['a'] = 5
+        self.assertEqual(5, self.c['a'])
+
+    def test_setdefault_and_get(self):
+        self.assertEqual(1, self.c.setdefault('a', 2))
+        self.assertEqual(3, self.c.setdefault('c', 3))
+        self.assertIsNone(self.c.get('missing'))
+
+    def test_pretty_json(self):
+        self.c['a'] = 2
+        s = pretty_json.dumps(self.c.snapshot())
+        self.assertEqual(2, pretty_json.loads(s)['a'])
+
+    def test_ndarray_read_only(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest('numpy not available')
+        a = np.arange(10)
+        c = ConfigView({'a': a})
+        with self.assertRaises(ValueError):
+            c['a'][0] = 5
+        self.assertTrue(a.flags.writeable)
+        self.assertEqual(set(), c.modified)
+        c['a'] = a * 2
+        self.assertEqual({'a'}, c.modified)
+
+    def test_list_copy_on_write(self):
+        base = {'items': [[1, 2], {'k': 1}, 3]}
+        c = ConfigView(base)
+        items = c['items']
+        self.assertEqual(3, len(items))
+        self.assertEqual([1, 2], items[0])
+        self.assertEqual(3, items[-1])
+        self.assertEqual(set(), c.modified)
+        self.assertIs(base['items'], c.snapshot()['items'])  # read without copying
+        items[1]['k'] = 2
+        self.assertEqual({'items'}, c.modified)
+        self.assertEqual({'k': 1}, base['items'][1])
+        items.append(4)
+        items[0].append(3)
+        self.assertEqual([[1, 2], {'k': 1}, 3], base['items'])
+        self.assertEqual([[1, 2, 3], {'k': 2}, 3, 4], c.snapshot()['items'])
+
+    def test_list_ndarray_modified(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest('numpy not available')
+        c = ConfigView({'a': [np.arange(10), (np.zeros(2), 'x')]})
+        self.assertEqual(10, len(c['a'][0]))
+        self.assertEqual('x', c['a'][1][1])
+        self.assertEqual(set(), c.modified)
+        c['a'][1] = (np.ones(2), 'x')
+        self.assertEqual({'a'}, c.modified)
@@ -18,6 +18,11 @@ Test the Context class.
 
 import unittest
 from unittest.mock import Mock
+import json
+import logging
+import os
+import threading
+import zipfile
 from pytation import Context, declare_test
 from pytation.loader import validate
 
@@ -149,3 +154,154 @@ class TestContext(unittest.TestCase):
         context.callback_register('state', cbk)
         context.station_run(count=1)
         cbk.assert_called_once()
+
+    def test_pipeline(self):
+        next_suite = threading.Event()
+        done = []
+
+        def suite_done(context, path, tests):
+            # blocks the pipeline until the next suite runs test1
+            done.append([next_suite.wait(5.0), threading.current_thread().name, os.path.isfile(path), tests,
+                         context.path('output')])
+            logging.getLogger('pytation.test').info('suite_done %s', path)
+
+        station = self._station1('test_pipeline', skip_validate=True)
+        station['pipeline'] = True
+        station['handlers'] = {'suite_done': suite_done}
+        station = validate(station)
+        self.assertEqual(1, station['pipeline'])
+        self.test1.side_effect = lambda context: next_suite.set() if self.test1.call_count > 1 else None
+        context = Context(station)
+        context.station_run(count=2)
+        self.assertEqual(2, len(done))
+        self.assertTrue(done[0][0])
+        self.assertTrue(done[0][1].startswith('pytation_pipeline'))
+        self.assertTrue(done[0][2])
+        self.assertEqual(['test1', 'test2'], [t['name'] for t in done[0][3]])
+        paths = [d[4] for d in done]
+        self.assertNotEqual(paths[0], paths[1])  # the environment of the finalized suite
+        with zipfile.ZipFile(paths[1]) as z:
+            self.assertNotIn(f'suite_done {paths[0]}', z.read('log.txt').decode('utf-8'))
+        with open(context.path('log'), 'rt') as f:
+            lines = [line for line in f if f'suite_done {paths[0]}' in line]
+        self.assertIn('[suite ', lines[0])
+
+    def test_pipeline_disabled(self):
+        threads = []
+        station = self._station1('test_pipeline_disabled', skip_validate=True)
+        station['handlers'] = {'suite_done': lambda c, p, t: threads.append(threading.current_thread())}
+        context = Context(validate(station))
+        context.station_run(count=1)
+        self.assertEqual([threading.current_thread()], threads)
+
+    def _station_concurrent(self, name, barrier):
+        calls = []
+
+        def fn(context):
+            name = context.section_name.split('.')[-1]
+            calls.append(name)
+            logging.getLogger('pytation.test').info('running %s', name)
+            if name in ['a', 'b']:
+                barrier.wait()  # proves a and b run at the same time
+            return context.config.get('rc', 0)
+
+        station = {
+            'name': name,
+            'concurrency': 4,
+            'env': {'error_count_to_halt': 10},
+            'tests': [
+                {'name': 'a', 'fn': fn, 'devices': ['eq1']},
+                {'name': 'b', 'fn': fn, 'devices': ['eq2']},
+                {'name': 'c', 'fn': fn, 'devices': ['eq1'], 'depends': ['a']},
+                {'name': 'd', 'fn': fn, 'devices': ['eq1', 'eq2'], 'depends': 'c'},
+            ],
+            'devices': [
+                {'name': 'eq1', 'clz': Mock(['setup', 'restore', 'teardown'])},
+                {'name': 'eq2', 'clz': Mock(['setup', 'restore', 'teardown'])},
+            ],
+        }
+        return station, calls
+
+    def test_concurrent(self):
+        barrier = threading.Barrier(2, timeout=5.0)
+        station, calls = self._station_concurrent('test_concurrent', barrier)
+        context = Context(validate(station))
+        context.station_run(count=1)
+        self.assertFalse(barrier.broken)
+        self.assertEqual(['c', 'd'], calls[2:])
+        with zipfile.ZipFile(context.path('output')) as z:
+            tests = json.loads(z.read('tests.json'))
+            log_a = z.read('a/log.txt').decode('utf-8')
+        self.assertEqual(['a', 'b', 'c', 'd'], [t['name'] for t in tests])
+        self.assertIn('running a', log_a)
+        self.assertNotIn('running b', log_a)
+
+    def test_concurrent_timeout_log(self):
+        barrier = threading.Barrier(2, timeout=5.0)
+        station, calls = self._station_concurrent('test_concurrent_timeout_log', barrier)
+        station['timeouts'] = {'test': 10.0}  # runs each test on a guard thread
+        context = Context(validate(station))
+        context.station_run(count=1)
+        with zipfile.ZipFile(context.path('output')) as z:
+            log_a = z.read('a/log.txt').decode('utf-8')
+        self.assertIn('running a', log_a)
+        self.assertNotIn('running b', log_a)
+
+    def test_concurrent_dependency_failed(self):
+        barrier = threading.Barrier(2, timeout=5.0)
+        station, calls = self._station_concurrent('test_concurrent_dependency_failed', barrier)
+        station['tests'][0]['config'] = {'rc': 1}
+        context = Context(validate(station))
+        context.station_run(count=1)
+        self.assertEqual(['a', 'b'], sorted(calls))
+
+    def test_concurrent_device_held(self):
+        calls = []
+
+        def suite_setup(context):
+            lease = context.device_lease(['eq1'])  # held beyond the setup
+            threading.Timer(0.1, lease.release).start()
+            return 0
+
+        def fn(context):
+            calls.append(context.section_name.split('.')[-1])
+            return 0
+
+        station = {
+            'name': 'test_concurrent_device_held',
+            'concurrency': 2,
+            'suite_setup': {'fn': suite_setup},
+            'tests': [
+                {'name': 'a', 'fn': fn, 'devices': ['eq1']},
+                {'name': 'b', 'fn': fn, 'devices': ['eq1']},
+            ],
+            'devices': [{'name': 'eq1', 'clz': Mock(['setup', 'restore', 'teardown'])}],
+        }
+        context = Context(validate(station))
+        context.station_run(count=1)
+        self.assertEqual(['a', 'b'], calls)
+        with zipfile.ZipFile(context.path('output')) as z:
+            tests = json.loads(z.read('tests.json'))
+        self.assertEqual(['suite_setup', 'a', 'b'], [t['name'] for t in tests])
+
+    def test_depends_invalid(self):
+        station = self._station1('test_depends_invalid', skip_validate=True)
+        station['tests'][0]['depends'] = ['test2']
+        with self.assertRaises(ValueError):
+            validate(station)
+
+    def test_device_lease(self):
+        leases = []
+
+        def fn(context):
+            leases.append(context.device_lease(['eq1', 'dut'], timeout=0))
+            leases[-1].release()
+            return 0
+
+        station = self._station1('test_device_lease', skip_validate=True)
+        station['tests'][0]['fn'] = fn
+        station['tests'][0]['devices'] = ['eq1']
+        context = Context(validate(station))
+        context.station_run(count=1)
+        self.assertEqual({'dut'}, leases[0].devices)  # eq1 already held by the test
+        self.assertEqual(2, context.device_stats()['eq1']['leases'])  # test1 and test2
@@ -0,0 +1,85 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the binary detail storage.
+"""
+
+import unittest
+import json
+import tempfile
+import zipfile
+from pytation import detail, Context, AnalysisContext
+from pytation.loader import validate
+from fs.memoryfs import MemoryFS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def run(context):
+    return 0, {'samples': np.arange(10000, dtype=np.float32), 'small': np.arange(4), 'value': 1}
+
+
+def analyze(context):
+    samples = context.details['samples']
+    if not isinstance(samples, np.ndarray) or len(samples) != 10000:
+        return 1
+    if context.details['small'] != [0, 1, 2, 3] or context.details['value'] != 1:
+        return 1
+    return 0
+
+
+@unittest.skipIf(np is None, 'numpy not available')
+class TestDetail(unittest.TestCase):
+
+    def test_store_and_load(self):
+        fs = MemoryFS()
+        fs.makedir('t')
+        d = {'a': np.arange(1000.0), 'b': {'c': np.ones(2000, dtype=np.uint8)}, 'd': np.arange(2), 'e': 'x'}
+        stored = detail.store(fs, 't', d, 1000)
+        self.assertEqual({detail.REF_KEY: 't/detail.a.npy', 'dtype': 'float64', 'shape': [1000]}, stored['a'])
+        self.assertTrue(detail.is_ref(stored['b']['c']))
+        self.assertIs(d['d'], stored['d'])
+        self.assertIsInstance(d['a'], np.ndarray)  # original unmodified
+        view = detail.DetailView(json.loads(json.dumps(stored, default=lambda x: x.tolist())), fs)
+        np.testing.assert_array_equal(d['a'], view['a'])
+        np.testing.assert_array_equal(d['b']['c'], view['b']['c'])
+        self.assertIs(view['a'], view['a'])
+        self.assertEqual('x', view['e'])
+
+    def test_store_unmodified(self):
+        d = {'a': 1, 'b': np.arange(2)}
+        self.assertIs(d, detail.store(MemoryFS(), 't', d))
+
+    def test_suite(self):
+        with tempfile.TemporaryDirectory() as base_path:
+            station = validate({
+                'name': 'test_detail',
+                'paths': {'base_path': base_path},
+                'tests': [{'fn': 'pytation.test.test_detail'}],
+                'devices': [],
+            })
+            context = Context(station)
+            context.station_run(count=1)
+            path = context.path('output')
+            with zipfile.ZipFile(path) as z:
+                self.assertIn('pytation.test.test_detail/detail.samples.npy', z.namelist())
+                tests = json.loads(z.read('tests.json'))
+            self.assertTrue(detail.is_ref(tests[0]['detail']['samples']))
+            self.assertEqual([0, 1, 2, 3], tests[0]['detail']['small'])
+            with AnalysisContext(path) as analysis:
+                self.assertEqual(0, analysis.run())
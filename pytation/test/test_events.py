@@ -0,0 +1,188 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the event bus.
+"""
+
+import unittest
+import logging
+import tempfile
+import threading
+from pytation import Context, events
+from pytation.events import EventBus
+from pytation.loader import validate
+
+
+class TestEventBus(unittest.TestCase):
+
+    def _blocked(self, bus, **kwargs):
+        """Subscribe with an asynchronous subscriber blocked until released."""
+        release = threading.Event()
+        received = []
+
+        def fn(event):
+            release.wait()
+            received.append(event)
+
+        sub = bus.subscribe(fn, **kwargs)
+        bus.publish(events.TEST_START, name='block')
+        for _ in range(500):  # wait for delivery to start
+            if not sub.queued:
+                break
+            release.wait(0.002)
+        return sub, release, received
+
+    def test_sync(self):
+        bus = EventBus()
+        received = []
+        self.assertIsNone(bus.publish(events.PROGRESS, progress=0.5))
+        sub = bus.subscribe(received.append, [events.PROGRESS], sync=True)
+        self.assertTrue(bus.has_subscribers(events.PROGRESS))
+        self.assertFalse(bus.has_subscribers(events.STATE))
+        self.assertEqual([sub], bus.subscriptions)
+        event = bus.publish(events.PROGRESS, progress=0.5)
+        bus.publish(events.STATE, state={'name': 'x'})
+        self.assertEqual([event], received)
+        self.assertEqual({'progress': 0.5}, received[0].data)
+        sub.close()
+        self.assertEqual([], bus.subscriptions)
+        bus.publish(events.PROGRESS, progress=0.75)
+        self.assertEqual(1, len(received))
+
+    def test_sync_exception(self):
+        bus = EventBus()
+
+        def fn(event):
+            raise RuntimeError('subscriber failure')
+
+        bus.subscribe(fn, sync=True)
+        logging.getLogger('pytation.events').disabled = True
+        try:
+            bus.publish(events.PROGRESS, progress=0.5)
+        finally:
+            logging.getLogger('pytation.events').disabled = False
+
+    def test_async_drop_oldest(self):
+        bus = EventBus()
+        sub, release, received = self._blocked(bus, queue_size=2)
+        for idx in range(4):
+            bus.publish(events.TEST_DONE, name=str(idx))
+        self.assertEqual(2, sub.dropped)
+        release.set()
+        self.assertTrue(bus.flush(timeout=5.0))
+        self.assertEqual(['block', '2', '3'], [e.data['name'] for e in received])
+        sub.close()
+
+    def test_async_drop_newest(self):
+        bus = EventBus()
+        sub, release, received = self._blocked(bus, queue_size=2, policy='drop_newest')
+        for idx in range(4):
+            bus.publish(events.TEST_DONE, name=str(idx))
+        release.set()
+        sub.close()  # delivers queued events
+        self.assertEqual(['block', '0', '1'], [e.data['name'] for e in received])
+
+    def test_async_coalesce(self):
+        bus = EventBus()
+        sub, release, received = self._blocked(bus, policy='coalesce')
+        for idx in range(10):
+            bus.publish(events.PROGRESS, progress=idx / 10)
+        bus.publish(events.TEST_DONE, name='a')
+        bus.publish(events.PROGRESS, progress=1.0)
+        release.set()
+        bus.flush(timeout=5.0)
+        self.assertEqual([events.TEST_START, events.PROGRESS, events.TEST_DONE],
+                         [e.type for e in received])
+        self.assertEqual(1.0, received[1].data['progress'])
+        self.assertEqual(10, sub.dropped)
+        bus.close()
+
+    def test_async_log_exception(self):
+        bus = EventBus()
+        handler = events.LogHandler(bus)
+        logger = logging.getLogger('pytation.events')
+        logger.addHandler(handler)
+        logger.propagate = False
+
+        def fn(event):
+            raise RuntimeError('subscriber failure')
+
+        sub = bus.subscribe(fn, [events.LOG])
+        try:
+            logger.warning('hello')
+            self.assertTrue(bus.flush(timeout=5.0))
+            self.assertEqual(1, sub.delivered)
+            self.assertEqual(0, sub.queued)
+        finally:
+            bus.close()
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            EventBus().subscribe(print, policy='invalid')
+
+
+class TestContextEvents(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_station_events(self):
+        class Device:
+            def setup(self, context):
+                pass
+
+            def restore(self):
+                pass
+
+            def teardown(self):
+                pass
+
+        def fn(context):
+            with context.section('inner'):
+                pass
+            return 3
+
+        station = validate({
+            'name': 'test_events',
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn, 'devices': ['dev']}],
+            'devices': [{'name': 'dev', 'clz': Device, 'lifecycle': 'test'}],
+        })
+        context = Context(station)
+        received = []
+        progress = []
+        context.events.subscribe(received.append)
+        context.callback_register('progress', progress.append)
+        context.station_run(count=1)
+        types = [e.type for e in received if e.type not in (events.LOG, events.PROGRESS, events.STATE)]
+        self.assertEqual([events.SUITE_START, events.SECTION_ENTER, events.TEST_START, events.DEVICE_OPEN,
+                          events.SECTION_ENTER, events.SECTION_ENTER, events.SECTION_EXIT, events.SECTION_EXIT,
+                          events.DEVICE_CLOSE, events.TEST_DONE, events.SECTION_EXIT, events.SUITE_DONE,
+                          events.ARCHIVE_WRITE], types)
+        test_done = [e for e in received if e.type == events.TEST_DONE][0]
+        self.assertEqual({'name': 'a', 'result': 3}, {k: test_done.data[k] for k in ['name', 'result']})
+        self.assertEqual('s.a.inner', [e for e in received if e.type == events.SECTION_EXIT][0].data['name'])
+        self.assertEqual(3, [e for e in received if e.type == events.SUITE_DONE][0].data['result'])
+        self.assertTrue(any([e.type == events.LOG for e in received]))
+        self.assertEqual(1.0, progress[-1])
+        count = len(progress)
+        context.callback_unregister('progress', progress.append)
+        context.events.publish(events.PROGRESS, progress=0.5)
+        self.assertEqual(count, len(progress))
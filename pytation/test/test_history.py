@@ -0,0 +1,161 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the result history.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import zipfile
+from pytation import Context
+from pytation.history import History, UnitIndex
+from pytation.loader import validate
+
+
+def _names(tests):
+    return [t['name'] for t in tests]
+
+
+class TestHistory(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tempdir.name, 'history.json')
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def _history(self):
+        h = History(self.path)
+        for _ in range(10):
+            h.update([
+                {'name': 'slow', 'result': 0, 'duration': 10.0},
+                {'name': 'flaky', 'result': 1, 'duration': 1.0},
+                {'name': 'fast', 'result': 0, 'duration': 0.1},
+            ])
+        return h
+
+    def test_update_and_save(self):
+        h = self._history()
+        self.assertGreater(h.p_fail('flaky'), 0.9)
+        self.assertLess(h.p_fail('fast'), 0.01)
+        self.assertAlmostEqual(10.0, h.duration('slow'))
+        h.save()
+        h = History(self.path)
+        self.assertIn('slow', h)
+        self.assertAlmostEqual(1.0, h.duration('flaky'))
+        self.assertEqual(1.0, h.duration('unknown'))
+
+    def test_order(self):
+        h = self._history()
+        tests = [{'name': 'slow'}, {'name': 'fast'}, {'name': 'flaky'}]
+        self.assertEqual(['flaky', 'fast', 'slow'], _names(h.order(tests)))
+
+    def test_order_constraints(self):
+        h = self._history()
+        tests = [{'name': 'slow'}, {'name': 'flaky', 'depends': ['slow']}, {'name': 'fast'}]
+        self.assertEqual(['fast', 'slow', 'flaky'], _names(h.order(tests)))
+        tests = [{'name': 'slow'}, {'name': 'fast', 'adaptive': False}, {'name': 'flaky'}]
+        self.assertEqual(['slow', 'fast', 'flaky'], _names(h.order(tests)))
+
+    def test_adaptive_suite(self):
+        calls = []
+
+        def fn(context):
+            name = context.section_name.split('.')[-1]
+            calls.append(name)
+            return 1 if name == 'b' else 0
+
+        station = validate({
+            'name': 'test_adaptive',
+            'adaptive': True,
+            'env': {'error_count_to_halt': 10},
+            'paths': {'history': self.path},
+            'tests': [{'name': 'a', 'fn': fn}, {'name': 'b', 'fn': fn}, {'name': 'c', 'fn': fn}],
+            'devices': [],
+        })
+        Context(station).station_run(count=2)
+        self.assertEqual(['a', 'b', 'c', 'b'], calls[:4])  # failing test first
+        self.assertEqual(['a', 'c'], sorted(calls[4:]))
+        self.assertIn('b', History(self.path))
+
+    def _retest_station(self, calls, validity=None):
+        def sn(context):
+            context.env['serial_number'] = 'SN1'
+            calls.append('sn')
+
+        def fn(context):
+            name = context.section_name.split('.')[-1]
+            calls.append(name)
+            return 1 if name == 'b' and calls.count('b') == 1 else 0  # fail first time
+
+        return validate({
+            'name': 'test_retest',
+            'retest': {'validity': validity},
+            'env': {'error_count_to_halt': 10},
+            'paths': {'units': os.path.join(self._tempdir.name, 'units.json')},
+            'tests': [{'name': 'sn', 'fn': sn}, {'name': 'a', 'fn': fn}, {'name': 'b', 'fn': fn}],
+            'devices': [],
+        })
+
+    def test_retest(self):
+        calls = []
+        context = Context(self._retest_station(calls))
+        context.station_start()
+        try:
+            self.assertEqual(1, context.suite_run())
+            path1 = context.path('output')
+            self.assertEqual(0, context.suite_run())
+            path2 = context.path('output')
+        finally:
+            context.station_stop()
+        self.assertEqual(['sn', 'a', 'b', 'sn', 'b'], calls)
+        with zipfile.ZipFile(path2) as z:
+            tests = json.loads(z.read('tests.json'))
+        self.assertEqual(['sn', 'a', 'b'], [t['name'] for t in tests])
+        self.assertEqual(path1, tests[1]['reused']['path'])
+        units = UnitIndex(os.path.join(self._tempdir.name, 'units.json'))
+        self.assertEqual(path1, units.lookup('SN1', 'a')['path'])
+        self.assertEqual(0, units.lookup('SN1', 'b')['result'])
+
+    def test_unit_index_prune(self):
+        units = UnitIndex(os.path.join(self._tempdir.name, 'units.json'))
+        units.update('SN1', 'p1', [{'name': 'a', 'result': 0}, {'name': 'b', 'result': 0}], 10.0)
+        units.update('SN2', 'p2', [{'name': 'a', 'result': 0}], 20.0)
+        units.update('SN1', 'p3', [{'name': 'b', 'result': 0}], 30.0)
+        self.assertEqual(0, units.prune(t_min=15.0))
+        self.assertIsNone(units.lookup('SN1', 'a'))
+        self.assertEqual('p3', units.lookup('SN1', 'b')['path'])
+        self.assertEqual(1, units.prune(count_max=1))
+        self.assertNotIn('SN2', units)  # least recently updated
+        self.assertIn('SN1', units)
+        self.assertEqual(1, units.prune(t_min=40.0))
+        self.assertNotIn('SN1', units)
+
+    def test_retest_units_max(self):
+        calls = []
+        station = self._retest_station(calls)
+        station['retest']['units_max'] = 0
+        Context(station).station_run(count=2)
+        self.assertEqual(['sn', 'a', 'b', 'sn', 'a', 'b'], calls)
+        units = UnitIndex(os.path.join(self._tempdir.name, 'units.json'))
+        self.assertNotIn('SN1', units)
+
+    def test_retest_expired(self):
+        calls = []
+        Context(self._retest_station(calls, validity=1e-9)).station_run(count=2)
+        self.assertEqual(['sn', 'a', 'b', 'sn', 'a', 'b'], calls)
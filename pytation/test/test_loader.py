@@ -13,10 +13,14 @@
 # limitations under the License.
 
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from pytation import loader
 from pytation import declare_test, Context
 import argparse
+import os
+import pickle
+import sys
+import tempfile
 
 
 @declare_test(['dut'])
@@ -156,3 +160,149 @@ class TestValidator(unittest.TestCase):
             'devices': [],
         }
         station = loader.validate(station)
+
+
+class TestLazy(unittest.TestCase):
+
+    def _station(self, lazy=True):
+        sys.modules.pop('pytation.test.tlazy', None)
+        return {
+            'name': 'station_lazy',
+            'lazy': lazy,
+            'tests': [{'name': 'run_fn', 'fn': 'pytation.test.tlazy.run_fn'},
+                      {'name': 'tmodule', 'fn': 'pytation.test.tmodule'}],
+            'devices': [{'name': 'lazy_device', 'clz': 'pytation.test.tlazy.Device'}],
+            'handlers': {'h': 'pytation.test.tlazy.handler'},
+        }
+
+    def test_lazy_ref(self):
+        ref = loader.LazyRef('pytation.test.tmodule')
+        self.assertIsNone(ref.attr_name)
+        self.assertEqual('pytation.test.tmodule', ref.default_name)
+        ref = loader.LazyRef('pytation.test.tmodule.run')
+        self.assertEqual('run', ref.default_name)
+        self.assertEqual((0, {'hello': 'world'}), ref(None))
+
+    def test_lazy_ref_invalid(self):
+        with self.assertRaises(ModuleNotFoundError):
+            loader.LazyRef('pytation.__invalid__.fn')
+        with self.assertRaises(ModuleNotFoundError):
+            loader.LazyRef('__invalid__')
+
+    def test_validate_defers_import(self):
+        station = loader.validate(self._station())
+        self.assertNotIn('pytation.test.tlazy', sys.modules)
+        self.assertEqual(['run_fn', 'tmodule'], [t['name'] for t in station['tests']])
+        self.assertEqual(['lazy_device'], list(station['devices'].keys()))
+        self.assertEqual(42, station['handlers']['h'](None, 42))
+        self.assertIn('pytation.test.tlazy', sys.modules)
+
+    def test_names_match_eager(self):
+        lazy = loader.validate(self._station())
+        eager = loader.validate(self._station(lazy=False))
+        self.assertEqual([t['name'] for t in eager['tests']], [t['name'] for t in lazy['tests']])
+        self.assertEqual(list(eager['devices'].keys()), list(lazy['devices'].keys()))
+
+    def test_name_required(self):
+        station = self._station()
+        del station['tests'][1]['name']
+        with self.assertRaises(ValueError):
+            loader.validate(station)
+
+    def test_run_resolves_devices(self):
+        station = loader.validate(self._station())
+        station['devices']['lazy_device']['lifecycle'] = 'test'
+        context = Context(station)
+        context.station_start()
+        self.assertEqual(0, context.suite_run())
+        self.assertEqual(['lazy_device'], station['tests'][0]['devices'])
+        context.station_stop()
+
+    def test_prewarm(self):
+        station = loader.validate(self._station())
+        thread = loader.prewarm(station)
+        thread.join()
+        self.assertTrue(station['tests'][0]['fn'].is_resolved)
+        self.assertIsNone(loader.prewarm(station))
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.path = self._tempdir.name
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def _args(self, *args):
+        p = argparse.ArgumentParser()
+        loader.parser_config(p)
+        return p.parse_args(['pytation_examples.simple.STATION', '--cache'] + list(args))
+
+    def test_cache_hit(self):
+        s1 = loader.load(self._args(), cache_path=self.path)
+        self.assertEqual(1, len(os.listdir(self.path)))
+        with patch.object(loader, 'validate') as validate:
+            s2 = loader.load(self._args(), cache_path=self.path)
+            validate.assert_not_called()
+        self.assertEqual([t['name'] for t in s1['tests']], [t['name'] for t in s2['tests']])
+        self.assertEqual(list(s1['devices'].keys()), list(s2['devices'].keys()))
+        self.assertEqual('simple', s2['env']['station'])
+        self.assertEqual(os.getpid(), s2['env']['process_id'])
+        self.assertIs(s1['tests'][1]['fn'], s2['tests'][1]['fn'])
+
+    def test_cache_include(self):
+        loader.load(self._args(), cache_path=self.path)
+        s = loader.load(self._args('--include', 'test1'), cache_path=self.path)
+        self.assertEqual(['test1'], [t['name'] for t in s['tests']])
+
+    def test_cache_invalidate_on_change(self):
+        loader.load(self._args(), cache_path=self.path)
+        cache_filename = os.path.join(self.path, os.listdir(self.path)[0])
+        with open(cache_filename, 'rb') as f:
+            key, deps = pickle.load(f)
+            station = pickle.load(f)
+        self.assertIn('simple', deps[0][0])
+        deps[0][1] -= 1  # modify mtime
+        with open(cache_filename, 'wb') as f:
+            pickle.dump((key, deps), f)
+            pickle.dump(station, f)
+        with patch.object(loader, 'validate', wraps=loader.validate) as validate:
+            loader.load(self._args(), cache_path=self.path)
+            validate.assert_called_once()
+
+    def test_cache_module_test(self):
+        station = loader.validate({
+            'name': 'station_cache',
+            'tests': [{'fn': 'pytation.test.tmodule'}],
+            'devices': [],
+        })
+        path = os.path.join(self.path, 'station_cache.pickle')
+        loader._cache_save(path, ['key'], 'pytation.test.test_loader', station)
+        s = loader._cache_load(path, ['key'], 'pytation.test.test_loader')
+        self.assertIsInstance(s['tests'][0]['fn'], loader.LazyRef)
+        self.assertEqual('pytation.test.tmodule', s['tests'][0]['name'])
+        self.assertIsNone(loader._cache_load(path, ['other'], 'pytation.test.test_loader'))
+
+    def test_cache_deps(self):
+        data_path = os.path.join(self.path, 'limits.json')
+        with open(data_path, 'wt') as f:
+            f.write('{}')
+        station = loader.validate({
+            'name': 'station_cache',
+            'cache_deps': [data_path],
+            'tests': [],
+            'devices': [],
+        })
+        path = os.path.join(self.path, 'station_cache.pickle')
+        loader._cache_save(path, ['key'], 'pytation.test.test_loader', station)
+        with open(path, 'rb') as f:
+            _, deps = pickle.load(f)
+        paths = [os.path.normpath(d[0]) for d in deps]
+        self.assertIn(os.path.normpath(loader.__file__), paths)  # imported by the station package
+        self.assertIn(data_path, paths)
+        self.assertIsNotNone(loader._cache_load(path, ['key'], 'pytation.test.test_loader'))
+        with open(data_path, 'wt') as f:
+            f.write('{"limit": 1}')
+        self.assertIsNone(loader._cache_load(path, ['key'], 'pytation.test.test_loader'))
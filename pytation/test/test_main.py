@@ -0,0 +1,52 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the command-line entry point startup.
+"""
+
+import unittest
+import json
+import subprocess
+import sys
+
+
+IMPORT_TIME_BUDGET = 0.5  # seconds, generous for slow CI hosts
+HEAVY_MODULES = ['PySide6', 'fs', 'pytation.context', 'pytation.analysis',
+                 'pytation.cli_runner', 'pytation.gui_runner', 'pytation.web_runner',
+                 'pytation.simulation', 'pytation.replay']
+_SCRIPT = f"""\\
+import json, sys, time
+t = time.perf_counter()
+from pytation.__main__ import get_parser
+parser = get_parser()
+parser.parse_args(['analyze', 'path.zip'])
+t = time.perf_counter() - t
+print(json.dumps({{'time': t, 'modules': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+class TestMain(unittest.TestCase):
+
+    def test_parser_import_budget(self):
+        rv = subprocess.run([sys.executable, '-c', _SCRIPT], capture_output=True, text=True, check=True)
+        result = json.loads(rv.stdout)
+        self.assertEqual([], result['modules'])
+        self.assertLess(result['time'], IMPORT_TIME_BUDGET)
+
+    def test_lazy_package_attributes(self):
+        import pytation
+        self.assertIs(pytation.Context, sys.modules['pytation.context'].Context)
+        with self.assertRaises(AttributeError):
+            pytation.__invalid__
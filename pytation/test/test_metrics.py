@@ -0,0 +1,138 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the metrics registry and exporter.
+"""
+
+import unittest
+import os
+import tempfile
+import urllib.request
+from pytation import Context
+from pytation.loader import validate
+from pytation.metrics import MetricsServer, Registry
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_counter(self):
+        r = Registry()
+        c = r.counter('x_total', 'The "x" count.', ['result'])
+        c.inc(result='pass')
+        c.inc(2, result='fail')
+        self.assertIs(c, r.counter('x_total', 'ignored', ['result']))
+        self.assertEqual(2, c.value(result='fail'))
+        with self.assertRaises(ValueError):
+            c.inc(-1, result='pass')
+        with self.assertRaises(ValueError):
+            c.inc(other='pass')
+        with self.assertRaises(ValueError):
+            r.gauge('x_total', 'conflict')
+        text = r.render()
+        self.assertIn('# HELP x_total The \\"x\\" count.\n', text)
+        self.assertIn('# TYPE x_total counter\n', text)
+        self.assertIn('x_total{result="fail"} 2.0\n', text)
+        self.assertIn('x_total{result="pass"} 1.0\n', text)
+
+    def test_gauge(self):
+        r = Registry()
+        g = r.gauge('depth', 'Queue depth.', ['queue'])
+        g.set(3, queue='a')
+        g.dec(queue='a')
+        g.set_function(lambda: 7, queue='b')
+        self.assertEqual(2, g.value(queue='a'))
+        self.assertEqual(7, g.value(queue='b'))
+        self.assertIn('depth{queue="b"} 7.0\n', r.render())
+
+    def test_histogram(self):
+        r = Registry()
+        h = r.histogram('duration_seconds', 'Duration.', buckets=[0.1, 1.0])
+        for value in [0.05, 0.5, 0.5, 5.0]:
+            h.observe(value)
+        self.assertEqual((4, 6.05), h.value())
+        text = r.render()
+        self.assertIn('duration_seconds_bucket{le="0.1"} 1.0\n', text)
+        self.assertIn('duration_seconds_bucket{le="1.0"} 3.0\n', text)
+        self.assertIn('duration_seconds_bucket{le="+Inf"} 4.0\n', text)
+        self.assertIn('duration_seconds_count 4.0\n', text)
+
+    def test_server(self):
+        r = Registry()
+        r.counter('x_total', 'The x count.').inc()
+        server = MetricsServer(r)
+        try:
+            host, port = server.address
+            with urllib.request.urlopen(f'http://{host}:{port}/metrics', timeout=5.0) as f:
+                self.assertTrue(f.headers['Content-Type'].startswith('text/plain'))
+                self.assertIn('x_total 1.0\n', f.read().decode('utf-8'))
+        finally:
+            server.close()
+
+
+class TestStationMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_station(self):
+        class Device:
+            def setup(self, context):
+                pass
+
+            def restore(self):
+                pass
+
+            def teardown(self):
+                pass
+
+        def fn(context):
+            return 1 if context.section_name.endswith('b') else 0
+
+        scraped = []
+
+        def suite_teardown(context):
+            host, port = context.metrics_address
+            with urllib.request.urlopen(f'http://{host}:{port}/metrics', timeout=5.0) as f:
+                scraped.append(f.read().decode('utf-8'))
+
+        station = validate({
+            'name': 'test_metrics',
+            'metrics': {'port': 0},
+            'env': {'error_count_to_halt': 10},
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn}, {'name': 'b', 'fn': fn}],
+            'devices': [{'name': 'dev', 'clz': Device}],
+            'suite_teardown': {'fn': suite_teardown},
+        })
+        context = Context(station)
+        context.station_run(count=2)
+        self.assertIn('pytation_tests_total{test="b",result="fail"} 1.0\n', scraped[0])
+        self.assertNotIn('test="suite_teardown"', scraped[1])  # hooks are not tests
+        r = context.metrics
+        self.assertEqual(2, r['pytation_units_total'].value(result='fail'))
+        self.assertEqual(2, r['pytation_tests_total'].value(test='a', result='pass'))
+        self.assertEqual(2, r['pytation_test_duration_seconds'].value(test='b')[0])
+        self.assertEqual(2, r['pytation_section_duration_seconds'].value(section='s.a')[0])
+        self.assertEqual(2, r['pytation_archive_write_seconds'].value()[0])
+        self.assertEqual(1, r['pytation_device_operation_seconds'].value(device='dev', operation='open')[0])
+        self.assertGreaterEqual(r['pytation_device_operation_seconds'].value(device='dev', operation='restore')[0], 4)
+        self.assertEqual(0, r['pytation_queue_depth'].value(queue='pipeline'))
+        self.assertIsNone(context.metrics_address)
+        path = os.path.join(self._tempdir.name, 'test_metrics', 'metrics.prom')
+        with open(path, 'rt') as f:
+            self.assertIn('pytation_units_total{result="fail"} 2.0\n', f.read())
@@ -0,0 +1,233 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the operator time accounting.
+"""
+
+import unittest
+import argparse
+import contextlib
+import datetime
+import io
+import glob
+import json
+import os
+import tempfile
+import zipfile
+from pytation import Context
+from pytation.analysis import AnalysisContext
+from pytation.loader import validate
+from pytation import operator_time
+from pytation import time as pt
+from pytation.entry_points import operator_time as operator_cmd
+
+
+def _t(day, hour, minute=0):
+    return datetime.datetime(2026, 10, day, hour, minute).timestamp()
+
+
+def _record(t, duration=60.0, idle=10.0, wait=5.0, prompt=2.0, result=0):
+    return {'time': t, 'suite_duration': duration, 'idle': idle, 'result': result,
+            'wait': {'count': 1, 'total': wait, 'max': wait},
+            'prompt': {'count': 1, 'total': prompt, 'max': prompt}}
+
+
+SHIFT_STATION = {
+    'name': 'test_shifts',
+    'operator': {'shifts': [{'name': 'day', 'start': '06:00'}, {'name': 'night', 'start': '18:00'}]},
+    'tests': [],
+    'devices': [],
+}
+
+
+class TestOperatorTime(unittest.TestCase):
+
+    def test_record(self):
+        o = operator_time.OperatorTime()
+        self.assertIsNone(o.record('wait', 1.0, 2.0))
+        self.assertIsNone(o.suite_start(100.0))
+        self.assertEqual(3.0, o.record('wait', 101.0, 104.0, 's.a'))
+        self.assertEqual(1.5, o.record('prompt', 105.0, 106.5, 's.b', 'serial'))
+        self.assertEqual(2.0, o.record('wait', 108.0, 110.0, 's.b'))
+        summary = o.suite_stop(120.0)
+        self.assertIsNone(summary['idle'])
+        self.assertEqual(20.0, summary['suite_duration'])
+        self.assertEqual({'count': 2, 'total': 5.0, 'max': 3.0}, summary['wait'])
+        self.assertEqual(6.5, summary['operator'])
+        self.assertEqual(13.5, summary['machine'])
+        self.assertEqual('serial', summary['events'][1]['prompt'])
+        self.assertEqual(15.0, o.suite_start(135.0))
+        self.assertEqual(15.0, o.suite_stop(140.0)['idle'])
+
+    def test_parse_progress(self):
+        txt = ("# comment\n"
+               "0.000,s,0.0\n"
+               "1.000,s.a,'__wait_enter__ wait_for_user'\n"
+               "4.000,s.a,'__wait_exit__ wait_for_user'\n"
+               "5.000,s.b,'__prompt_enter__ prompt(serial)'\n"
+               "7.500,s.b,'__prompt_exit__ prompt(serial)'\n"
+               "9.000,s,1.0\n")
+        summary = operator_time.parse_progress(txt)
+        self.assertEqual(9.0, summary['suite_duration'])
+        self.assertEqual(3.0, summary['wait']['total'])
+        self.assertEqual(2.5, summary['prompt']['total'])
+        self.assertEqual('serial', summary['events'][1]['prompt'])
+
+    def test_parse_progress_quotes(self):
+        p = 'prompt(unit\'s "serial", 1)'
+        txt = ''.join(['%.3f,%s,%r\n' % (t, 's.a', value) for t, value in [
+            (1.0, '__prompt_enter__ ' + p), (3.0, '__prompt_exit__ ' + p), (4.0, 1.0)]])
+        summary = operator_time.parse_progress(txt)
+        self.assertEqual(2.0, summary['prompt']['total'])
+        self.assertEqual('unit\'s "serial", 1', summary['events'][0]['prompt'])
+
+    def test_shifts(self):
+        shifts = operator_time.shifts_validate([{'name': 'night', 'start': '22:00'},
+                                                {'name': 'day', 'start': '06:00'}])
+        self.assertEqual([(360, 'day'), (1320, 'night')], shifts)
+        self.assertEqual(('2026-10-05', 'day'), operator_time.shift_key(_t(5, 12), shifts))
+        self.assertEqual(('2026-10-05', 'night'), operator_time.shift_key(_t(5, 23), shifts))
+        self.assertEqual(('2026-10-05', 'night'), operator_time.shift_key(_t(6, 2), shifts))
+        self.assertEqual(('2026-10-06', 'day'), operator_time.shift_key(_t(6, 2), []))
+        with self.assertRaises(ValueError):
+            operator_time.shifts_validate([{'name': 'a', 'start': '25:00'}])
+        with self.assertRaises(ValueError):
+            operator_time.shifts_validate([{'name': 'a', 'start': '06:00'}, {'name': 'b', 'start': '06:00'}])
+
+    def test_aggregate(self):
+        records = [_record(_t(5, 8)), _record(_t(5, 9), result=1), _record(_t(5, 23), idle=None)]
+        rows = operator_time.aggregate(records, [{'name': 'day', 'start': '06:00'},
+                                                 {'name': 'night', 'start': '18:00'}])
+        self.assertEqual(['day', 'night'], [r['shift'] for r in rows])
+        day = rows[0]
+        self.assertEqual(2, day['units'])
+        self.assertEqual(1, day['fail'])
+        self.assertEqual(3660.0, day['span'])
+        self.assertEqual(10.0, day['idle_total'])
+        self.assertEqual(10.0, day['wait_total'])
+        self.assertAlmostEqual(24.0 / 3660.0, day['operator_fraction'])
+        self.assertEqual(1, rows[1]['units'])
+        text = operator_time.report(rows)
+        self.assertIn('night', text)
+        self.assertEqual(3, len(text.split('\n')))
+
+    def test_shift_log(self):
+        with tempfile.TemporaryDirectory() as d:
+            log = operator_time.ShiftLog(os.path.join(d, 'sub', 'operator.jsonl'))
+            self.assertEqual([], log.load())
+            log.append(dict(_record(1.0), events=[{'kind': 'wait'}]))
+            with open(log.path, 'at') as f:
+                f.write('invalid\n')
+            log.append(_record(2.0))
+            records = log.load()
+            self.assertEqual([1.0, 2.0], [r['time'] for r in records])
+            self.assertNotIn('events', records[0])
+
+    def _report(self, path, shift=None, station=None):
+        args = argparse.Namespace(path=path, shift=shift, station=station)
+        f = io.StringIO()
+        with contextlib.redirect_stdout(f):
+            self.assertEqual(0, operator_cmd.on_cmd(args))
+        return f.getvalue()
+
+    def test_command_station_shifts(self):
+        with tempfile.TemporaryDirectory() as d:
+            log = operator_time.ShiftLog(os.path.join(d, 'operator.jsonl'))
+            log.append(_record(_t(5, 8)))
+            log.append(_record(_t(5, 23)))
+            self.assertNotIn('night', self._report(log.path))
+            text = self._report(log.path, station=__name__ + '.SHIFT_STATION')
+            self.assertIn('night', text)
+            text = self._report(log.path, station=__name__ + '.SHIFT_STATION', shift=[{'name': 'x', 'start': '00:00'}])
+            self.assertNotIn('night', text)
+
+
+class TestContextOperatorTime(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_station(self):
+        def fn(context):
+            context.wait_for_user()
+            return 0 if context.prompt('serial') == '1234' else 1
+
+        station = validate({
+            'name': 'test_operator',
+            'operator': {'shifts': [{'name': 'day', 'start': '00:00'}]},
+            'metrics': True,
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn}],
+            'devices': [],
+        })
+        context = Context(station)
+        context.callback_register('wait_for_user', lambda: None)
+        context.callback_register('prompt', lambda s: '1234')
+        kinds = []
+        context.events.subscribe(lambda e: kinds.append(e.data['kind']), types=['operator'], sync=True)
+        context.station_run(count=2)
+        self.assertEqual(['wait', 'prompt', 'idle', 'wait', 'prompt'], kinds)
+        self.assertEqual(1, context.metrics['pytation_operator_seconds'].value(kind='idle')[0])
+
+        paths = sorted(glob.glob(os.path.join(self._tempdir.name, 'test_operator', 'data', '*.zip')))
+        self.assertEqual(2, len(paths))
+        with zipfile.ZipFile(paths[0]) as z:
+            summary = json.loads(z.read('operator.json'))
+        self.assertEqual(1, summary['wait']['count'])
+        self.assertEqual('s.a', summary['events'][0]['section'])
+        self.assertEqual('serial', summary['events'][1]['prompt'])
+
+        with AnalysisContext(paths[0]) as analysis:
+            self.assertEqual(summary, analysis.operator)
+
+        records = operator_time.ShiftLog(os.path.join(self._tempdir.name, 'test_operator', 'operator.jsonl')).load()
+        self.assertEqual(2, len(records))
+        self.assertIsNone(records[0]['idle'])
+        self.assertEqual(paths[1], os.path.normpath(records[1]['path']))
+        self.assertEqual(0, records[1]['result'])
+
+    def test_suite_setup(self):
+        def suite_setup(context):
+            context.wait_for_user()
+            return 0
+
+        station = validate({
+            'name': 'test_operator',
+            'operator': True,
+            'paths': {'base_path': self._tempdir.name},
+            'suite_setup': {'fn': suite_setup},
+            'tests': [{'name': 'a', 'fn': lambda context: 0}],
+            'devices': [],
+        })
+        context = Context(station)
+        context.callback_register('wait_for_user', lambda: pt.advance(5.0))
+        with pt.virtual():
+            context.station_run(count=2)
+        records = operator_time.ShiftLog(os.path.join(self._tempdir.name, 'test_operator', 'operator.jsonl')).load()
+        self.assertEqual([1, 1], [r['wait']['count'] for r in records])
+        self.assertGreaterEqual(records[1]['wait']['total'], 5.0)
+        self.assertLess(records[1]['idle'], 5.0)
+
+    def test_validate(self):
+        station = {'name': 'x', 'tests': [], 'devices': []}
+        self.assertIsNone(validate(station)['operator'])
+        self.assertEqual({'shifts': None}, validate(dict(station, operator=True))['operator'])
+        with self.assertRaises(ValueError):
+            validate(dict(station, operator={'invalid': 1}))
+        with self.assertRaises(ValueError):
+            validate(dict(station, operator={'shifts': [{'name': 'a', 'start': '6'}]}))
@@ -5,7 +5,10 @@ Test the pretty JSON module
 """
 
 import unittest
+import io
 import json
+from pytation import pretty_json
+from pytation.config import ConfigView
 from pytation.pretty_json import dumps
 
 
@@ -27,6 +30,17 @@ OBJ2_EXPECT = """\
 }\
 """
 
+OBJ_NUMPY_EXPECT = """\
+{
+  "a": [ 0, 1, 2 ],
+  "b": 1.5,
+  "c": [
+    [ 0, 1 ],
+    [ 2, 3 ]
+  ]
+}\
+"""
+
 
 class TestPrettyJson(unittest.TestCase):
 
@@ -43,3 +57,41 @@ class TestPrettyJson(unittest.TestCase):
     def test_nested_list(self):
         s2 = dumps(OBJ2)
         self.assertEqual(OBJ2_EXPECT, s2)
+
+    def test_matches_original(self):
+        obj = {
+            'a': [], 'b': {}, 'c': [[], [1, 'x', None], {'d': True}],
+            'e': [1.5, float('nan'), 'a\nb', object()], 'f': (1, 2), 3: 'int_key',
+        }
+        self.assertEqual(pretty_json._dumps_regex(obj), dumps(obj))
+        self.assertEqual(pretty_json._dumps_regex(obj, indent=4), dumps(obj, indent=4))
+
+    def test_string_with_brackets(self):
+        self.assertEqual('{\n  "a": [ "x[1]", "{y}" ]\n}', dumps({'a': ['x[1]', '{y}']}))
+
+    def test_dump_stream(self):
+        obj = {'a': list(range(100000)), 'b': [[1, 2], [3, 4]]}
+        f = io.StringIO()
+        pretty_json.dump(obj, f)
+        self.assertEqual(dumps(obj), f.getvalue())
+        self.assertEqual(obj, json.loads(f.getvalue()))
+
+    def test_unsupported_kwargs_fallback(self):
+        self.assertEqual('{"a": [1, 2]}', dumps({'a': [1, 2]}, indent=None))
+        self.assertEqual('{\n  "a": [ 1, 2 ]\n}', dumps({'a': [1, 2]}, separators=(',', ': ')))
+
+    def test_numpy(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest('numpy not available')
+        obj = {'a': np.arange(3), 'b': np.float64(1.5), 'c': np.arange(4).reshape((2, 2))}
+        self.assertEqual(OBJ_NUMPY_EXPECT, dumps(obj))
+
+    def test_config_view(self):
+        obj = {'a': [1, [2, {'b': 'c'}]], 'd': {'e': [3, 4]}}
+        view = ConfigView(obj)
+        view['d']['e'].append(5)
+        expect = {'a': [1, [2, {'b': 'c'}]], 'd': {'e': [3, 4, 5]}}
+        self.assertEqual(dumps(expect), dumps(view))
+        self.assertEqual(expect, json.loads(dumps(view, indent=None)))
@@ -0,0 +1,185 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the device I/O record and replay.
+"""
+
+import unittest
+import glob
+import os
+import tempfile
+from pytation import Context
+from pytation.loader import validate
+from pytation.replay import FILENAME, Player, Replay, ReplayError, load
+
+
+class Meter:
+    """A device that must not be used during replay."""
+    hardware = True
+
+    def __init__(self):
+        self.range = 1.0
+        self.count = 0
+
+    def setup(self, context):
+        if not Meter.hardware:
+            raise RuntimeError('no hardware')
+
+    def restore(self):
+        pass
+
+    def teardown(self):
+        pass
+
+    def measure(self, channel, scale=1.0):
+        if not Meter.hardware:
+            raise RuntimeError('no hardware')
+        self.count += 1
+        return (channel, self.count * scale * self.range)
+
+    def fault(self):
+        raise ValueError('overrange')
+
+
+def setup_fn(context):
+    context.env['serial_number'] = context.prompt('serial')
+
+
+def measure_fn(context):
+    meter = context.devices['meter']
+    meter.range = 2.0
+    value = meter.measure(1, scale=context.config.get('scale', 1.0))[1]
+    try:
+        meter.fault()
+    except ValueError:
+        pass
+    return 0 if value <= context.config['limit'] and meter.range == 2.0 else 1
+
+
+def other_fn(context):
+    context.devices['meter'].measure(2)
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        Meter.hardware = True
+
+    def tearDown(self):
+        Meter.hardware = True
+        self._tempdir.cleanup()
+
+    def _station(self, limit=3.0, record=True, handlers=None):
+        return validate({
+            'handlers': {} if handlers is None else handlers,
+            'name': 'test_replay',
+            'record': record,
+            'env': {'error_count_to_halt': 10},
+            'paths': {'base_path': self._tempdir.name},
+            'suite_setup': {'fn': setup_fn},
+            'tests': [
+                {'name': 'measure', 'fn': measure_fn, 'config': {'limit': limit}},
+                {'name': 'other', 'fn': other_fn},
+            ],
+            'devices': [{'name': 'meter', 'clz': Meter}],
+        })
+
+    def _record(self):
+        context = Context(self._station())
+        context.callback_register('prompt', lambda s: '1234')
+        context.station_run(count=1)
+        paths = glob.glob(os.path.join(self._tempdir.name, 'test_replay', 'data', '*.zip'))
+        self.assertEqual(1, len(paths))
+        return paths[0]
+
+    def test_record(self):
+        records = load(self._record())
+        calls = [(r['device'], r['section'], r['kind'], r['attr']) for r in records]
+        self.assertEqual([
+            ('__operator__', 'setup_fn', 'call', 'prompt'),
+            ('meter', 's.measure', 'set', 'range'),
+            ('meter', 's.measure', 'call', 'measure'),
+            ('meter', 's.measure', 'call', 'fault'),
+            ('meter', 's.measure', 'get', 'range'),
+            ('meter', 's.other', 'call', 'measure'),
+        ], calls)
+        self.assertIsNotNone(records[3]['error'])
+
+    def test_replay(self):
+        path = self._record()
+        Meter.hardware = False
+        r = Replay(path, strict=True)
+        results = r.run(self._station(record=False))
+        self.assertEqual([{'name': 'measure', 'result': 0, 'recorded': 0},
+                          {'name': 'other', 'result': 0, 'recorded': 0}], results)
+        self.assertEqual([], r.player.mismatches)
+        self.assertEqual(0, r.player.remaining())
+
+    def test_replay_subset_and_regression(self):
+        path = self._record()
+        Meter.hardware = False
+        r = Replay(path)
+        results = r.run(self._station(limit=1.0, record=False), tests=['measure'])
+        self.assertEqual([{'name': 'measure', 'result': 1, 'recorded': 0}], results)
+
+    def test_replay_handlers(self):
+        path = self._record()
+        Meter.hardware = False
+        suites = []
+        handlers = {'suite_done': lambda context, path, tests: suites.append(path)}
+        station = self._station(record=False, handlers=handlers)
+        r = Replay(path, strict=True)
+        self.assertEqual({}, r.station(station, self._tempdir.name)['handlers'])
+        results = r.run(station)
+        self.assertEqual([0, 0], [t['result'] for t in results])
+        self.assertEqual([], suites)
+
+    def test_replay_mismatch(self):
+        path = self._record()
+        Meter.hardware = False
+
+        def changed_fn(context):
+            context.devices['meter'].measure(3)
+
+        station = self._station(record=False)
+        station['tests'][1] = dict(station['tests'][1], fn=changed_fn)
+        r = Replay(path, strict=True)
+        results = r.run(station, tests=['other'])
+        self.assertNotEqual(0, results[0]['result'])
+        self.assertEqual(1, len(r.player.mismatches))
+
+    def test_player(self):
+        player = Player([])
+        with self.assertRaises(ReplayError):
+            player.next('meter', 's', 'call', 'measure')
+        self.assertEqual(1, len(player.mismatches))
+
+    def test_no_recording(self):
+        context = Context(self._station(record=False))
+        context.callback_register('prompt', lambda s: '1234')
+        context.station_run(count=1)
+        path = glob.glob(os.path.join(self._tempdir.name, 'test_replay', 'data', '*.zip'))[0]
+        with self.assertRaises(ValueError):
+            Replay(path)
+
+    def test_validate(self):
+        station = {'name': 'x', 'tests': [], 'devices': [{'name': 'meter', 'clz': Meter}]}
+        self.assertIsNone(validate(station)['record'])
+        self.assertEqual({'devices': None}, validate(dict(station, record=True))['record'])
+        self.assertEqual({'devices': ['meter']}, validate(dict(station, record={'devices': ['meter']}))['record'])
+        with self.assertRaises(ValueError):
+            validate(dict(station, record={'devices': ['invalid']}))
+        self.assertIn('replay', FILENAME)
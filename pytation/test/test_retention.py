@@ -0,0 +1,143 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the retention module.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import zipfile
+from pytation import retention, time, AnalysisContext, Context
+from pytation.history import UnitIndex
+from pytation.loader import validate
+
+
+DAY = 24 * 60 * 60
+
+
+class TestRetention(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.path = self._tempdir.name
+        self.now = time.filename_to_time('20261019_120000_000000')
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def _suite(self, t, result=0):
+        path = os.path.join(self.path, time.time_to_filename(t) + '.zip')
+        with zipfile.ZipFile(path, 'w') as z:
+            z.writestr('tests.json', json.dumps([{'name': 't1', 'result': result}]))
+            z.writestr('station.json', json.dumps({'env': {}, 'paths': {}}))
+        os.utime(path, (t, t))
+        return path
+
+    def test_prune_max_age(self):
+        old = self._suite(self.now - 3 * DAY)
+        new = self._suite(self.now - 1)
+        removed = retention.prune(self.path, max_age=DAY, now=self.now)
+        self.assertEqual([old], removed)
+        self.assertTrue(os.path.isfile(new))
+
+    def test_prune_max_count_and_exclude(self):
+        paths = [self._suite(self.now - k * 10) for k in range(5)]
+        removed = retention.prune(self.path, max_count=2, now=self.now, exclude=[paths[-1]])
+        self.assertEqual(paths[1:4][::-1], removed)
+
+    def test_prune_max_size(self):
+        paths = [self._suite(self.now - k * 10) for k in range(4)]
+        size = os.path.getsize(paths[0])
+        removed = retention.prune(self.path, max_size=size * 2, now=self.now)
+        self.assertEqual(2, len(removed))
+
+    def test_compact(self):
+        p1 = self._suite(self.now - 2 * DAY, result=0)
+        p2 = self._suite(self.now - 2 * DAY + 60, result=1)
+        p3 = self._suite(self.now - 1)
+        moved = {}
+        bundles = retention.compact(self.path, DAY, now=self.now, moved=moved)
+        self.assertEqual(1, len(bundles))
+        self.assertEqual({p1: os.path.join(bundles[0], os.path.basename(p1)),
+                          p2: os.path.join(bundles[0], os.path.basename(p2))}, moved)
+        self.assertFalse(os.path.exists(p1))
+        self.assertFalse(os.path.exists(p2))
+        self.assertTrue(os.path.isfile(p3))
+        index = retention.index_load(bundles[0])
+        self.assertEqual([os.path.basename(p1), os.path.basename(p2)], [e['name'] for e in index])
+        self.assertEqual([0, 1], [e['result'] for e in index])
+
+        # append to an existing bundle
+        p4 = self._suite(self.now - 2 * DAY + 120)
+        self.assertEqual(bundles, retention.compact(self.path, DAY, now=self.now))
+        self.assertEqual(3, len(retention.index_load(bundles[0])))
+
+        member = os.path.join(bundles[0], os.path.basename(p4))
+        with AnalysisContext(member) as a:
+            self.assertEqual('t1', a.tests[0]['name'])
+
+    def test_open_member_closes_bundle(self):
+        self._suite(self.now - 2 * DAY)
+        moved = {}
+        retention.compact(self.path, DAY, now=self.now, moved=moved)
+        member = list(moved.values())[0]
+        with retention.open_member(member) as f:
+            bundle = f._bundle
+            with zipfile.ZipFile(f) as z:
+                self.assertIn('tests.json', z.namelist())
+        self.assertIsNone(bundle.fp)
+        with self.assertRaises(FileNotFoundError):
+            retention.open_member(os.path.join(os.path.dirname(member), 'missing.zip'))
+
+    def test_compact_updates_unit_index(self):
+        def sn(context):
+            context.env['serial_number'] = 'SN1'
+            return 0
+
+        units_path = os.path.join(self.path, 'units.json')
+        station = validate({
+            'name': 'test_retention',
+            'retest': True,
+            'paths': {'base_path': self.path, 'units': units_path},
+            'tests': [{'name': 'sn', 'fn': sn}, {'name': 'a', 'fn': lambda context: 0}],
+            'devices': [],
+            'retention': {'interval': 0, 'output': {'compact_after': 0}},
+        })
+        Context(station).station_run(count=1)
+        path = UnitIndex(units_path).lookup('SN1', 'a')['path']
+        self.assertEqual(retention.BUNDLE_DIR, os.path.basename(os.path.dirname(os.path.dirname(path))))
+        with retention.open_member(path) as f, zipfile.ZipFile(f) as z:
+            self.assertIn('tests.json', z.namelist())
+
+    def test_context_policy(self):
+        station = validate({
+            'name': 'test_retention',
+            'paths': {'base_path': self.path},
+            'tests': [{'name': 'test1', 'fn': lambda context: 0}],
+            'devices': [],
+            'retention': {'interval': 0, 'output': {'max_count': 2}, 'log': {'max_age': DAY}},
+        })
+        context = Context(station)
+        context.station_run(count=4)
+        data_path = os.path.dirname(context.path('output'))
+        self.assertEqual(2, len(os.listdir(data_path)))
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            retention.policy_validate({'invalid': 1})
+        with self.assertRaises(ValueError):
+            retention.policy_validate({'max_age': -1})
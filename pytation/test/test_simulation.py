@@ -0,0 +1,154 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the station simulation.
+"""
+
+import unittest
+import random
+import tempfile
+from pytation import Context
+from pytation import time
+from pytation.loader import validate
+from pytation.simulation import Simulation, TimingModel, archives_find, report
+
+
+def _span(span_id, parent_id, name, attributes, duration, error=None):
+    return {'span_id': span_id, 'parent_id': parent_id, 'name': name, 'attributes': attributes,
+            'duration': duration, 'error': error}
+
+
+class Device:
+    def setup(self, context):
+        pass
+
+    def restore(self):
+        pass
+
+    def teardown(self):
+        pass
+
+
+class TestTimingModel(unittest.TestCase):
+
+    def test_add_suite(self):
+        model = TimingModel()
+        tests = [{'name': 'a', 'duration': 10.0, 'result': 0}, {'name': 'b', 'duration': 2.0, 'result': 1},
+                 {'name': 'c', 'result': 0, 'reused': '/path.zip'}]
+        operator = [{'kind': 'wait', 'section': 's.a', 'duration': 4.0},
+                    {'kind': 'prompt', 'section': 's.a.inner', 'duration': 1.0, 'prompt': 'serial'}]
+        spans = [_span('1', None, 'test a', {'test': 'a'}, 10.0),
+                 _span('2', '1', 'device dev setup', {'device': 'dev'}, 3.0),
+                 _span('3', '1', 'device dev restore', {'device': 'dev'}, 0.5, error='failed')]
+        model.add_suite(tests, operator, spans)
+        self.assertEqual(1, model.suites)
+        self.assertEqual(['a', 'b'], sorted(model.tests.keys()))
+        a = model.tests['a'][0]
+        self.assertEqual(7.0, a['duration'])
+        self.assertEqual([['wait', 4.0, None], ['prompt', 1.0, 'serial']], a['operator'])
+        rng = random.Random(0)
+        self.assertEqual((0.5, True), model.device_sample('dev', 'restore', rng))
+        self.assertEqual((0.0, False), model.device_sample('dev', 'teardown', rng))
+        self.assertEqual(0, model.test_sample('x', rng)['result'])
+
+
+class TestSimulation(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def test_run(self):
+        model = TimingModel()
+        model.add_suite([{'name': 'a', 'duration': 10.0, 'result': 0}, {'name': 'b', 'duration': 20.0, 'result': 0}],
+                        [{'kind': 'wait', 'section': 's.a', 'duration': 4.0}],
+                        [_span('1', None, 'device dev restore', {'device': 'dev'}, 2.0)])
+        model.add_suite([{'name': 'a', 'duration': 10.0, 'result': 0}, {'name': 'b', 'duration': 20.0, 'result': 1}])
+
+        def fn(context):
+            raise RuntimeError('requires hardware')
+
+        station = validate({
+            'name': 'test_simulation',
+            'concurrency': 2,
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn}, {'name': 'b', 'fn': fn}],
+            'devices': [{'name': 'dev', 'clz': Device}],
+        })
+        offset = time.offset()
+        result = Simulation(station, model, seed=1).run(20)
+        self.assertEqual(offset, time.offset())
+        self.assertEqual(20, result['units'])
+        self.assertTrue(0 < result['fail'] < 20)
+        self.assertEqual(result['fail'], result['tests']['b']['fails'])
+        self.assertGreaterEqual(result['duration'], 20 * 30.0)
+        self.assertLess(result['real_duration'], result['duration'] / 10)
+        self.assertGreaterEqual(result['tests']['a']['duration'], 10.0)
+        self.assertLess(result['tests']['a']['duration'], 11.0)
+        self.assertLess(result['units_per_hour'], 120.0)
+        self.assertIn('units per hour', report(result))
+
+    def test_isolated(self):
+        model = TimingModel()
+        model.add_suite([{'name': 'a', 'duration': 10.0, 'result': 0}])
+        suites = []
+
+        def fn(context):
+            raise RuntimeError('requires hardware')
+
+        station = validate({
+            'name': 'test_simulation',
+            'operator': True,
+            'record': True,
+            'paths': {'base_path': self._tempdir.name},
+            'handlers': {'suite_done': lambda context, path, tests: suites.append(path)},
+            'tests': [{'name': 'a', 'fn': fn}],
+            'devices': [{'name': 'dev', 'clz': Device}],
+        })
+        simulation = Simulation(station, model, seed=1)
+        s = simulation.station(self._tempdir.name)
+        self.assertEqual({}, s['handlers'])
+        self.assertIsNone(s['record'])
+        self.assertIsNone(s['operator'])
+        offset = time.offset()
+        self.assertEqual(2, simulation.run(2)['units'])
+        self.assertEqual(offset, time.offset())
+        self.assertEqual([], suites)
+
+    def test_from_archives(self):
+        def fn(context):
+            context.wait_for_user()
+
+        station = validate({
+            'name': 'test_simulation',
+            'trace': True,
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn, 'devices': ['dev']}],
+            'devices': [{'name': 'dev', 'clz': Device, 'lifecycle': 'test'}],
+        })
+        context = Context(station)
+        context.callback_register('wait_for_user', lambda: None)
+        context.station_run(count=2)
+        paths = archives_find(station)
+        self.assertEqual(2, len(paths))
+        self.assertEqual(paths[1:], archives_find(station, limit=1))
+        model = TimingModel.from_archives(paths + ['invalid.zip'])
+        self.assertEqual(2, model.suites)
+        self.assertEqual(2, len(model.tests['a']))
+        self.assertEqual('wait', model.tests['a'][0]['operator'][0][0])
+        for operation in ['setup', 'teardown']:  # test devices close before restore
+            self.assertEqual(2, len(model.devices[('dev', operation)]))
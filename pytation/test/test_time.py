@@ -30,3 +30,23 @@ class TestTime(unittest.TestCase):
         iso = pt.time_to_isostr(now)
         now2 = pt.isostr_to_time(iso)
         self.assertAlmostEqual(now, now2, places=6)
+
+    def test_advance(self):
+        offset = pt.offset()
+        t = pt.now()
+        pt.advance(3600.0)
+        try:
+            self.assertGreaterEqual(pt.now() - t, 3600.0)
+            self.assertEqual(offset + 3600.0, pt.offset())
+        finally:
+            pt.advance(-3600.0)
+        self.assertEqual(offset, pt.offset())
+
+    def test_virtual(self):
+        offset = pt.offset()
+        with self.assertRaises(RuntimeError):
+            with pt.virtual():
+                pt.advance(3600.0)
+                self.assertEqual(offset + 3600.0, pt.offset())
+                raise RuntimeError('simulation failed')
+        self.assertEqual(offset, pt.offset())
@@ -0,0 +1,268 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the tracing spans.
+"""
+
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+import zipfile
+from pytation import Context
+from pytation.loader import validate
+from pytation.trace import LogFilter, OtlpExporter, Tracer, to_otlp
+
+
+class _Collector:
+    """A local OTLP/HTTP collector that records the received spans."""
+
+    def __init__(self):
+        self.spans = []
+        collector = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                for r in body['resourceSpans']:
+                    for scope in r['scopeSpans']:
+                        collector.spans.extend(scope['spans'])
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        host, port = self._server.server_address[:2]
+        self.url = f'http://{host}:{port}/v1/traces'
+
+    def close(self):
+        self._server.shutdown()
+        self._thread.join()
+        self._server.server_close()
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_disabled(self):
+        tracer = Tracer(enabled=False)
+        self.assertIsNone(tracer.start('x'))
+        tracer.end(None)
+        with tracer.span('y') as span:
+            self.assertIsNone(span)
+        self.assertIsNone(tracer.current())
+
+    def test_nesting(self):
+        tracer = Tracer()
+        root = tracer.start('root', root=True)
+        with tracer.span('child', {'k': 1}) as child:
+            self.assertIs(child, tracer.current())
+            result = []
+            thread = threading.Thread(target=lambda: (tracer.attach(child), result.append(tracer.start('thread'))))
+            thread.start()
+            thread.join()
+        with self.assertRaises(ValueError):
+            with tracer.span('fail'):
+                raise ValueError('oops')
+        tracer.end(root)
+        tracer.end(result[0])
+        self.assertIsNone(tracer.current())
+        spans = tracer.collect(root.trace_id)
+        self.assertEqual(['child', 'fail', 'root', 'thread'], [s.name for s in spans])
+        self.assertEqual(root.span_id, spans[0].parent_id)
+        self.assertEqual(child.span_id, spans[3].parent_id)
+        self.assertEqual(set([root.trace_id]), set([s.trace_id for s in spans]))
+        self.assertIn('oops', spans[1].error)
+        self.assertEqual([], tracer.collect(root.trace_id))
+
+    def test_log_filter(self):
+        tracer = Tracer()
+        f = LogFilter(tracer)
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, 'msg', None, None)
+        f.filter(record)
+        self.assertEqual('', record.trace_id)
+        with tracer.span('x') as span:
+            f.filter(record)
+        self.assertEqual(span.trace_id, record.trace_id)
+        self.assertEqual(span.span_id, record.span_id)
+
+    def test_otlp(self):
+        tracer = Tracer()
+        root = tracer.start('root', {'flag': True, 'count': 2, 'value': 1.5, 'name': 'x'}, root=True)
+        with tracer.span('child'):
+            pass
+        tracer.end(root, error='failed')
+        d = to_otlp(tracer.collect(root.trace_id), {'station': 's'})
+        attrs = d['resourceSpans'][0]['resource']['attributes']
+        self.assertIn({'key': 'service.name', 'value': {'stringValue': 'pytation'}}, attrs)
+        child, span = d['resourceSpans'][0]['scopeSpans'][0]['spans']
+        self.assertEqual({'code': 2, 'message': 'failed'}, span['status'])
+        self.assertEqual({'code': 1}, child['status'])
+        self.assertNotIn('parentSpanId', span)
+        self.assertEqual(span['spanId'], child['parentSpanId'])
+        self.assertEqual(32, len(span['traceId']))
+        self.assertIn({'key': 'count', 'value': {'intValue': '2'}}, span['attributes'])
+        self.assertIn({'key': 'flag', 'value': {'boolValue': True}}, span['attributes'])
+
+    def test_exporter(self):
+        collector = _Collector()
+        try:
+            exporter = OtlpExporter(collector.url)
+            tracer = Tracer(exporter=exporter)
+            with tracer.span('root'):
+                with tracer.span('child'):
+                    pass
+            self.assertTrue(exporter.flush(timeout=5.0))
+            exporter.close()
+            self.assertEqual(['child', 'root'], [s['name'] for s in collector.spans])
+            self.assertEqual(collector.spans[1]['spanId'], collector.spans[0]['parentSpanId'])
+        finally:
+            collector.close()
+
+    def test_exporter_queue_size(self):
+        collector = _Collector()
+        release = threading.Event()
+        try:
+            exporter = OtlpExporter(collector.url, queue_size=2)
+            send = exporter._send
+            with patch.object(exporter, '_send', side_effect=lambda spans: release.wait(5.0) and send(spans)):
+                tracer = Tracer(exporter=exporter)
+                with tracer.span('block'):
+                    pass
+                for _ in range(500):  # wait for the export thread to take the first span
+                    if not len(exporter._pending):
+                        break
+                    release.wait(0.002)
+                for idx in range(4):
+                    with tracer.span(str(idx)):
+                        pass
+                self.assertEqual(2, exporter.dropped)
+                release.set()
+                self.assertTrue(exporter.flush(timeout=5.0))
+            exporter.close()
+            self.assertEqual(['block', '2', '3'], [s['name'] for s in collector.spans])
+        finally:
+            collector.close()
+
+    def test_exporter_ignores_proxy(self):
+        collector = _Collector()
+        try:
+            proxy = 'http://127.0.0.1:9'  # discard port
+            env = {'http_proxy': proxy, 'HTTP_PROXY': proxy, 'no_proxy': '', 'NO_PROXY': ''}
+            with patch.dict(os.environ, env), patch('urllib.request._opener', None):  # no cached proxies
+                exporter = OtlpExporter(collector.url)
+                tracer = Tracer(exporter=exporter)
+                with tracer.span('root'):
+                    pass
+                self.assertTrue(exporter.flush(timeout=5.0))
+                exporter.close()
+            self.assertEqual(['root'], [s['name'] for s in collector.spans])
+        finally:
+            collector.close()
+
+
+class TestContextTrace(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self._collector = _Collector()
+
+    def tearDown(self):
+        self._collector.close()
+        self._tempdir.cleanup()
+
+    def test_station(self):
+        class Device:
+            def setup(self, context):
+                pass
+
+            def restore(self):
+                pass
+
+            def teardown(self):
+                pass
+
+        def fn(context):
+            with context.tracer.span('measure'):
+                logging.getLogger('pytation.tmeasure').info('measuring')
+
+        station = validate({
+            'name': 'test_trace',
+            'trace': {'export': self._collector.url},
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn}],
+            'devices': [{'name': 'dev', 'clz': Device}],
+        })
+        Context(station).station_run(count=1)
+        paths = glob.glob(os.path.join(self._tempdir.name, 'test_trace', 'data', '*.zip'))
+        self.assertEqual(1, len(paths))
+        with zipfile.ZipFile(paths[0]) as z:
+            spans = json.loads(z.read('trace.json'))
+            log = z.read('log.txt').decode('utf-8')
+        by_name = dict([(s['name'], s) for s in spans])
+        by_id = dict([(s['span_id'], s) for s in spans])
+        self.assertEqual('suite', spans[0]['name'])
+        self.assertEqual(1, len(set([s['trace_id'] for s in spans])))
+
+        def ancestors(name):
+            result = []
+            s = by_name[name]
+            while s['parent_id'] is not None:
+                s = by_id[s['parent_id']]
+                result.append(s['name'])
+            return result
+
+        self.assertEqual(['section s.a', 'test a', 'section s', 'suite'], ancestors('measure'))
+        self.assertEqual(['test a', 'section s', 'suite'], ancestors('device dev restore'))
+        self.assertIn('archive open', by_name)
+        measure = by_name['measure']
+        self.assertIn(f'[{measure["trace_id"]}:{measure["span_id"]}]: measuring', log)
+
+        names = [s['name'] for s in self._collector.spans]
+        for name in ['station', 'device dev setup', 'device dev teardown', 'archive write', 'measure']:
+            self.assertIn(name, names)
+        archive_write = [s for s in self._collector.spans if s['name'] == 'archive write'][0]
+        self.assertEqual(by_name['suite']['span_id'], archive_write['parentSpanId'])
+
+    def test_concurrent(self):
+        def fn(context):
+            with context.section('inner'):
+                pass
+
+        station = validate({
+            'name': 'test_trace',
+            'trace': True,
+            'concurrency': 2,
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn}, {'name': 'b', 'fn': fn}],
+            'devices': [],
+        })
+        Context(station).station_run(count=1)
+        paths = glob.glob(os.path.join(self._tempdir.name, 'test_trace', 'data', '*.zip'))
+        with zipfile.ZipFile(paths[0]) as z:
+            spans = json.loads(z.read('trace.json'))
+        by_name = dict([(s['name'], s) for s in spans])
+        for name in ['a', 'b']:
+            self.assertEqual(by_name['section s']['span_id'], by_name[f'test {name}']['parent_id'])
+            self.assertEqual(by_name[f'section s.{name}']['span_id'], by_name[f'section s.{name}.inner']['parent_id'])
@@ -0,0 +1,156 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the watchdog.
+"""
+
+import unittest
+from unittest.mock import Mock
+import threading
+import time
+from pytation import Context
+from pytation.keywords import PYTATION_RETURN_CODE_TIMEOUT
+from pytation.loader import validate
+from pytation.watchdog import Watchdog, CancelToken, WatchdogAbandoned, WatchdogTimeout, guard
+
+
+class TestWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        self.watchdog = Watchdog()
+
+    def tearDown(self):
+        self.watchdog.close()
+
+    def test_watch_and_unwatch(self):
+        event = threading.Event()
+        fn = Mock()
+        handle = self.watchdog.watch(0.01, fn)
+        self.watchdog.unwatch(handle)
+        self.watchdog.watch(0.02, event.set)
+        self.assertTrue(event.wait(1.0))
+        fn.assert_not_called()
+
+    def test_guard_value_and_error(self):
+        self.assertEqual(42, guard(self.watchdog, lambda: 42, 1.0))
+        with self.assertRaises(ValueError):
+            guard(self.watchdog, Mock(side_effect=ValueError), 1.0)
+
+    def test_guard_cooperative(self):
+        token = CancelToken()
+
+        def fn():
+            while True:
+                token.check()
+                time.sleep(0.001)
+
+        t_start = time.monotonic()
+        with self.assertRaises(WatchdogTimeout):
+            guard(self.watchdog, fn, 0.02, grace=5.0, token=token)
+        self.assertLess(time.monotonic() - t_start, 1.0)
+
+    def test_guard_abandon(self):
+        event = threading.Event()
+        with self.assertRaises(WatchdogAbandoned):
+            guard(self.watchdog, event.wait, 0.01, grace=0.01)
+        self.assertEqual(1, len(self.watchdog.abandoned()))
+        event.set()
+        self.watchdog.abandoned()[0].join()
+        self.assertEqual([], self.watchdog.abandoned())
+
+
+def cooperative(context):
+    while True:
+        context.check_cancel()
+        time.sleep(0.001)
+
+
+class TestContextTimeout(unittest.TestCase):
+
+    def test_timeout(self):
+        hang = threading.Event()
+        eq1 = Mock(['setup', 'restore', 'teardown'])
+        station = validate({
+            'name': 'test_timeout',
+            'env': {'error_count_to_halt': 10},
+            'timeouts': {'test': 0.02, 'grace': 0.02},
+            'tests': [
+                {'name': 'cooperative', 'fn': cooperative, 'devices': ['eq1']},
+                {'name': 'hung', 'fn': lambda context: hang.wait(), 'devices': []},
+                {'name': 'ok', 'fn': lambda context: 0, 'timeout': 1.0, 'devices': []},
+            ],
+            'devices': [{'name': 'eq1', 'clz': eq1}],
+        })
+        context = Context(station)
+        context.station_start()
+        try:
+            self.assertEqual(PYTATION_RETURN_CODE_TIMEOUT, context.suite_run())
+            self.assertEqual(2, eq1.setup.call_count)  # recovered
+            self.assertEqual(1, eq1.teardown.call_count)
+        finally:
+            hang.set()
+            context.station_stop()
+
+    def test_abandoned(self):
+        hang = threading.Event()
+        eq1 = Mock(['setup', 'restore', 'teardown'])
+        station = validate({
+            'name': 'test_timeout',
+            'env': {'error_count_to_halt': 10},
+            'timeouts': {'test': 0.02, 'grace': 0.02},
+            'tests': [
+                {'name': 'hung', 'fn': lambda context: 0 if hang.wait() else 1, 'devices': []},
+                {'name': 'ok', 'fn': lambda context: 0, 'devices': []},
+            ],
+            'devices': [{'name': 'eq1', 'clz': eq1}],
+        })
+        context = Context(station)
+        names = []
+        context.events.subscribe(lambda e: names.append(e.data['name']), types=['test_done'], sync=True)
+        context.station_start()
+        try:
+            self.assertEqual(PYTATION_RETURN_CODE_TIMEOUT, context.suite_run())
+            self.assertEqual(['hung'], names)  # halted
+            self.assertEqual(1, eq1.setup.call_count)
+            hang.set()
+            self.assertEqual(0, context.suite_run())
+            self.assertEqual(2, eq1.setup.call_count)  # set up again
+            self.assertEqual(1, eq1.teardown.call_count)
+        finally:
+            hang.set()
+            context.station_stop()
+
+    def test_timeout_excludes_hooks(self):
+        def suite_setup(context):
+            context.wait_for_user()
+
+        station = validate({
+            'name': 'test_timeout',
+            'timeouts': {'test': 0.02, 'grace': 0.02},
+            'suite_setup': {'fn': suite_setup},
+            'tests': [{'name': 'ok', 'fn': lambda context: 0, 'devices': []}],
+            'devices': [],
+        })
+        context = Context(station)
+        context.callback_register('wait_for_user', lambda: time.sleep(0.1))
+        context.station_start()
+        try:
+            self.assertEqual(0, context.suite_run())
+        finally:
+            context.station_stop()
+
+    def test_timeouts_invalid(self):
+        with self.assertRaises(ValueError):
+            validate({'name': 'x', 'tests': [], 'devices': [], 'timeouts': {'tests': 1}})
@@ -0,0 +1,252 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Test the headless web runner.
+"""
+
+import unittest
+import base64
+import http.client
+import json
+import os
+import socket
+import struct
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pytation.loader import validate
+from pytation.web_runner import WebSocket, WebStation
+
+
+class _Client:
+    """A minimal WebSocket client."""
+
+    def __init__(self, address, token=None, origin=None):
+        self._sock = socket.create_connection(address, timeout=5.0)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        path = '/ws' if token is None else f'/ws?token={token}'
+        origin = '' if origin is None else f'Origin: {origin}\r\n'
+        self._sock.sendall((
+            f'GET {path} HTTP/1.1\r\n'
+            f'Host: {address[0]}:{address[1]}\r\n{origin}'
+            'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n').encode('ascii'))
+        self._rfile = self._sock.makefile('rb')
+        header = b''
+        while not header.endswith(b'\r\n\r\n'):
+            header += self._rfile.read(1)
+        self.status = int(header.split(b'\r\n')[0].split(b' ')[1])
+        if self.status == 101:
+            assert WebSocket.accept_key(key).encode('ascii') in header
+        self.close_code = None
+
+    def send(self, msg):
+        payload = json.dumps(msg).encode('utf-8')
+        mask = os.urandom(4)
+        masked = bytes([c ^ mask[idx & 3] for idx, c in enumerate(payload)])
+        self._sock.sendall(struct.pack('!BB', 0x81, 0x80 | len(payload)) + mask + masked)
+
+    def recv(self):
+        b0, b1 = self._rfile.read(2)
+        n = b1 & 0x7f
+        if n == 126:
+            n = struct.unpack('!H', self._rfile.read(2))[0]
+        elif n == 127:
+            n = struct.unpack('!Q', self._rfile.read(8))[0]
+        payload = self._rfile.read(n)
+        if b0 & 0x0f == 0x8:
+            self.close_code = struct.unpack('!H', payload)[0] if len(payload) >= 2 else None
+            return None
+        return json.loads(payload)
+
+    def recv_close(self):
+        while self.recv() is not None:
+            pass
+        return self.close_code
+
+    def recv_type(self, msg_type):
+        while True:
+            msg = self.recv()
+            if msg is None:
+                raise AssertionError(f'closed waiting for {msg_type}')
+            if msg['type'] == msg_type:
+                return msg
+
+    def close(self):
+        self._rfile.close()
+        self._sock.close()
+
+
+class TestWebRunner(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.values = []
+
+        def fn(context):
+            context.wait_for_user()
+            self.values.append(context.prompt('serial number'))
+            return 0
+
+        station = validate({
+            'name': 'test_web',
+            'paths': {'base_path': self._tempdir.name},
+            'tests': [{'name': 'a', 'fn': fn}],
+            'devices': [],
+        })
+        self.station = WebStation(station, port=0)
+
+    def tearDown(self):
+        self._tempdir.cleanup()
+
+    def _get(self, path):
+        host, port = self.station.address
+        with urllib.request.urlopen(f'http://{host}:{port}{path}', timeout=5.0) as f:
+            return f.read()
+
+    def _post(self, path, data, token=True, headers=None):
+        host, port = self.station.address
+        if token is True:
+            token = self.station.token
+        if token is not None:
+            path += f'?token={token}'
+        headers = {'Content-Type': 'application/json', **({} if headers is None else headers)}
+        req = urllib.request.Request(f'http://{host}:{port}{path}', data=json.dumps(data).encode('utf-8'),
+                                     headers=headers)
+        with urllib.request.urlopen(req, timeout=5.0) as f:
+            return json.loads(f.read())
+
+    def _post_status(self, *args, **kwargs):
+        try:
+            self._post(*args, **kwargs)
+            return 200
+        except urllib.error.HTTPError as ex:
+            return ex.code
+
+    def test_websocket(self):
+        self.station.start()
+        client = _Client(self.station.address, token=self.station.token)
+        try:
+            self.assertIn(b'<html>', self._get('/'))
+            msg = client.recv()
+            self.assertEqual('snapshot', msg['type'])
+            self.assertEqual('test_web', msg['data']['station'])
+            thread = threading.Thread(target=self.station.run, kwargs={'count': 1})
+            thread.start()
+            self.assertTrue(client.recv_type('wait_for_user')['data'])
+            self.assertTrue(json.loads(self._get('/status'))['wait_for_user'])
+            client.send({'type': 'continue'})
+            self.assertEqual('serial number', client.recv_type('prompt')['data'])
+            client.send({'type': 'prompt', 'data': 'SN1'})
+            client.recv_type('done')
+            thread.join(timeout=5.0)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(['SN1'], self.values)
+        finally:
+            client.close()
+            self.station.stop()
+
+    def test_post(self):
+        thread = threading.Thread(target=self.station.run, kwargs={'count': 1})
+        self.station.start()
+        thread.start()
+        try:
+            for _ in range(500):
+                status = json.loads(self._get('/status'))
+                if status['wait_for_user']:
+                    break
+                thread.join(0.01)
+            self.assertEqual({'ok': True}, self._post('/continue', {}))
+            for _ in range(500):
+                status = json.loads(self._get('/status'))
+                if status['prompt'] is not None:
+                    break
+                thread.join(0.01)
+            self._post('/prompt', {'data': 'SN2'})
+            thread.join(timeout=5.0)
+            self.assertFalse(thread.is_alive())
+            self.assertEqual(['SN2'], self.values)
+        finally:
+            self.station.stop()
+
+    def test_post_rejected(self):
+        self.station.start()
+        try:
+            host, port = self.station.address
+            self.assertEqual(403, self._post_status('/quit', {}, token=None))
+            self.assertEqual(403, self._post_status('/quit', {}, token='invalid'))
+            self.assertEqual(415, self._post_status('/quit', {}, headers={'Content-Type': 'text/plain'}))
+            self.assertEqual(403, self._post_status('/quit', {}, headers={'Origin': 'http://example.com'}))
+            self.assertFalse(self.station._context.do_quit)
+            self.assertEqual(200, self._post_status('/quit', {}, headers={'Origin': f'http://{host}:{port}'}))
+            self.assertTrue(self.station._context.do_quit)
+        finally:
+            self.station.stop()
+
+    def _request(self, method, path, headers):
+        conn = http.client.HTTPConnection(*self.station.address, timeout=5.0)
+        try:
+            conn.putrequest(method, path, skip_host=True, skip_accept_encoding=True)
+            for key, value in headers.items():
+                conn.putheader(key, value)
+            conn.endheaders()
+            return conn.getresponse().status
+        finally:
+            conn.close()
+
+    def test_host_rejected(self):
+        self.station.start()
+        try:
+            host, port = self.station.address
+            self.assertEqual(403, self._request('GET', '/status', {'Host': f'attacker.example:{port}'}))
+            self.assertEqual(403, self._request('GET', '/status', {}))
+            self.assertEqual(200, self._request('GET', '/status', {'Host': f'localhost:{port}'}))
+            self.assertEqual(200, self._request('GET', '/status', {'Host': f'{host}:{port}'}))
+            path = f'/quit?token={self.station.token}'
+            headers = {'Host': f'{host}:{port}', 'Content-Type': 'application/json', 'Content-Length': '-1'}
+            self.assertEqual(400, self._request('POST', path, headers))
+            headers['Host'] = f'attacker.example:{port}'
+            headers['Content-Length'] = '0'
+            self.assertEqual(403, self._request('POST', path, headers))
+            self.assertFalse(self.station._context.do_quit)
+        finally:
+            self.station.stop()
+
+    def test_host_allowed(self):
+        station = WebStation(self.station._context._station, port=0, allowed_hosts=['Station.Example'])
+        self.assertTrue(station.host_allowed('station.example:8080'))
+        self.assertTrue(station.host_allowed('[::1]:8080'))
+        self.assertTrue(station.host_allowed('10.1.2.3'))
+        self.assertFalse(station.host_allowed('attacker.example'))
+        self.assertFalse(station.host_allowed(''))
+        station._server.server_close()
+
+    def test_websocket_rejected(self):
+        self.station.start()
+        try:
+            client = _Client(self.station.address, token=self.station.token, origin='http://example.com')
+            self.assertEqual(403, client.status)
+            client.close()
+            client = _Client(self.station.address)  # read only
+            self.assertEqual(101, client.status)
+            self.assertEqual('snapshot', client.recv()['type'])
+            client.send({'type': 'quit'})
+            client._sock.sendall(struct.pack('!BBQ', 0x81, 0x80 | 127, 1 << 40) + os.urandom(4))
+            self.assertEqual(1009, client.recv_close())
+            client.close()
+            self.assertFalse(self.station._context.do_quit)
+        finally:
+            self.station.stop()
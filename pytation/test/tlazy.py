@@ -0,0 +1,38 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A test module for lazy loading that must only be imported on use."""
+
+from pytation import declare_test
+
+
+class Device:
+
+    def setup(self, context):
+        pass
+
+    def restore(self):
+        pass
+
+    def teardown(self):
+        pass
+
+
+@declare_test(['lazy_device'])
+def run_fn(context):
+    return 0, {'lazy': True}
+
+
+def handler(context, value):
+    return value
@@ -15,13 +15,53 @@
 """Define the time operations for this package."""
 
 
+import contextlib
 import datetime
+import threading
 import time
 
 
+_offset = 0.0  # seconds added to the system time, see advance()
+_offset_lock = threading.Lock()
+
+
 def now():
     """Get the current time as seconds since the POSIX epoch (UTC)."""
-    return time.time()
+    return time.time() + _offset
+
+
+def advance(duration):
+    """Advance :func:`now` without waiting.
+
+    :param duration: The duration in seconds.  Use -:func:`offset` to
+        return to the system time.
+
+    The station simulation uses this virtual clock to run suites
+    faster than real time.
+    """
+    global _offset
+    with _offset_lock:
+        _offset += duration
+
+
+def offset():
+    """Get the total duration advanced, in seconds."""
+    return _offset
+
+
+@contextlib.contextmanager
+def virtual():
+    """Scope :func:`advance` to a with block.
+
+    On exit, including exceptions, :func:`now` returns to the offset
+    at entry.  The offset is shared by all threads in the process
+    while the block runs.
+    """
+    start = offset()
+    try:
+        yield
+    finally:
+        advance(start - offset())
 
 
 def time_to_filename(t=None):
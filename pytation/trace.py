@@ -0,0 +1,378 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Trace where the station spends its time.
+
+A :class:`Span` records the start and end time of one operation, like
+a suite, test, section, device setup, or archive write.  Spans form a
+tree through their parent span.  Each suite is a separate trace, so a
+trace shows the complete cycle time of one unit.  The station span and
+its station-level operations form another trace.
+
+The :class:`Tracer` keeps the current span for each thread.  Code that
+hands work to another thread passes the parent span explicitly using
+:meth:`Tracer.attach`.  The :class:`LogFilter` adds the trace_id and
+span_id attributes to log records.  The station saves each suite's
+spans as "trace.json" in the suite archive.  The optional
+:class:`OtlpExporter` also sends the spans to a local collector using
+the OpenTelemetry OTLP/HTTP JSON protocol.
+"""
+
+from pytation import time, __version__
+import contextlib
+import json
+import logging
+import os
+import threading
+import urllib.request
+
+
+EXPORT_BATCH_SIZE = 512
+EXPORT_TIMEOUT = 5.0  # seconds
+EXPORT_QUEUE_SIZE = 8192  # spans, oldest dropped when the collector falls behind
+_log = logging.getLogger(__name__)
+
+
+class Span:
+    """A timed operation.
+
+    Use :meth:`Tracer.start` to create instances.
+    """
+
+    __slots__ = ['trace_id', 'span_id', 'parent_id', 'name', 'start', 'end', 'attributes', 'error']
+
+    def __init__(self, trace_id, parent_id, name, attributes):
+        self.trace_id = trace_id  #: The 32 hex character trace identifier.
+        self.span_id = os.urandom(8).hex()  #: The 16 hex character span identifier.
+        self.parent_id = parent_id  #: The parent span_id or None for the root span.
+        self.name = name  #: The operation name.
+        self.start = time.now()  #: The start time in seconds since the epoch.
+        self.end = None  #: The end time in seconds since the epoch, None while active.
+        self.attributes = dict(attributes or {})  #: The JSON-serializable attributes.
+        self.error = None  #: The error message or None on success.
+
+    def __repr__(self):
+        return f'Span({self.name!r}, {self.span_id})'
+
+    @property
+    def duration(self):
+        """The duration in seconds, or None while active."""
+        return None if self.end is None else self.end - self.start
+
+    def to_dict(self):
+        """Convert to the trace.json format.
+
+        :return: The dict representation.
+        """
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start': self.start,
+            'end': self.end,
+            'duration': self.duration,
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+class Tracer:
+    """Create spans and track the current span for each thread.
+
+    :param enabled: False to make all operations do nothing, so that
+        the station only pays for tracing when enabled.
+    :param exporter: The optional exporter with export(spans).
+    """
+
+    def __init__(self, enabled=True, exporter=None):
+        self.enabled = bool(enabled)
+        self._exporter = exporter
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._traces = {}  # trace_id: list of finished spans, for collected traces
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def current(self):
+        """Get the current span for this thread.
+
+        :return: The :class:`Span` or None.
+        """
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+
+    def attach(self, span):
+        """Set the current span for this thread.
+
+        :param span: The parent :class:`Span` from another thread or None.
+
+        Call when starting work on a thread, such as a pool thread,
+        that continues an operation from another thread.  Nested spans
+        on this thread become children of span.
+        """
+        self._local.stack = [] if span is None else [span]
+
+    def start(self, name, attributes=None, parent=None, root=False):
+        """Start a span.
+
+        :param name: The operation name.
+        :param attributes: The optional dict of attributes.
+        :param parent: The parent :class:`Span`.  None (default) uses
+            this thread's current span.
+        :param root: True to start a new trace with this span as the root.
+            The tracer retains the trace's finished spans for :meth:`collect`.
+        :return: The active :class:`Span`, or None when disabled.
+        """
+        if not self.enabled:
+            return None
+        if root:
+            span = Span(os.urandom(16).hex(), None, name, attributes)
+            with self._lock:
+                self._traces[span.trace_id] = []
+        else:
+            parent = self.current() if parent is None else parent
+            if parent is None:
+                span = Span(os.urandom(16).hex(), None, name, attributes)
+            else:
+                span = Span(parent.trace_id, parent.span_id, name, attributes)
+        self._stack().append(span)
+        return span
+
+    def end(self, span, error=None):
+        """End a span.
+
+        :param span: The :class:`Span` returned by :meth:`start`.
+            None and spans that already ended are ignored.
+        :param error: The optional error message for failed operations.
+        """
+        if span is None or span.end is not None:
+            return
+        span.end = time.now()
+        if error is not None:
+            span.error = str(error)
+        stack = self._stack()
+        if len(stack) and stack[-1] is span:
+            stack.pop()
+        elif span in stack:
+            stack.remove(span)
+        with self._lock:
+            spans = self._traces.get(span.trace_id)
+            if spans is not None:
+                spans.append(span)
+        if self._exporter is not None:
+            self._exporter.export([span])
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None):
+        """Trace an operation in a "with" statement.
+
+        :param name: The operation name.
+        :param attributes: The optional dict of attributes.
+        :return: The context manager that provides the :class:`Span`,
+            or None when disabled.
+        """
+        span = self.start(name, attributes)
+        try:
+            yield span
+        except BaseException as ex:
+            self.end(span, error=repr(ex))
+            raise
+        else:
+            self.end(span)
+
+    def collect(self, trace_id):
+        """Get and stop retaining the finished spans of a trace.
+
+        :param trace_id: The trace identifier of a root span.
+        :return: The list of finished spans in end order.  Spans that
+            end later are only exported.
+        """
+        with self._lock:
+            return self._traces.pop(trace_id, [])
+
+    def close(self):
+        """Flush and close the exporter."""
+        if self._exporter is not None:
+            self._exporter.close()
+
+
+class LogFilter(logging.Filter):
+    """Add the current trace_id and span_id attributes to log records.
+
+    :param tracer: The :class:`Tracer`.
+
+    Add this filter to handlers, not loggers, so that it applies to
+    records from all loggers.  The attributes are empty strings outside
+    of a span.
+    """
+
+    def __init__(self, tracer):
+        super().__init__()
+        self._tracer = tracer
+
+    def filter(self, record):
+        span = self._tracer.current()
+        record.trace_id = '' if span is None else span.trace_id
+        record.span_id = '' if span is None else span.span_id
+        return True
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    elif isinstance(value, int):
+        return {'intValue': str(value)}
+    elif isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes):
+    return [{'key': str(k), 'value': _otlp_value(v)} for k, v in attributes.items()]
+
+
+def to_otlp(spans, resource=None):
+    """Convert spans to the OTLP/HTTP JSON request format.
+
+    :param spans: The list of :class:`Span` or trace.json span dicts.
+    :param resource: The optional dict of resource attributes.
+    :return: The JSON-serializable request dict.
+    """
+    resource = dict(resource or {})
+    resource.setdefault('service.name', 'pytation')
+    result = []
+    for span in spans:
+        s = span if isinstance(span, dict) else span.to_dict()
+        end = s['end'] if s['end'] is not None else s['start']
+        d = {
+            'traceId': s['trace_id'],
+            'spanId': s['span_id'],
+            'name': s['name'],
+            'kind': 1,  # internal
+            'startTimeUnixNano': str(int(s['start'] * 1e9)),
+            'endTimeUnixNano': str(int(end * 1e9)),
+            'attributes': _otlp_attributes(s['attributes']),
+            'status': {'code': 2, 'message': s['error']} if s['error'] else {'code': 1},
+        }
+        if s['parent_id']:
+            d['parentSpanId'] = s['parent_id']
+        result.append(d)
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes(resource)},
+            'scopeSpans': [{
+                'scope': {'name': 'pytation', 'version': __version__},
+                'spans': result,
+            }],
+        }],
+    }
+
+
+class OtlpExporter:
+    """Send spans to a collector on a background thread.
+
+    :param url: The OTLP/HTTP traces endpoint, such as
+        "http://127.0.0.1:4318/v1/traces".
+    :param resource: The optional dict of resource attributes.
+    :param timeout: The request timeout in seconds.
+    :param queue_size: The maximum number of queued spans.  None uses
+        :data:`EXPORT_QUEUE_SIZE`.
+
+    Spans are batched, and export failures are logged but never
+    affect the station.  When the collector falls behind, the oldest
+    queued spans are dropped.  Requests always connect directly to
+    the collector and ignore the HTTP_PROXY and HTTPS_PROXY
+    environment variables.
+    """
+
+    def __init__(self, url, resource=None, timeout=None, queue_size=None):
+        self.url = url
+        self._resource = resource
+        self._timeout = EXPORT_TIMEOUT if timeout is None else timeout
+        self._queue_size = EXPORT_QUEUE_SIZE if queue_size is None else int(queue_size)
+        self._opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+        self.dropped = 0  #: The number of spans dropped due to a full queue.
+        self._cv = threading.Condition()
+        self._pending = []
+        self._busy = False
+        self._quit = False
+        self._failures = 0
+        self._thread = threading.Thread(target=self._run, name='pytation_trace_export', daemon=True)
+        self._thread.start()
+
+    def export(self, spans):
+        """Queue spans for export.
+
+        :param spans: The list of finished :class:`Span` instances.
+        """
+        with self._cv:
+            if not self._quit:
+                self._pending.extend(spans)
+                excess = len(self._pending) - self._queue_size
+                if excess > 0:
+                    del self._pending[:excess]
+                    if not self.dropped:
+                        _log.warning('trace export queue full, dropping spans')
+                    self.dropped += excess
+                self._cv.notify_all()
+
+    def _send(self, spans):
+        body = json.dumps(to_otlp(spans, self._resource)).encode('utf-8')
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        try:
+            with self._opener.open(request, timeout=self._timeout) as f:
+                f.read()
+            self._failures = 0
+        except Exception as ex:
+            self._failures += 1
+            log_fn = _log.warning if self._failures == 1 else _log.debug
+            log_fn('trace export to %s failed: %s', self.url, ex)
+
+    def _run(self):
+        while True:
+            with self._cv:
+                self._busy = False
+                self._cv.notify_all()
+                while not len(self._pending) and not self._quit:
+                    self._cv.wait()
+                if not len(self._pending):
+                    return
+                spans = self._pending[:EXPORT_BATCH_SIZE]
+                del self._pending[:EXPORT_BATCH_SIZE]
+                self._busy = True
+            self._send(spans)
+
+    def flush(self, timeout=None):
+        """Wait for all queued spans to be sent.
+
+        :param timeout: The maximum time to wait in seconds.
+        :return: True if all spans were sent.
+        """
+        with self._cv:
+            return self._cv.wait_for(lambda: not len(self._pending) and not self._busy, timeout)
+
+    def close(self):
+        """Send the queued spans and stop."""
+        with self._cv:
+            self._quit = True
+            self._cv.notify_all()
+        self._thread.join()
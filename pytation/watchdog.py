@@ -0,0 +1,231 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Detect test and device operation overruns.
+
+Python cannot safely stop a thread, so :func:`guard` runs the operation
+on a separate thread.  When the timeout expires, the :class:`Watchdog`
+cancels the operation's :class:`CancelToken`.  Well-behaved operations
+poll the token, which raises :class:`WatchdogTimeout`.  If the operation
+does not finish within the grace period, the guard abandons the thread
+and raises :class:`WatchdogAbandoned`.  The abandoned thread may still
+use the devices, so the station halts the suite and sets up the devices
+again before the next suite.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+
+GRACE_DEFAULT = 5.0  # seconds
+_log = logging.getLogger(__name__)
+
+
+class WatchdogTimeout(TimeoutError):
+    """The operation exceeded its timeout."""
+    pass
+
+
+class WatchdogAbandoned(WatchdogTimeout):
+    """The operation did not respond to cancellation, and its thread may still run."""
+    pass
+
+
+class CancelToken:
+    """A cooperative cancellation flag."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None  #: The cancellation reason string.
+
+    @property
+    def cancelled(self):
+        """True when cancelled."""
+        return self._event.is_set()
+
+    def cancel(self, reason=None):
+        """Cancel the operation.
+
+        :param reason: The optional reason string.
+        """
+        self.reason = reason
+        self._event.set()
+
+    def check(self):
+        """Check for cancellation.
+
+        :raise WatchdogTimeout: If cancelled.
+        """
+        if self._event.is_set():
+            raise WatchdogTimeout(self.reason or 'cancelled')
+
+    def wait(self, timeout=None):
+        """Sleep until cancelled.
+
+        :param timeout: The maximum time to wait in seconds.
+        :return: True if cancelled.
+        """
+        return self._event.wait(timeout)
+
+
+class Watchdog:
+    """Call functions on a single thread when their deadlines expire."""
+
+    def __init__(self):
+        self._cv = threading.Condition()
+        self._heap = []  # list of [deadline, sequence, fn]
+        self._sequence = itertools.count()
+        self._thread = None
+        self._quit = False
+        self._abandoned = []  # threads abandoned by guard()
+
+    def abandon(self, thread):
+        """Track an abandoned thread.
+
+        :param thread: The threading.Thread that did not respond to cancellation.
+        """
+        with self._cv:
+            self._abandoned.append(thread)
+
+    def abandoned(self):
+        """Get the abandoned threads that are still running.
+
+        :return: The list of threading.Thread instances.
+        """
+        with self._cv:
+            self._abandoned = [t for t in self._abandoned if t.is_alive()]
+            return list(self._abandoned)
+
+    def watch(self, timeout, fn):
+        """Start watching a deadline.
+
+        :param timeout: The timeout in seconds.
+        :param fn: The callable fn() to call from the watchdog thread
+            when the timeout expires.
+        :return: The handle for :meth:`unwatch`.
+        """
+        entry = [time.monotonic() + timeout, next(self._sequence), fn]
+        with self._cv:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._quit = False
+                self._thread = threading.Thread(target=self._run, name='pytation_watchdog', daemon=True)
+                self._thread.start()
+            self._cv.notify()
+        return entry
+
+    def unwatch(self, handle):
+        """Stop watching a deadline.
+
+        :param handle: The handle returned by :meth:`watch`.
+        """
+        with self._cv:
+            handle[2] = None  # removed lazily
+
+    def _next(self):
+        with self._cv:
+            while not self._quit:
+                while len(self._heap) and self._heap[0][2] is None:
+                    heapq.heappop(self._heap)
+                if not len(self._heap):
+                    self._cv.wait()
+                    continue
+                dt = self._heap[0][0] - time.monotonic()
+                if dt <= 0:
+                    entry = heapq.heappop(self._heap)
+                    fn, entry[2] = entry[2], None
+                    return fn
+                self._cv.wait(dt)
+            return None
+
+    def _run(self):
+        while True:
+            fn = self._next()
+            if fn is None:
+                return
+            try:
+                fn()
+            except Exception:
+                _log.exception('watchdog callback failed')
+
+    def close(self):
+        """Stop the watchdog thread."""
+        with self._cv:
+            self._quit = True
+            self._heap.clear()
+            thread, self._thread = self._thread, None
+            self._cv.notify()
+        if thread is not None:
+            thread.join()
+
+
+def guard(watchdog, fn, timeout, grace=None, name=None, token=None):
+    """Run an operation with a timeout.
+
+    :param watchdog: The :class:`Watchdog` instance.
+    :param fn: The callable fn() to run on a new thread.
+    :param timeout: The timeout in seconds.
+    :param grace: The additional time in seconds after cancellation
+        before abandoning the thread.  None uses :data:`GRACE_DEFAULT`.
+    :param name: The operation name for messages.
+    :param token: The :class:`CancelToken` that fn polls.  None creates
+        an unused token.
+    :return: The return value of fn.
+    :raise WatchdogTimeout: If the timeout expired, even if fn then
+        completed during the grace period.
+    :raise WatchdogAbandoned: If fn did not complete during the grace
+        period.  The thread continues to run.
+    :raise Exception: Any exception raised by fn.
+    """
+    grace = GRACE_DEFAULT if grace is None else grace
+    name = getattr(fn, '__name__', 'operation') if name is None else name
+    token = CancelToken() if token is None else token
+    wake = threading.Event()
+    outcome = {}
+    handles = []
+
+    def target():
+        try:
+            outcome['value'] = fn()
+        except BaseException as ex:
+            outcome['error'] = ex
+        finally:
+            outcome['done'] = True
+            wake.set()
+
+    def on_timeout():
+        _log.warning('%s timed out after %s seconds, cancelling', name, timeout)
+        token.cancel(f'{name} timed out after {timeout} seconds')
+        handles.append(watchdog.watch(grace, wake.set))
+
+    handles.append(watchdog.watch(timeout, on_timeout))
+    thread = threading.Thread(target=target, name='pytation_guard', daemon=True)
+    thread.start()
+    wake.wait()
+    for handle in list(handles):
+        watchdog.unwatch(handle)
+    if not outcome.get('done'):
+        _log.error('%s did not respond to cancellation, abandoning its thread', name)
+        watchdog.abandon(thread)
+        raise WatchdogAbandoned(token.reason)
+    if token.cancelled:
+        raise WatchdogTimeout(token.reason)
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('value')
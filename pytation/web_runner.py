@@ -0,0 +1,631 @@
+# Copyright 2026 Jetperch LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Run a station headless with a local HTTP and WebSocket dashboard.
+
+The runner uses only the Python standard library.  It serves:
+
+* GET /: A minimal HTML dashboard.
+* GET /status: The JSON snapshot of the station name, state, progress,
+  pending prompt or wait, and recent log messages.
+* GET /ws: The WebSocket event stream.  The server first sends a
+  "snapshot" message followed by "state", "progress", "log", "prompt",
+  "wait_for_user", and "done" messages as they occur.  Every message is
+  a JSON object with "type" and "data".  Clients may send
+  {"type": "continue"}, {"type": "prompt", "data": "value"}, and
+  {"type": "quit"}.
+* POST /continue, /prompt, and /quit: The same actions for clients
+  without WebSocket support.  POST /prompt takes the JSON
+  {"data": "value"}.  POST requests must have the Content-Type
+  "application/json".
+
+Each launch generates a random access token, which the runner logs as
+part of the dashboard URL.  Clients must provide it as the "token" query
+parameter to control the station.  POST requests without the token are
+rejected, and WebSocket clients without the token only receive events.
+Requests with a Host header that is not an IP address, localhost, the
+bind address, this computer's name, or one of the allowed hosts are
+rejected, which prevents DNS rebinding.  Requests with an Origin header
+that does not match the Host are also rejected, so other web pages
+cannot read or control the station.
+
+Each WebSocket client has its own bounded queue and sender thread, so
+slow clients drop old log messages rather than delaying the station.
+"""
+
+from pytation import Context, __version__
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import base64
+import collections
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import secrets
+import socket
+import struct
+import threading
+import urllib.parse
+
+
+HOST_DEFAULT = '127.0.0.1'
+PORT_DEFAULT = 8080
+LOG_HISTORY = 200  # log messages included in the snapshot
+CLIENT_QUEUE_SIZE = 1000  # messages per client before dropping
+MESSAGE_SIZE_MAX = 65536  # bytes per received WebSocket message
+_CLOSE_TOO_BIG = 1009
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+_OP_CONTINUATION, _OP_TEXT, _OP_BINARY, _OP_CLOSE, _OP_PING, _OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+_log = logging.getLogger(__name__)
+
+
+_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>pytation</title>
+<style>
+body { font-family: sans-serif; margin: 1em; }
+#state { padding: 1em; border: 1px solid #888; }
+#log { font-family: monospace; font-size: 10pt; height: 50vh; overflow-y: scroll; white-space: pre; }
+progress { width: 100%; }
+.hidden { display: none; }
+</style>
+</head>
+<body>
+<h2 id="station"></h2>
+<div id="state"></div>
+<progress id="progress" max="1000" value="0"></progress>
+<div id="wait" class="hidden"><button onclick="send({type: 'continue'})">Continue</button></div>
+<form id="prompt" class="hidden" onsubmit="return prompt_submit()">
+<label id="prompt_str"></label> <input id="prompt_value"> <input type="submit" value="OK">
+</form>
+<div id="log"></div>
+<script>
+let ws = null;
+const $ = (id) => document.getElementById(id);
+const token = new URLSearchParams(location.search).get('token') || '';
+function send(msg) { if (ws) { ws.send(JSON.stringify(msg)); } }
+function log_append(line) {
+  const e = $('log');
+  const at_bottom = e.scrollTop + e.clientHeight >= e.scrollHeight - 2;
+  e.appendChild(document.createTextNode(line + '\\n'));
+  while (e.childNodes.length > 2000) { e.removeChild(e.firstChild); }
+  if (at_bottom) { e.scrollTop = e.scrollHeight; }
+}
+function prompt_show(s) {
+  $('prompt').classList.toggle('hidden', s === null);
+  $('prompt_str').textContent = s || '';
+  if (s !== null) { $('prompt_value').focus(); }
+}
+function prompt_submit() {
+  send({type: 'prompt', data: $('prompt_value').value});
+  $('prompt_value').value = '';
+  prompt_show(null);
+  return false;
+}
+const handlers = {
+  snapshot: (d) => {
+    $('station').textContent = d.station;
+    handlers.state(d.state); handlers.progress(d.progress);
+    handlers.wait_for_user(d.wait_for_user); prompt_show(d.prompt);
+    $('log').textContent = ''; d.log.forEach(log_append);
+  },
+  state: (d) => { $('state').innerHTML = d ? (d.html || d.name) : ''; },
+  progress: (d) => { $('progress').value = Math.round(d * 1000); },
+  log: log_append,
+  wait_for_user: (d) => { $('wait').classList.toggle('hidden', !d); },
+  prompt: prompt_show,
+  done: () => { log_append('*** station done ***'); },
+};
+function connect() {
+  ws = new WebSocket('ws://' + location.host + '/ws?token=' + encodeURIComponent(token));
+  ws.onmessage = (e) => { const m = JSON.parse(e.data); (handlers[m.type] || (() => {}))(m.data); };
+  ws.onclose = () => { ws = null; setTimeout(connect, 1000); };
+}
+connect();
+</script>
+</body>
+</html>
+"""
+
+
+class WebSocket:
+    """A minimal RFC 6455 WebSocket server connection.
+
+    :param rfile: The buffered socket input file.
+    :param wfile: The socket output file.
+    """
+
+    def __init__(self, rfile, wfile):
+        self._rfile = rfile
+        self._wfile = wfile
+        self._lock = threading.Lock()
+        self.closed = False
+
+    @staticmethod
+    def accept_key(key):
+        """Compute the Sec-WebSocket-Accept value for a client key."""
+        digest = hashlib.sha1((key + _WS_GUID).encode('ascii')).digest()
+        return base64.b64encode(digest).decode('ascii')
+
+    def _send_frame(self, opcode, payload):
+        n = len(payload)
+        if n < 126:
+            header = struct.pack('!BB', 0x80 | opcode, n)
+        elif n < 65536:
+            header = struct.pack('!BBH', 0x80 | opcode, 126, n)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 127, n)
+        with self._lock:
+            self._wfile.write(header + payload)
+            self._wfile.flush()
+
+    def send(self, text):
+        """Send a text message.
+
+        :param text: The str message.
+        """
+        self._send_frame(_OP_TEXT, text.encode('utf-8'))
+
+    def _read_exact(self, n):
+        b = self._rfile.read(n)
+        if b is None or len(b) != n:
+            raise ConnectionError('websocket closed')
+        return b
+
+    def _recv_frame(self, size_max):
+        b0, b1 = self._read_exact(2)
+        n = b1 & 0x7f
+        if n == 126:
+            n = struct.unpack('!H', self._read_exact(2))[0]
+        elif n == 127:
+            n = struct.unpack('!Q', self._read_exact(8))[0]
+        if n > size_max:
+            self.close(_CLOSE_TOO_BIG)
+            raise ConnectionError(f'websocket frame too large: {n}')
+        mask = self._read_exact(4) if b1 & 0x80 else None
+        payload = self._read_exact(n) if n else b''
+        if mask is not None:
+            payload = bytes([c ^ mask[idx & 3] for idx, c in enumerate(payload)])
+        return bool(b0 & 0x80), b0 & 0x0f, payload
+
+    def recv(self):
+        """Receive a message.
+
+        :return: The str message or None when the connection closes.
+
+        Messages larger than MESSAGE_SIZE_MAX close the connection.
+        """
+        fragments = []
+        size = 0
+        try:
+            while True:
+                fin, opcode, payload = self._recv_frame(MESSAGE_SIZE_MAX - size)
+                if opcode == _OP_CLOSE:
+                    self.close()
+                    return None
+                elif opcode == _OP_PING:
+                    self._send_frame(_OP_PONG, payload)
+                    continue
+                elif opcode == _OP_PONG:
+                    continue
+                fragments.append(payload)
+                size += len(payload)
+                if fin:
+                    return b''.join(fragments).decode('utf-8')
+        except (ConnectionError, OSError, ValueError):
+            self.closed = True
+            return None
+
+    def close(self, code=None):
+        """Close the connection.
+
+        :param code: The optional close status code.
+        """
+        if not self.closed:
+            self.closed = True
+            try:
+                self._send_frame(_OP_CLOSE, b'' if code is None else struct.pack('!H', code))
+            except OSError:
+                pass
+
+
+class _Client:
+    """A WebSocket client with a bounded queue and sender thread."""
+
+    def __init__(self, ws):
+        self.ws = ws
+        self._queue = collections.deque(maxlen=CLIENT_QUEUE_SIZE)
+        self._cv = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='pytation_web_client', daemon=True)
+        self._thread.start()
+
+    def put(self, text):
+        with self._cv:
+            self._queue.append(text)  # drops the oldest when full
+            self._cv.notify()
+
+    def close(self):
+        with self._cv:
+            self._queue.append(None)
+            self._cv.notify()
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while not len(self._queue):
+                    self._cv.wait()
+                text = self._queue.popleft()
+            if text is None or self.ws.closed:
+                return
+            try:
+                self.ws.send(text)
+            except OSError:
+                self.ws.closed = True
+                return
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = f'pytation/{__version__}'
+
+    def log_message(self, format, *args):
+        _log.debug('%s %s', self.address_string(), format % args)
+
+    def _send(self, code, body, content_type='application/json'):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _origin_ok(self):
+        host = self.headers.get('Host', '')
+        if not self.server.station.host_allowed(host):
+            return False
+        origin = self.headers.get('Origin')
+        if origin is None:  # not a browser request
+            return True
+        return origin == f'http://{host}'
+
+    def _token_ok(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        token = query.get('token', [''])[0]
+        return hmac.compare_digest(token.encode('utf-8'), self.server.station.token.encode('utf-8'))
+
+    def do_GET(self):
+        station = self.server.station
+        path = self.path.split('?')[0]
+        if not self._origin_ok():
+            self._send(403, json.dumps({'error': 'origin not allowed'}))
+        elif path == '/':
+            self._send(200, _HTML, 'text/html; charset=utf-8')
+        elif path == '/status':
+            self._send(200, json.dumps(station.snapshot()))
+        elif path == '/ws' and self.headers.get('Upgrade', '').lower() == 'websocket':
+            self._websocket(station)
+        else:
+            self._send(404, json.dumps({'error': 'not found'}))
+
+    def do_POST(self):
+        station = self.server.station
+        if not self._origin_ok():
+            return self._send(403, json.dumps({'error': 'origin not allowed'}))
+        if not self._token_ok():
+            return self._send(403, json.dumps({'error': 'invalid token'}))
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            return self._send(415, json.dumps({'error': 'requires application/json'}))
+        try:
+            n = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            n = -1
+        if n < 0:
+            self.close_connection = True
+            return self._send(400, json.dumps({'error': 'invalid Content-Length'}))
+        if n > MESSAGE_SIZE_MAX:
+            self.close_connection = True
+            return self._send(413, json.dumps({'error': 'too large'}))
+        try:
+            body = json.loads(self.rfile.read(n)) if n else {}
+        except ValueError:
+            return self._send(400, json.dumps({'error': 'invalid json'}))
+        if not isinstance(body, dict):
+            return self._send(400, json.dumps({'error': 'invalid json'}))
+        msg_type = self.path.split('?')[0].strip('/')
+        if station.on_client_message({'type': msg_type, 'data': body.get('data')}):
+            self._send(200, json.dumps({'ok': True}))
+        else:
+            self._send(404, json.dumps({'error': 'not found'}))
+
+    def _websocket(self, station):
+        key = self.headers.get('Sec-WebSocket-Key')
+        if key is None:
+            return self._send(400, json.dumps({'error': 'missing Sec-WebSocket-Key'}))
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', WebSocket.accept_key(key))
+        self.end_headers()
+        self.wfile.flush()
+        ws = WebSocket(self.rfile, self.wfile)
+        control = self._token_ok()
+        client = station.client_add(ws)
+        try:
+            while True:
+                text = ws.recv()
+                if text is None:
+                    break
+                if not control:
+                    _log.warning('ignore message from read-only websocket client %s', self.address_string())
+                    continue
+                try:
+                    msg = json.loads(text)
+                except ValueError:
+                    msg = None
+                if not isinstance(msg, dict):
+                    _log.warning('invalid websocket message')
+                    continue
+                station.on_client_message(msg)
+        finally:
+            station.client_remove(client)
+            ws.close()
+        self.close_connection = True
+
+
+class _LogHandler(logging.Handler):
+
+    def __init__(self, station):
+        super().__init__(logging.INFO)
+        self.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s', '%Y%m%d %H:%M:%S'))
+        self._station = station
+
+    def emit(self, record):
+        try:
+            self._station.on_log(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+class WebStation:
+    """Run a station with a local HTTP and WebSocket dashboard.
+
+    :param station: The validated station definition.
+    :param host: The host address to serve.  The default only accepts
+        local connections.  Use '0.0.0.0' to allow a remote supervisor.
+    :param port: The TCP port.  0 selects an available port.
+    :param allowed_hosts: The additional host names that clients may
+        use to reach the server, such as a DNS alias.  IP addresses,
+        localhost, the bind address, and this computer's name are
+        always allowed.
+    """
+
+    def __init__(self, station, host=None, port=None, allowed_hosts=None):
+        self._context = Context(station)
+        self._name = station.get('full_name', station['name'])
+        self._lock = threading.Lock()
+        self._clients = []
+        self._state = None
+        self._progress = 0.0
+        self._log_history = collections.deque(maxlen=LOG_HISTORY)
+        self._prompt_str = None
+        self._prompt_result = None
+        self._prompt_event = threading.Event()
+        self._wait_for_user = False
+        self._continue_event = threading.Event()
+        self._context.callback_register('progress', self._on_progress_cbk)
+        self._context.callback_register('state', self._on_state_cbk)
+        self._context.callback_register('wait_for_user', self._on_wait_for_user_cbk)
+        self._context.callback_register('prompt', self._on_prompt_cbk)
+        self._log_handler = _LogHandler(self)
+        host = HOST_DEFAULT if host is None else host
+        port = PORT_DEFAULT if port is None else port
+        self._hosts = set(['localhost', host.lower(), socket.gethostname().lower(), socket.getfqdn().lower()])
+        self._hosts.update([h.lower() for h in (allowed_hosts or [])])
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.station = self
+        self._server_thread = None
+        self._token = secrets.token_urlsafe(16)
+
+    @property
+    def address(self):
+        """The (host, port) server address."""
+        return self._server.server_address[:2]
+
+    def host_allowed(self, host):
+        """Check the HTTP Host header.
+
+        :param host: The Host header value, such as "127.0.0.1:8080".
+        :return: True if clients may reach the server using host.
+        """
+        try:
+            name = urllib.parse.urlsplit('//' + host).hostname
+        except ValueError:
+            return False
+        if not name:
+            return False
+        try:
+            ipaddress.ip_address(name)
+            return True  # DNS rebinding requires a host name
+        except ValueError:
+            return name.rstrip('.') in self._hosts
+
+    @property
+    def token(self):
+        """The access token required to control the station."""
+        return self._token
+
+    @property
+    def url(self):
+        """The dashboard URL including the access token."""
+        return 'http://%s:%d/?token=%s' % (*self.address, self._token)
+
+    def snapshot(self):
+        """Get the current station status.
+
+        :return: The JSON-serializable status dict.
+        """
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self):
+        return {
+            'station': self._name,
+            'state': self._state,
+            'progress': self._progress,
+            'wait_for_user': self._wait_for_user,
+            'prompt': self._prompt_str,
+            'log': list(self._log_history),
+        }
+
+    def _broadcast(self, msg_type, data):
+        text = json.dumps({'type': msg_type, 'data': data}, default=str)
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            client.put(text)
+
+    def client_add(self, ws):
+        """Add a WebSocket client.
+
+        :param ws: The connected :class:`WebSocket`.
+        :return: The client for :meth:`client_remove`.
+
+        The client first receives the snapshot, atomically with
+        respect to subsequent events.
+        """
+        with self._lock:
+            client = _Client(ws)
+            client.put(json.dumps({'type': 'snapshot', 'data': self._snapshot()}, default=str))
+            self._clients.append(client)
+        return client
+
+    def client_remove(self, client):
+        """Remove a WebSocket client.
+
+        :param client: The client returned by :meth:`client_add`.
+        """
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+        client.close()
+
+    def on_client_message(self, msg):
+        """Handle a client message.
+
+        :param msg: The message dict with type and optional data.
+        :return: True if handled, False if unknown.
+        """
+        msg_type = msg.get('type')
+        if msg_type == 'continue':
+            self._continue_event.set()
+        elif msg_type == 'prompt':
+            self._prompt_result = '' if msg.get('data') is None else str(msg['data'])
+            self._prompt_event.set()
+        elif msg_type == 'quit':
+            self._context.do_quit = True
+        else:
+            return False
+        return True
+
+    def on_log(self, line):
+        with self._lock:
+            self._log_history.append(line)
+        self._broadcast('log', line)
+
+    def _on_progress_cbk(self, progress):
+        with self._lock:
+            self._progress = progress
+        self._broadcast('progress', progress)
+
+    def _on_state_cbk(self, state):
+        state = {'name': state.get('name'), 'html': state.get('html', '')}
+        with self._lock:
+            self._state = state
+        self._broadcast('state', state)
+
+    def _wait(self, event):
+        while not event.wait(0.01):
+            if self._context.do_quit:
+                raise KeyboardInterrupt('do_quit signaled')
+            self._context.check_cancel()
+
+    def _on_wait_for_user_cbk(self):
+        self._continue_event.clear()
+        with self._lock:
+            self._wait_for_user = True
+        self._broadcast('wait_for_user', True)
+        try:
+            self._wait(self._continue_event)
+        finally:
+            with self._lock:
+                self._wait_for_user = False
+            self._broadcast('wait_for_user', False)
+
+    def _on_prompt_cbk(self, prompt_str):
+        self._prompt_event.clear()
+        with self._lock:
+            self._prompt_str = prompt_str
+        self._broadcast('prompt', prompt_str)
+        try:
+            self._wait(self._prompt_event)
+            return self._prompt_result
+        finally:
+            with self._lock:
+                self._prompt_str = None
+            self._broadcast('prompt', None)
+
+    def start(self):
+        """Start the server thread."""
+        if self._server_thread is None:
+            _log.info('web runner serving %s', self.url)  # before the dashboard log, which omits the token
+            logging.getLogger().addHandler(self._log_handler)
+            self._server_thread = threading.Thread(target=self._server.serve_forever,
+                                                   name='pytation_web', daemon=True)
+            self._server_thread.start()
+
+    def stop(self):
+        """Stop the server and disconnect all clients."""
+        if self._server_thread is not None:
+            logging.getLogger().removeHandler(self._log_handler)
+            self._server.shutdown()
+            self._server_thread.join()
+            self._server_thread = None
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.close()
+        self._server.server_close()
+
+    def run(self, count=None):
+        """Run the station while serving the dashboard.
+
+        :param count: The number of suite iterations.  None (default)
+            runs indefinitely.
+        :return: 0.
+        """
+        self.start()
+        try:
+            self._context.station_run(count=count)
+            self._broadcast('done', None)
+        finally:
+            self.stop()
+        return 0
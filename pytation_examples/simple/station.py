@@ -91,6 +91,7 @@ STATION = {
     'name': 'simple',
     'full_name': 'Simple test station example',
     'env': {},
+    'retest': {'key': 'serial_number'},  # set by enter_serial_number
     'suite_setup': {'fn': suite_setup, 'config': {}},
     'suite_teardown': {'fn': suite_teardown, 'config': {}},
     'states': {